@@ -3,6 +3,12 @@ Arquivo de configuração para o sistema de IA jurídica
 Personalize as configurações conforme suas necessidades
 """
 
+# Padrões dos blocos 'selective', 'hierarchical', 'bm25' e 'near_duplicates'
+# (valores e descrição em modules/defaults.py, módulo sem dependências)
+from modules.defaults import (
+    SELECTIVE_NER_DEFAULTS, HIERARCHICAL_DEFAULTS, BM25_DEFAULTS, NEAR_DUPLICATE_DEFAULTS
+)
+
 # ============================================================
 # CONFIGURAÇÕES DE PROCESSAMENTO NLP
 # ============================================================
@@ -20,12 +26,27 @@ NLP_CONFIG = {
         'spacy_model': 'pt_core_news_lg',  # ou 'pt_core_news_sm'
     },
 
+    # Inferência do spaCy (NER)
+    'spacy': {
+        'batch_size': 16,  # Documentos (ou trechos) por lote do nlp.pipe
+        'n_process': 1,  # Processos do nlp.pipe (mantenha 1 com 'parallel' ativo)
+        'max_chars': 100000,  # Documentos maiores são divididos por parágrafo
+        'scope': 'full',  # 'full' = texto inteiro; 'selective' = só regiões relevantes
+        # Regiões do modo 'selective'; para ajustar: {**SELECTIVE_NER_DEFAULTS, 'header_chars': 3000}
+        'selective': dict(SELECTIVE_NER_DEFAULTS),
+    },
+
     # Configurações de sumarização
     'summarization': {
         'max_length': 500,  # Comprimento máximo do resumo (palavras)
         'min_length': 100,  # Comprimento mínimo do resumo (palavras)
         'compression_ratio': 0.3,  # Razão de compressão (0.0 a 1.0)
         'method': 'auto',  # 'extractive', 'abstractive', ou 'auto'
+        'scoring': 'keywords',  # Sumarização extrativa: 'keywords' ou 'textrank' (soma a centralidade)
+        'textrank_weight': 2.0,  # Peso da centralidade no modo 'textrank'
+        'batch_size': 8,  # Textos por chamada do modelo abstrativo (agrupados por tamanho)
+        # Textos longos: resumo das partes (cortes em seções/parágrafos) e depois dos resumos parciais
+        'hierarchical': dict(HIERARCHICAL_DEFAULTS),
     },
 
     # Configurações RAG
@@ -33,6 +54,30 @@ NLP_CONFIG = {
         'chunk_size': 512,  # Tamanho dos chunks (tokens/palavras)
         'overlap': 50,  # Sobreposição entre chunks
         'create_faiss_index': False,  # Criar índice FAISS (requer mais memória)
+        'bundle_dir': None,  # Diretório do pacote RAG (índice FAISS + embeddings .npy + chunks); None = não grava
+        'embedding_dtype': 'float32',  # Embeddings no pacote: 'float32' ou 'float16' (metade do espaço)
+        # Busca por palavras-chave nos chunks (search_bm25)
+        'bm25': dict(BM25_DEFAULTS),
+    },
+
+    # Cache em disco dos resultados NLP (por hash do texto, versão da etapa e configuração)
+    'cache': {
+        'enabled': True,
+        'directory': '.nlp_cache',  # Relativo à pasta do programa
+        'max_size_mb': 512,  # Acima disso, descarta os menos usados (LRU)
+    },
+
+    # Quase duplicatas (MinHash + LSH): a análise NLP é feita uma vez por grupo
+    'near_duplicates': {
+        'enabled': True,
+        **NEAR_DUPLICATE_DEFAULTS,
+    },
+
+    # Processamento paralelo (pool de processos)
+    'parallel': {
+        'enabled': False,  # Processa documentos em múltiplos núcleos
+        'workers': None,  # None = número de CPUs
+        'chunk_size': 4,  # Documentos enviados por tarefa a cada worker
     }
 }
 
@@ -48,6 +93,19 @@ EXTRACTION_CONFIG = {
     'pdf': {
         'extract_images': False,  # Extrair texto de imagens (OCR)
         'preserve_layout': True,  # Preservar layout do documento
+        'backend': None,  # 'pymupdf', 'pypdf', 'pdfplumber' ou None (mais rápido instalado)
+        'parallel_page_threshold': 1000,  # Acima disso, divide as páginas entre processos
+        'page_workers': None,  # Processos por PDF grande (None = número de CPUs; com pdf_workers > 1, até CPUs / pdf_workers)
+    },
+
+    # Percurso de diretórios (filtros e paralelismo)
+    'scan': {
+        'include': None,  # Globs que os arquivos devem casar, ex.: ['*/2024/*']
+        'exclude': None,  # Globs de arquivos/pastas a ignorar, ex.: ['*/rascunhos']
+        'min_size': None,  # Tamanho mínimo em bytes
+        'max_size': None,  # Tamanho máximo em bytes
+        'parallel_walk': False,  # Percorre subpastas de primeiro nível em paralelo
+        'walk_workers': 8,  # Threads do percurso paralelo
     },
 
     # Codificações a tentar para arquivos TXT
@@ -92,6 +150,10 @@ PERFORMANCE_CONFIG = {
     # Limite de memória (MB) - ajuste conforme seu sistema
     'memory_limit_mb': 4096,
 
+    # Leitura concorrente de arquivos
+    'io_workers': 8,  # Threads para arquivos TXT (1 = sequencial)
+    'pdf_workers': None,  # Processos para arquivos PDF (None = número de CPUs)
+
     # Modo de processamento
     'processing_mode': 'standard',  # 'fast', 'standard', 'thorough'
 
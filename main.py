@@ -26,10 +26,14 @@ if sys.platform == 'win32':
     except Exception:
         pass  # Se falhar, continua sem emojis
 
-from modules.file_scanner import scan_directory
-from modules.txt_reader import read_txt_file
-from modules.pdf_reader import read_pdf_file
+from modules.file_scanner import iter_directory
+from modules.ingestion import load_files
+from modules.manifest import IngestionManifest, config_signature
+from modules.txt_reader import set_encoding_cache, save_encoding_cache
 from modules.json_generator import generate_knowledge_base_json, split_large_json
+from modules.near_duplicates import (
+    find_near_duplicates, apply_near_duplicate_links, clear_near_duplicate_link, documents_pending_nlp
+)
 
 # Importa módulos NLP (com tratamento de erro)
 try:
@@ -42,7 +46,7 @@ except ImportError as e:
 
 # Importa configurações
 try:
-    from config import NLP_CONFIG, get_config
+    from config import NLP_CONFIG, PERFORMANCE_CONFIG, EXTRACTION_CONFIG, LEGAL_CONFIG, get_config
 except ImportError:
     print("⚠ Arquivo de configuração não encontrado. Usando configurações padrão.")
     NLP_CONFIG = {
@@ -50,6 +54,9 @@ except ImportError:
         'enable_summarization': True,
         'enable_embeddings': False
     }
+    PERFORMANCE_CONFIG = {}
+    EXTRACTION_CONFIG = {}
+    LEGAL_CONFIG = {}
     def get_config(mode='standard'):
         return NLP_CONFIG
 
@@ -69,7 +76,7 @@ def select_folder():
     return folder_path
 
 
-def process_files(folder_path, enable_nlp=False, nlp_config=None):
+def process_files(folder_path, enable_nlp=False, nlp_config=None, manifest=None):
     """
     Processa todos os arquivos TXT e PDF na pasta selecionada
 
@@ -77,14 +84,134 @@ def process_files(folder_path, enable_nlp=False, nlp_config=None):
         folder_path: Caminho da pasta a ser processada
         enable_nlp: Se True, aplica análise NLP nos documentos
         nlp_config: Configurações NLP personalizadas
+        manifest: IngestionManifest da execução anterior (opcional). Se
+            informado, apenas arquivos novos ou alterados são lidos e
+            analisados; os demais são reaproveitados da última saída.
 
     Returns:
         dict: Estrutura de dados com todos os arquivos processados
     """
     print(f"\n🔍 Escaneando pasta: {folder_path}")
 
-    # Escaneia diretório e encontra todos os arquivos TXT e PDF
-    files_found = scan_directory(folder_path)
+    # Percurso em fluxo: a leitura começa enquanto o diretório ainda é escaneado
+    scan_config = EXTRACTION_CONFIG.get('scan', {})
+    files_stream = iter_directory(
+        folder_path,
+        include=scan_config.get('include'),
+        exclude=scan_config.get('exclude'),
+        min_size=scan_config.get('min_size'),
+        max_size=scan_config.get('max_size'),
+        parallel=scan_config.get('parallel_walk', False),
+        workers=scan_config.get('walk_workers', 8)
+    )
+
+    # Configuração NLP efetiva (inclui as listas jurídicas usadas na classificação)
+    processor_config = dict(nlp_config or NLP_CONFIG, legal=LEGAL_CONFIG)
+
+    # Cache NLP em disco (também nos modos rápido/completo), relativo à pasta do programa
+    cache_config = dict(processor_config.get('cache', NLP_CONFIG.get('cache', {})))
+    if cache_config.get('directory') and not os.path.isabs(cache_config['directory']):
+        cache_config['directory'] = os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), cache_config['directory']
+        )
+    processor_config['cache'] = cache_config
+    dedup_config = processor_config.setdefault(
+        'near_duplicates', dict(NLP_CONFIG.get('near_duplicates', {}))
+    )
+
+    # Sem manifesto, todos os arquivos são novos e recebem ids pela ordem do scan
+    signature = config_signature(enable_nlp, processor_config)
+    previous_docs = {}
+    reuse_nlp = False
+    if manifest is not None and not manifest.is_empty:
+        previous_docs = manifest.load_previous_documents()
+        reuse_nlp = manifest.nlp_signature == signature
+
+    files_found = []
+    plan_items = []
+    to_load = []
+
+    def plan_stream():
+        """Classifica cada arquivo encontrado e repassa os que precisam de leitura"""
+        if manifest is None:
+            planned = ({'file_info': file_info, 'status': 'new', 'hash': None} for file_info in files_stream)
+        else:
+            # Hashes dos arquivos com tamanho/mtime diferentes calculados em threads
+            planned = manifest.iter_plan(files_stream, workers=PERFORMANCE_CONFIG.get('io_workers'))
+
+        for item in planned:
+            file_info = item['file_info']
+            files_found.append(file_info)
+            if manifest is None:
+                item['doc_id'] = f"doc_{len(files_found):04d}"
+
+            # Documento inalterado só é reaproveitado se estiver na saída anterior
+            if item['status'] == 'unchanged':
+                previous = previous_docs.get(item['doc_id'])
+                if previous is None:
+                    item['status'] = 'changed'
+                elif not reuse_nlp:
+                    clear_near_duplicate_link(previous)
+                    previous.pop('nlp_analysis', None)
+
+            plan_items.append(item)
+            if item['status'] != 'unchanged':
+                to_load.append(item)
+                # Hash já calculado no planejamento: a leitura não relê o arquivo para isso
+                yield dict(file_info, content_hash=item['hash']) if item['hash'] else file_info
+
+    documents_by_id = {}
+
+    # Processa cada arquivo (leitura concorrente, resultados na ordem do scan)
+    print("\n📄 Processando arquivos...")
+    loaded_files = load_files(
+        plan_stream(),
+        io_workers=PERFORMANCE_CONFIG.get('io_workers'),
+        pdf_workers=PERFORMANCE_CONFIG.get('pdf_workers'),
+        pdf_options={
+            'parallel_threshold': EXTRACTION_CONFIG.get('pdf', {}).get('parallel_page_threshold'),
+            'page_workers': EXTRACTION_CONFIG.get('pdf', {}).get('page_workers'),
+            'backend': EXTRACTION_CONFIG.get('pdf', {}).get('backend')
+        }
+    )
+
+    for idx, file_info, result in loaded_files:
+        file_path = file_info['path']
+        file_type = file_info['type']
+        relative_path = file_info['relative_path']
+
+        print(f"  [{idx}] {relative_path}", end=" ... ")
+
+        if isinstance(result, Exception):
+            print(f"❌ Erro: {str(result)}")
+            continue
+
+        content = result['content']
+        doc_id = to_load[idx - 1]['doc_id']
+
+        # Adiciona documento à base de conhecimento
+        document = {
+            "id": doc_id,
+            "filename": os.path.basename(file_path),
+            "relative_path": relative_path,
+            "type": file_type,
+            "size_bytes": result['size_bytes'],
+            "modified_date": result['modified_date'],
+            "content_hash": result['content_hash'],
+            "content": content,
+            "char_count": len(content),
+            "word_count": result['word_count']
+        }
+
+        # PDFs: páginas, metadados e outline obtidos na mesma leitura do texto
+        if 'pdf_info' in result:
+            document["pdf_info"] = result['pdf_info']
+
+        # Seções, páginas e parágrafos (offsets em content)
+        document["structure"] = result['structure']
+
+        documents_by_id[doc_id] = document
+        print("✅")
 
     if not files_found:
         print("⚠️  Nenhum arquivo TXT ou PDF encontrado!")
@@ -92,6 +219,14 @@ def process_files(folder_path, enable_nlp=False, nlp_config=None):
 
     print(f"✅ Encontrados {len(files_found)} arquivo(s)")
 
+    if manifest is not None:
+        counts = {status: sum(1 for i in plan_items if i['status'] == status)
+                  for status in ('unchanged', 'changed', 'new')}
+        deleted = manifest.deleted_files({f['relative_path'] for f in files_found})
+        print(f"♻️  Incremental: {counts['unchanged']} inalterado(s), "
+              f"{counts['changed']} alterado(s), {counts['new']} novo(s), "
+              f"{len(deleted)} removido(s)")
+
     # Estrutura de dados que será convertida em JSON
     knowledge_base = {
         "metadata": {
@@ -107,61 +242,55 @@ def process_files(folder_path, enable_nlp=False, nlp_config=None):
         "documents": []
     }
 
-    # Processa cada arquivo
-    print("\n📄 Processando arquivos...")
-    for idx, file_info in enumerate(files_found, 1):
-        file_path = file_info['path']
-        file_type = file_info['type']
-        relative_path = file_info['relative_path']
-
-        print(f"  [{idx}/{len(files_found)}] {relative_path}", end=" ... ")
-
-        try:
-            # Lê o conteúdo do arquivo baseado no tipo
-            if file_type == 'txt':
-                content = read_txt_file(file_path)
-            elif file_type == 'pdf':
-                content = read_pdf_file(file_path)
-            else:
-                print("❌ Tipo não suportado")
-                continue
-
-            # Adiciona documento à base de conhecimento
-            document = {
-                "id": f"doc_{idx:04d}",
-                "filename": os.path.basename(file_path),
-                "relative_path": relative_path,
-                "type": file_type,
-                "size_bytes": os.path.getsize(file_path),
-                "modified_date": datetime.fromtimestamp(
-                    os.path.getmtime(file_path)
-                ).isoformat(),
-                "content": content,
-                "char_count": len(content),
-                "word_count": len(content.split())
-            }
-
-            knowledge_base["documents"].append(document)
-            print("✅")
-
-        except Exception as e:
-            print(f"❌ Erro: {str(e)}")
-            continue
-
-    # Aplica análise NLP se habilitado
-    if enable_nlp and NLP_AVAILABLE and knowledge_base["documents"]:
+    # Monta a base na ordem do scan, reaproveitando os documentos inalterados
+    for item in plan_items:
+        if item['status'] == 'unchanged':
+            previous = previous_docs[item['doc_id']]
+            previous['modified_date'] = datetime.fromtimestamp(
+                item['file_info']['mtime']
+            ).isoformat()
+            documents_by_id[item['doc_id']] = previous
+        if item['doc_id'] in documents_by_id:
+            knowledge_base["documents"].append(documents_by_id[item['doc_id']])
+
+    # Aplica análise NLP se habilitado (apenas documentos ainda sem análise)
+    pending_nlp = documents_pending_nlp(knowledge_base["documents"])
+    near_duplicate_links = {}
+    if enable_nlp and NLP_AVAILABLE and pending_nlp:
         print("\n" + "=" * 60)
         print("  🧠 INICIANDO ANÁLISE NLP AVANÇADA")
         print("=" * 60)
 
+        # Quase duplicatas: a análise é feita uma vez por grupo
+        for doc in pending_nlp:
+            clear_near_duplicate_link(doc)
+        to_analyze = pending_nlp
+        if dedup_config.get('enabled'):
+            near_duplicate_links = find_near_duplicates(pending_nlp, dedup_config)
+            if near_duplicate_links:
+                to_analyze = [doc for doc in pending_nlp if doc['id'] not in near_duplicate_links]
+                canonicals = {canonical for canonical, _ in near_duplicate_links.values()}
+                print(f"\n🧬 Quase duplicatas: {len(near_duplicate_links)} documento(s) ligados a "
+                      f"{len(canonicals)} canônico(s); analisando {len(to_analyze)} documento(s)")
+
         try:
-            processor = LegalNLPProcessor(nlp_config or NLP_CONFIG)
-            knowledge_base["documents"] = processor.process_batch(knowledge_base["documents"])
+            processor = LegalNLPProcessor(processor_config)
+            processed = {doc['id']: doc for doc in processor.process_batch(to_analyze)}
+            knowledge_base["documents"] = [
+                processed.get(doc['id'], doc) for doc in knowledge_base["documents"]
+            ]
             print("✅ Análise NLP concluída com sucesso")
         except Exception as e:
+            near_duplicate_links = {}
             print(f"⚠ Erro na análise NLP: {str(e)}")
             print("   Continuando sem análise NLP...")
 
+    # Liga as cópias aos canônicos (e descarta listas de membros que não existem mais)
+    apply_near_duplicate_links(knowledge_base["documents"], near_duplicate_links)
+
+    if manifest is not None:
+        manifest.update(plan_items, knowledge_base["documents"], folder_path, signature)
+
     return knowledge_base
 
 
@@ -361,17 +490,33 @@ def main():
     # Pergunta o tamanho máximo desejado para cada arquivo JSON
     max_size_mb = ask_max_json_size()
 
+    # Manifesto incremental (fica ao lado dos arquivos JSON gerados)
+    folder_name = os.path.basename(folder_path.rstrip(os.sep))
+    output_dir = os.path.dirname(os.path.abspath(__file__))
+    manifest = IngestionManifest.load(os.path.join(output_dir, f"manifest_{folder_name}.json"))
+    if manifest.source_directory and manifest.source_directory != str(folder_path):
+        # Outra pasta com o mesmo nome: não reaproveita nada
+        manifest = IngestionManifest(manifest.manifest_path)
+
+    # Encodings de TXT detectados em execuções anteriores
+    set_encoding_cache(os.path.join(output_dir, ".encoding_cache.json"))
+
     # Processa os arquivos
-    knowledge_base = process_files(folder_path, enable_nlp=enable_nlp, nlp_config=nlp_config)
+    knowledge_base = process_files(
+        folder_path,
+        enable_nlp=enable_nlp,
+        nlp_config=nlp_config,
+        manifest=manifest
+    )
+    save_encoding_cache()
 
     if not knowledge_base or not knowledge_base.get('documents'):
         print("\n⚠️  Nenhum documento foi processado com sucesso.")
         sys.exit(1)
 
     # Define o nome base do arquivo de saída
-    folder_name = os.path.basename(folder_path.rstrip(os.sep))
     output_filename = f"knowledge_base_{folder_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-    output_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), output_filename)
+    output_path = os.path.join(output_dir, output_filename)
 
     # Verifica se precisa dividir em múltiplos arquivos
     print(f"\n🔍 Verificando tamanho do JSON...")
@@ -386,6 +531,10 @@ def main():
     if saved_files:
         print(f"\n✅ {len(saved_files)} arquivo(s) salvo(s) com sucesso!")
 
+        # Só registra o manifesto se todas as partes foram salvas
+        if len(saved_files) == len(json_parts):
+            manifest.save(saved_files)
+
         # Estatísticas gerais
         total_chars = sum(doc['char_count'] for doc in knowledge_base['documents'])
         total_words = sum(doc['word_count'] for doc in knowledge_base['documents'])
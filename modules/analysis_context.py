@@ -0,0 +1,223 @@
+"""
+Contexto de análise por documento
+Visões derivadas do texto (minúsculas, palavras, sentenças) calculadas sob
+demanda e no máximo uma vez por contexto, compartilhadas entre
+classificação, análise da decisão, métricas e a contagem de palavras da
+sumarização. A sumarização extrativa pontua as sentenças do texto
+pré-processado (espaços normalizados, sem marcadores de página), com um
+contexto próprio desse texto
+"""
+
+import re
+import time
+import unicodedata
+import tracemalloc
+from array import array
+from typing import Dict, Any, List, Tuple
+
+
+# Fronteira de sentença (considera abreviações jurídicas)
+SENTENCE_BOUNDARY = re.compile(r'(?<!\w\.\w.)(?<![A-Z][a-z]\.)(?<=\.|\?|\!)\s')
+
+# Sentenças menores que isso são descartadas
+MIN_SENTENCE_CHARS = 20
+
+WORD_PATTERN = re.compile(r'\S+')
+
+# Tabela de remoção de acentos, preenchida sob demanda por caractere
+_fold_table: Dict[int, str] = {}
+
+
+def fold_accents(text: str) -> str:
+    """
+    Remove acentos mantendo o tamanho do texto (offsets continuam válidos)
+
+    Cada caractere é trocado pelo primeiro caractere da sua decomposição
+    (ex.: 'ç' -> 'c', 'Ã' -> 'A'); os demais ficam como estão.
+
+    Args:
+        text: Texto original
+
+    Returns:
+        str: Texto sem acentos, com o mesmo comprimento
+    """
+    if text.isascii():
+        return text
+
+    for char in set(text):
+        code = ord(char)
+        if code > 127 and code not in _fold_table:
+            _fold_table[code] = unicodedata.normalize('NFD', char)[0]
+
+    return text.translate(_fold_table)
+
+
+class AnalysisContext:
+    """
+    Texto de um documento e suas visões derivadas, calculadas sob demanda
+
+    Cada visão é calculada na primeira leitura e reaproveitada nas demais
+    (com cache=False, é recalculada a cada leitura, como antes do contexto;
+    usado para comparação em benchmark_analysis_context). `computed` conta
+    quantas vezes cada visão foi calculada.
+    """
+
+    def __init__(self, text: str, cache: bool = True):
+        """
+        Args:
+            text: Texto do documento
+            cache: Se False, não guarda as visões calculadas
+        """
+        self.text = text
+        self.cache = cache
+        self.computed: Dict[str, int] = {}
+        self._views: Dict[str, Any] = {}
+
+    def _view(self, name: str, compute):
+        if name in self._views:
+            return self._views[name]
+        value = compute()
+        self.computed[name] = self.computed.get(name, 0) + 1
+        if self.cache:
+            self._views[name] = value
+        return value
+
+    @property
+    def lower(self) -> str:
+        """Texto em minúsculas"""
+        return self._view('lower', self.text.lower)
+
+    @property
+    def words(self) -> List[str]:
+        """Palavras separadas por espaço (text.split())"""
+        return self._view('words', self.text.split)
+
+    @property
+    def word_lengths(self) -> array:
+        """
+        Tamanho de cada palavra (array compacto; a lista de palavras só é
+        mantida se `words` já tiver sido pedida)
+        """
+        def compute():
+            words = self._views.get('words')
+            return array('I', map(len, words if words is not None else self.text.split()))
+        return self._view('word_lengths', compute)
+
+    @property
+    def word_count(self) -> int:
+        """Número de palavras (guardado à parte: continua disponível após release('word_lengths'))"""
+        def compute():
+            if 'words' in self._views:
+                return len(self._views['words'])
+            return len(self.word_lengths)
+        return self._view('word_count', compute)
+
+    @property
+    def word_spans(self) -> List[Tuple[int, int]]:
+        """Spans (início, fim) das palavras, na ordem de `words`"""
+        return self._view('word_spans', lambda: [m.span() for m in WORD_PATTERN.finditer(self.text)])
+
+    @property
+    def sentence_spans(self) -> List[Tuple[int, int]]:
+        """
+        Spans das sentenças (sem espaços nas pontas; as menores que
+        MIN_SENTENCE_CHARS são descartadas)
+        """
+        def compute():
+            spans = []
+            start = 0
+            boundaries = [m.span() for m in SENTENCE_BOUNDARY.finditer(self.text)]
+            for end, next_start in boundaries + [(len(self.text), len(self.text))]:
+                piece = self.text[start:end]
+                stripped = piece.strip()
+                if len(stripped) > MIN_SENTENCE_CHARS:
+                    offset = start + (len(piece) - len(piece.lstrip()))
+                    spans.append((offset, offset + len(stripped)))
+                start = next_start
+            return spans
+        return self._view('sentence_spans', compute)
+
+    @property
+    def sentences(self) -> List[str]:
+        """Texto de cada sentença de `sentence_spans`"""
+        return self._view('sentences', lambda: [self.text[s:e] for s, e in self.sentence_spans])
+
+    def release(self, *names: str):
+        """
+        Descarta visões que nenhuma etapa seguinte vai ler (uma nova leitura
+        recalcula a visão)
+
+        Args:
+            names: Nomes das visões (ex.: 'lower', 'word_lengths')
+        """
+        for name in names:
+            self._views.pop(name, None)
+
+    def stats(self) -> Dict[str, int]:
+        """Quantas vezes cada visão foi calculada"""
+        return dict(self.computed)
+
+
+def benchmark_analysis_context(n_words: int = 1000000, seed: int = 42) -> Dict[str, Any]:
+    """
+    Mede cálculos de visões, alocação e tempo de process_document em um
+    documento grande, com o contexto compartilhado e sem cache (cada etapa
+    recalcula as visões, como antes do contexto)
+
+    Args:
+        n_words: Tamanho aproximado do documento (palavras)
+        seed: Semente do gerador de texto
+
+    Returns:
+        dict: {'shared': {...}, 'uncached': {...}} com 'computed' (cálculos
+            por visão), 'total_views', 'peak_mb' (pico de memória alocada,
+            medido com tracemalloc) e 'seconds'
+    """
+    import random
+    from .legal_ner import _synthetic_acordao
+    from .nlp_processor import LegalNLPProcessor
+
+    rng = random.Random(seed)
+    parts = []
+    words = 0
+    while words < n_words:
+        part = _synthetic_acordao(rng)
+        parts.append(part)
+        words += len(part.split())
+    content = '\n\n'.join(parts)
+
+    processor = LegalNLPProcessor({'cache': {'enabled': False}}, verbose=False)
+    # Aquecimento: compila padrões e carrega modelos fora da medição
+    processor.process_document({'id': 'warm-up', 'content': parts[0]}, 0)
+    results = {}
+
+    for label, cache in (('shared', True), ('uncached', False)):
+        context = AnalysisContext(content, cache=cache)
+        document = {'id': 'bench', 'content': content}
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        processor.process_document(document, 1, context=context)
+        seconds = time.perf_counter() - start
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        results[label] = {
+            'computed': context.stats(),
+            'total_views': sum(context.computed.values()),
+            'peak_mb': round(peak / (1024 * 1024), 1),
+            'seconds': round(seconds, 2)
+        }
+
+    return results
+
+
+if __name__ == '__main__':
+    import sys
+
+    n_words = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    results = benchmark_analysis_context(n_words)
+    print(f"\n📊 Contexto de análise (~{n_words:,} palavras)")
+    for label, result in results.items():
+        print(f"   • {label:<9} {result['total_views']:>3} visões calculadas  "
+              f"pico {result['peak_mb']:>7} MB  {result['seconds']:>6} s  {result['computed']}")
@@ -0,0 +1,617 @@
+"""
+Busca textual BM25 sobre os chunks do RAG
+Tokenização sem acentos, listas invertidas comprimidas (diferenças entre
+ids com a menor largura inteira que cabe em cada termo, em blocos com o
+último id de cada um) com frequências e posições opcionais (consultas por
+frase, ex.: "art. 5º"), top-k com poda MaxScore (listas não essenciais só
+decodificam os blocos dos candidatos) e gravação em disco aberta com
+memory-map
+"""
+
+import os
+import re
+import json
+from bisect import bisect_left
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .analysis_context import fold_accents
+from .defaults import BM25_DEFAULTS
+
+
+PHRASE_PATTERN = re.compile(r'"([^"]+)"')
+
+# Termos maiores são truncados (mantém a tabela de termos compacta)
+MAX_TERM_CHARS = 40
+
+# Palavras; o grupo é o termo já truncado
+TOKEN_PATTERN = re.compile(r'(\w{1,%d})\w*' % MAX_TERM_CHARS)
+
+# Ordinais e grau viram letras: "5º", "5o" e "5°" são o mesmo termo
+_ORDINALS = (('º', 'o'), ('ª', 'a'), ('°', 'o'))
+
+BM25_FORMAT_VERSION = 2
+
+# Postings por bloco: o último id de cada bloco permite decodificar só os blocos consultados
+POSTINGS_BLOCK = 128
+
+_WIDTH_DTYPES = {1: np.uint8, 2: np.uint16, 4: np.uint32}
+
+# Uma linha por termo (na ordem alfabética dos termos)
+TERM_DTYPE = np.dtype([
+    ('df', np.uint32),  # Chunks com o termo
+    ('postings_offset', np.uint64),  # Bytes em postings.bin: diferenças entre ids...
+    ('postings_width', np.uint8),
+    ('tf_offset', np.uint64),  # ...e frequências
+    ('tf_width', np.uint8),
+    ('positions_offset', np.uint64),  # Bytes em positions.bin (diferenças dentro de cada chunk)
+    ('positions_width', np.uint8),
+    ('max_score', np.float32),  # Maior contribuição BM25 do termo (limite da poda)
+    ('blocks_offset', np.uint64),  # Primeiro bloco do termo em block_last.npy
+])
+
+# Tolerância relativa na poda (somas de floats em ordens diferentes)
+PRUNE_TOLERANCE = 1e-6
+
+
+def bm25_tokens(text: str) -> List[str]:
+    """
+    Termos do texto: minúsculas, sem acentos, ordinais normalizados
+
+    Ex.: 'Art. 5º da Constituição' -> ['art', '5o', 'da', 'constituicao']
+    """
+    folded = fold_accents(text.lower())
+    if not folded.isascii():
+        for char, replacement in _ORDINALS:
+            folded = folded.replace(char, replacement)
+    return TOKEN_PATTERN.findall(folded)
+
+
+def parse_query(query: str) -> Tuple[List[str], List[List[str]]]:
+    """
+    Separa a consulta em termos soltos e frases (trechos entre aspas)
+
+    Returns:
+        tuple: (termos sem repetição, frases com 2 ou mais termos)
+    """
+    terms = bm25_tokens(PHRASE_PATTERN.sub(' ', query))
+    phrases = []
+    for phrase in PHRASE_PATTERN.findall(query):
+        tokens = bm25_tokens(phrase)
+        if len(tokens) > 1:
+            phrases.append(tokens)
+        else:
+            terms.extend(tokens)
+    return list(dict.fromkeys(terms)), phrases
+
+
+def _pack(values: np.ndarray, groups: np.ndarray, group_sizes: np.ndarray) -> Tuple[bytes, np.ndarray, np.ndarray]:
+    """
+    Grava cada grupo consecutivo de `values` com a menor largura que cabe nele
+
+    Args:
+        values: Valores não negativos, agrupados por termo em sequência
+        groups: Termo de cada valor
+        group_sizes: Quantidade de valores de cada termo
+
+    Returns:
+        tuple: (bytes, offset em bytes de cada termo, largura de cada termo)
+    """
+    n_groups = len(group_sizes)
+    maxima = np.zeros(n_groups, dtype=np.int64)
+    if len(values):
+        np.maximum.at(maxima, groups, values)
+    widths = np.where(maxima < 1 << 8, 1, np.where(maxima < 1 << 16, 2, 4)).astype(np.uint8)
+
+    offsets = np.zeros(n_groups, dtype=np.uint64)
+    parts = []
+    base = 0
+    # Um segmento por largura: os termos de cada segmento mantêm a ordem
+    for width, dtype in _WIDTH_DTYPES.items():
+        selected = widths == width
+        if not selected.any():
+            continue
+        sizes = group_sizes[selected].astype(np.int64) * width
+        offsets[selected] = base + np.concatenate(([0], np.cumsum(sizes)[:-1]))
+        data = values[selected[groups]].astype(dtype).tobytes()
+        parts.append(data)
+        base += len(data)
+
+    return b''.join(parts), offsets, widths
+
+
+class _TermSequence:
+    """Termos ordenados guardados como um bloco UTF-8 (acesso por índice, para bisect)"""
+
+    def __init__(self, blob: Any, offsets: np.ndarray):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return bytes(self.blob[int(self.offsets[i]):int(self.offsets[i + 1])]).decode('utf-8')
+
+
+class _QueryUnit:
+    """
+    Termo ou frase da consulta: limite superior da contribuição e lista de
+    chunks, decodificada só se a unidade for essencial na poda (ver search)
+    """
+
+    def __init__(
+        self,
+        index: 'BM25Index',
+        idf: float,
+        max_score: float,
+        term_id: Optional[int] = None,
+        docs: Optional[np.ndarray] = None,
+        tfs: Optional[np.ndarray] = None
+    ):
+        self.index = index
+        self.idf = idf
+        self.max_score = max_score
+        self.term_id = term_id
+        self.docs = docs
+        self.tfs = tfs
+
+    def load(self, allowed: Optional[np.ndarray] = None):
+        """Decodifica a lista inteira, mantendo só os chunks permitidos (ids ordenados)"""
+        if self.docs is None:
+            self.docs, self.tfs = self.index.postings_of(self.term_id)
+        if allowed is None or not len(self.docs):
+            return
+        position = np.minimum(np.searchsorted(allowed, self.docs), len(allowed) - 1)
+        keep = allowed[position] == self.docs
+        self.docs = self.docs[keep]
+        self.tfs = self.tfs[keep]
+
+    def scores(self) -> np.ndarray:
+        """Contribuição BM25 de cada posting carregada"""
+        return self.index._bm25(self.tfs.astype(np.float64), self.docs, self.idf)
+
+    def probe(self, candidates: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Contribuição para os candidatos (ids ordenados) presentes na lista
+
+        Sem a lista carregada, só os blocos que podem conter os candidatos
+        são decodificados.
+
+        Returns:
+            tuple: (máscara dos candidatos presentes, contribuição de cada um)
+        """
+        if self.docs is not None:
+            if not len(self.docs):
+                return np.zeros(len(candidates), dtype=bool), np.empty(0)
+            position = np.minimum(np.searchsorted(self.docs, candidates), len(self.docs) - 1)
+            found = self.docs[position] == candidates
+            tfs = self.tfs[position[found]]
+        else:
+            found, tfs = self.index.probe_postings(self.term_id, candidates)
+        return found, self.index._bm25(tfs.astype(np.float64), candidates[found], self.idf)
+
+
+class BM25Index:
+    """
+    Índice invertido BM25 de chunks
+
+    Para cada termo: ids dos chunks (diferenças sucessivas), frequências e,
+    opcionalmente, posições (diferenças dentro de cada chunk), cada lista
+    com a menor largura inteira (1, 2 ou 4 bytes) que cabe nos seus
+    valores; a decodificação é um np.cumsum sobre a fatia do arquivo. O
+    último id de cada bloco de POSTINGS_BLOCK postings (block_last) permite
+    decodificar só os blocos que interessam a uma busca.
+    """
+
+    def __init__(
+        self,
+        terms: _TermSequence,
+        term_info: np.ndarray,
+        postings: Any,
+        positions: Any,
+        doc_lengths: np.ndarray,
+        block_last: np.ndarray,
+        meta: Dict[str, Any]
+    ):
+        self.terms = terms
+        self.term_info = term_info
+        self.postings = postings
+        self.positions = positions
+        self.doc_lengths = doc_lengths
+        self.block_last = block_last
+        self.meta = meta
+        self.k1 = meta['k1']
+        self.b = meta['b']
+        self.n_docs = meta['n_docs']
+        self.avgdl = meta['avgdl']
+        self.has_positions = meta['positions']
+
+    # ------------------------------------------------------------------
+    # Construção
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def build(
+        cls,
+        texts: Sequence[str],
+        k1: float = 1.2,
+        b: float = 0.75,
+        positions: bool = True
+    ) -> 'BM25Index':
+        """
+        Indexa os textos (um documento BM25 por texto, com id = posição na lista)
+
+        Args:
+            texts: Textos dos chunks
+            k1: Saturação da frequência do termo
+            b: Normalização pelo tamanho do chunk
+            positions: Se True, guarda as posições dos termos (frases)
+
+        Returns:
+            BM25Index em memória
+        """
+        vocabulary: Dict[str, int] = {}
+        term_parts = []
+        lengths = np.zeros(len(texts), dtype=np.uint32)
+
+        for doc, text in enumerate(texts):
+            tokens = bm25_tokens(text)
+            for token in set(tokens).difference(vocabulary):
+                vocabulary[token] = len(vocabulary)
+            lengths[doc] = len(tokens)
+            term_parts.append(np.fromiter(map(vocabulary.__getitem__, tokens), dtype=np.int64, count=len(tokens)))
+
+        # Ids dos termos na ordem alfabética (a tabela gravada é ordenada)
+        sorted_terms = sorted(vocabulary)
+        rank = np.empty(len(vocabulary), dtype=np.int64)
+        rank[[vocabulary[term] for term in sorted_terms]] = np.arange(len(sorted_terms))
+
+        term_ids = rank[np.concatenate(term_parts)] if term_parts and len(vocabulary) else np.empty(0, dtype=np.int64)
+        doc_ids = np.repeat(np.arange(len(texts), dtype=np.int64), lengths.astype(np.int64))
+        token_positions = np.arange(len(term_ids), dtype=np.int64) - np.repeat(
+            np.concatenate(([0], np.cumsum(lengths.astype(np.int64))[:-1])) if len(texts) else np.empty(0, dtype=np.int64),
+            lengths.astype(np.int64)
+        )
+
+        # Ocorrências ordenadas por (termo, chunk, posição): chunk e posição já são crescentes
+        order = np.argsort(term_ids, kind='stable')
+        term_ids, doc_ids, token_positions = term_ids[order], doc_ids[order], token_positions[order]
+
+        # Uma posting por (termo, chunk)
+        n_terms = len(sorted_terms)
+        new_posting = np.ones(len(term_ids), dtype=bool)
+        new_posting[1:] = (term_ids[1:] != term_ids[:-1]) | (doc_ids[1:] != doc_ids[:-1])
+        posting_starts = np.flatnonzero(new_posting)
+        posting_terms = term_ids[posting_starts]
+        posting_docs = doc_ids[posting_starts]
+        tfs = np.diff(np.concatenate((posting_starts, [len(term_ids)])))
+        df = np.bincount(posting_terms, minlength=n_terms)
+
+        # Diferenças entre chunks consecutivos de cada termo (o primeiro fica absoluto)
+        first_posting = np.ones(len(posting_docs), dtype=bool)
+        first_posting[1:] = posting_terms[1:] != posting_terms[:-1]
+        doc_deltas = posting_docs - np.where(first_posting, 0, np.concatenate(([0], posting_docs[:-1])))
+
+        postings_docs, postings_offsets, postings_widths = _pack(doc_deltas, posting_terms, df)
+
+        # Último chunk de cada bloco de POSTINGS_BLOCK postings de cada termo
+        term_starts = np.concatenate(([0], np.cumsum(df)[:-1]))
+        rank_in_term = np.arange(len(posting_terms)) - term_starts[posting_terms]
+        block_end = rank_in_term % POSTINGS_BLOCK == POSTINGS_BLOCK - 1
+        block_end[:-1] |= first_posting[1:]
+        if len(block_end):
+            block_end[-1] = True
+        block_last = posting_docs[block_end].astype(np.uint32)
+        n_blocks = -(-df // POSTINGS_BLOCK)
+        tf_bytes, tf_offsets, tf_widths = _pack(tfs, posting_terms, df)
+
+        meta = {
+            'version': BM25_FORMAT_VERSION,
+            'k1': k1,
+            'b': b,
+            'n_docs': len(texts),
+            'avgdl': float(lengths.mean()) if len(texts) else 0.0,
+            'positions': positions,
+            'n_terms': n_terms,
+        }
+
+        term_info = np.zeros(n_terms, dtype=TERM_DTYPE)
+        term_info['df'] = df
+        term_info['postings_offset'] = postings_offsets
+        term_info['postings_width'] = postings_widths
+        term_info['tf_offset'] = tf_offsets + len(postings_docs)
+        term_info['tf_width'] = tf_widths
+        term_info['blocks_offset'] = np.concatenate(([0], np.cumsum(n_blocks)[:-1]))
+
+        positions_bytes = b''
+        if positions:
+            # Diferenças entre posições dentro de cada (termo, chunk)
+            position_deltas = token_positions - np.where(
+                new_posting, 0, np.concatenate(([0], token_positions[:-1]))
+            )
+            occurrence_counts = np.bincount(term_ids, minlength=n_terms)
+            positions_bytes, positions_offsets, positions_widths = _pack(position_deltas, term_ids, occurrence_counts)
+            term_info['positions_offset'] = positions_offsets
+            term_info['positions_width'] = positions_widths
+
+        term_blob = ''.join(sorted_terms).encode('utf-8')
+        term_offsets = np.concatenate(([0], np.cumsum([len(term.encode('utf-8')) for term in sorted_terms]))).astype(np.int64)
+
+        index = cls(
+            _TermSequence(term_blob, term_offsets),
+            term_info,
+            postings_docs + tf_bytes,
+            positions_bytes,
+            lengths,
+            block_last,
+            meta
+        )
+
+        # Limite superior de cada termo: maior contribuição entre as suas postings
+        if len(posting_terms):
+            idf = index._idf(df.astype(np.float64))
+            contributions = index._bm25(tfs.astype(np.float64), posting_docs, idf[posting_terms])
+            max_scores = np.zeros(n_terms)
+            np.maximum.at(max_scores, posting_terms, contributions)
+            term_info['max_score'] = max_scores
+
+        return index
+
+    # ------------------------------------------------------------------
+    # Persistência
+    # ------------------------------------------------------------------
+
+    def save(self, path: str):
+        """Grava o índice em um diretório (meta.json por último)"""
+        os.makedirs(path, exist_ok=True)
+        meta_path = os.path.join(path, 'meta.json')
+        if os.path.exists(meta_path):
+            os.remove(meta_path)
+
+        with open(os.path.join(path, 'terms.bin'), 'wb') as f:
+            f.write(bytes(self.terms.blob))
+        np.save(os.path.join(path, 'term_offsets.npy'), np.asarray(self.terms.offsets))
+        np.save(os.path.join(path, 'term_info.npy'), np.asarray(self.term_info))
+        np.save(os.path.join(path, 'doc_lengths.npy'), np.asarray(self.doc_lengths))
+        np.save(os.path.join(path, 'block_last.npy'), np.asarray(self.block_last))
+        with open(os.path.join(path, 'postings.bin'), 'wb') as f:
+            f.write(bytes(self.postings))
+        with open(os.path.join(path, 'positions.bin'), 'wb') as f:
+            f.write(bytes(self.positions))
+
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump(self.meta, f, indent=2)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> 'BM25Index':
+        """
+        Abre um índice gravado por save
+
+        Args:
+            path: Diretório do índice
+            mmap: Se True, listas e tabelas ficam mapeadas em memória
+        """
+        meta_path = os.path.join(path, 'meta.json')
+        if not os.path.exists(meta_path):
+            raise FileNotFoundError(f"Índice BM25 incompleto ou inexistente: {path}")
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('version') != BM25_FORMAT_VERSION:
+            raise ValueError(f"Versão do índice BM25 não suportada: {meta.get('version')} (recrie o índice)")
+
+        mmap_mode = 'r' if mmap else None
+
+        def raw(name):
+            file_path = os.path.join(path, name)
+            if not os.path.getsize(file_path):
+                return b''
+            if mmap:
+                return np.memmap(file_path, dtype=np.uint8, mode='r')
+            with open(file_path, 'rb') as f:
+                return f.read()
+
+        return cls(
+            _TermSequence(raw('terms.bin'), np.load(os.path.join(path, 'term_offsets.npy'), mmap_mode=mmap_mode)),
+            np.load(os.path.join(path, 'term_info.npy'), mmap_mode=mmap_mode),
+            raw('postings.bin'),
+            raw('positions.bin'),
+            np.load(os.path.join(path, 'doc_lengths.npy'), mmap_mode=mmap_mode),
+            np.load(os.path.join(path, 'block_last.npy'), mmap_mode=mmap_mode),
+            meta
+        )
+
+    # ------------------------------------------------------------------
+    # Leitura das listas
+    # ------------------------------------------------------------------
+
+    def term_id(self, term: str) -> Optional[int]:
+        """Id do termo (posição na tabela ordenada) ou None"""
+        position = bisect_left(self.terms, term)
+        if position < len(self.terms) and self.terms[position] == term:
+            return position
+        return None
+
+    def _view(self, buffer: Any, offset: int, width: int, count: int) -> np.ndarray:
+        """Valores gravados em buffer[offset:], sem copiar (nem ler, se mapeado)"""
+        if isinstance(buffer, bytes):
+            return np.frombuffer(buffer, dtype=_WIDTH_DTYPES[width], count=count, offset=offset)
+        return np.asarray(buffer[offset:offset + count * width]).view(_WIDTH_DTYPES[width])
+
+    def _decode(self, buffer: Any, offset: int, width: int, count: int) -> np.ndarray:
+        return self._view(buffer, offset, width, count).astype(np.int64)
+
+    def postings_of(self, term_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(ids dos chunks, frequências) do termo"""
+        info = self.term_info[term_id]
+        df = int(info['df'])
+        docs = np.cumsum(self._decode(self.postings, int(info['postings_offset']), int(info['postings_width']), df))
+        tfs = self._decode(self.postings, int(info['tf_offset']), int(info['tf_width']), df)
+        return docs, tfs
+
+    def probe_postings(self, term_id: int, candidates: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Candidatos (ids ordenados) presentes na lista do termo
+
+        Decodifica só os blocos cujo intervalo de ids contém algum candidato.
+
+        Returns:
+            tuple: (máscara dos candidatos presentes, frequência de cada um)
+        """
+        info = self.term_info[term_id]
+        df = int(info['df'])
+        first_block = int(info['blocks_offset'])
+        lasts = np.asarray(self.block_last[first_block:first_block - (-df // POSTINGS_BLOCK)], dtype=np.int64)
+
+        block_of = np.searchsorted(lasts, candidates)
+        blocks = np.unique(block_of[block_of < len(lasts)])
+        if not len(blocks):
+            return np.zeros(len(candidates), dtype=bool), np.empty(0, dtype=np.int64)
+
+        # Postings dos blocos escolhidos (posições na lista do termo)
+        starts = blocks * POSTINGS_BLOCK
+        sizes = np.minimum(starts + POSTINGS_BLOCK, df) - starts
+        block_starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+        selected = np.arange(int(sizes.sum())) + np.repeat(starts - block_starts, sizes)
+
+        # A primeira diferença de cada bloco é relativa ao último id do bloco anterior
+        deltas = self._view(self.postings, int(info['postings_offset']), int(info['postings_width']), df)[selected].astype(np.int64)
+        bases = np.where(blocks > 0, lasts[blocks - 1], 0)
+        totals = np.cumsum(deltas)
+        docs = totals - np.repeat(totals[block_starts] - deltas[block_starts] - bases, sizes)
+        tfs = self._view(self.postings, int(info['tf_offset']), int(info['tf_width']), df)[selected]
+
+        position = np.minimum(np.searchsorted(docs, candidates), len(docs) - 1)
+        found = docs[position] == candidates
+        return found, tfs[position[found]].astype(np.int64)
+
+    def positions_of(self, term_id: int, tfs: np.ndarray) -> np.ndarray:
+        """Posições de todas as ocorrências do termo (agrupadas por chunk, na ordem das postings)"""
+        info = self.term_info[term_id]
+        deltas = self._decode(self.positions, int(info['positions_offset']), int(info['positions_width']), int(tfs.sum()))
+        totals = np.cumsum(deltas)
+        starts = np.concatenate(([0], np.cumsum(tfs)[:-1]))
+        return totals - np.repeat(totals[starts] - deltas[starts], tfs)
+
+    # ------------------------------------------------------------------
+    # Score
+    # ------------------------------------------------------------------
+
+    def _idf(self, df):
+        return np.log(1.0 + (self.n_docs - df + 0.5) / (df + 0.5))
+
+    def _bm25(self, tfs: np.ndarray, docs: np.ndarray, idf) -> np.ndarray:
+        lengths = np.asarray(self.doc_lengths[docs], dtype=np.float64)
+        norm = self.k1 * (1.0 - self.b + self.b * lengths / max(self.avgdl, 1e-9))
+        return idf * tfs * (self.k1 + 1.0) / (tfs + norm)
+
+    def _term_unit(self, term: str) -> Optional[_QueryUnit]:
+        term_id = self.term_id(term)
+        if term_id is None:
+            return None
+        info = self.term_info[term_id]
+        return _QueryUnit(self, float(self._idf(float(info['df']))), float(info['max_score']), term_id=term_id)
+
+    def _phrase_unit(self, tokens: List[str]) -> Optional[_QueryUnit]:
+        """Frase como um termo: chunks com os termos em posições consecutivas"""
+        term_ids = [self.term_id(token) for token in tokens]
+        if any(term_id is None for term_id in term_ids):
+            return None
+
+        lists = [self.postings_of(term_id) for term_id in term_ids]
+        candidates = lists[0][0]
+        for docs, _ in lists[1:]:
+            candidates = np.intersect1d(candidates, docs, assume_unique=True)
+        if not len(candidates):
+            return None
+
+        # Chave (chunk, posição do primeiro termo) de cada ocorrência; a frase
+        # ocorre onde as chaves de todos os termos coincidem
+        scale = int(self.doc_lengths.max()) + len(tokens) + 1
+        matches = None
+        for offset, (term_id, (docs, tfs)) in enumerate(zip(term_ids, lists)):
+            positions = self.positions_of(term_id, tfs)
+            occurrence_docs = np.repeat(docs, tfs)
+            keep = np.isin(occurrence_docs, candidates, assume_unique=False)
+            keys = occurrence_docs[keep] * scale + (positions[keep] - offset)
+            matches = keys if matches is None else np.intersect1d(matches, keys, assume_unique=True)
+            if not len(matches):
+                return None
+
+        docs, tfs = np.unique(matches // scale, return_counts=True)
+        idf = float(self._idf(float(len(docs))))
+        unit = _QueryUnit(self, idf, 0.0, docs=docs, tfs=tfs)
+        unit.max_score = float(unit.scores().max())
+        return unit
+
+    def search(
+        self,
+        query: str,
+        k: int = 10,
+        allowed: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Os k chunks de maior score BM25 para a consulta
+
+        Termos entre aspas formam frases (exigem posições; sem elas, os
+        termos da frase entram como termos soltos). Termos e frases são
+        processados do maior para o menor limite superior de contribuição
+        (MaxScore): enquanto a soma dos limites restantes alcança o k-ésimo
+        score parcial, a lista é essencial e decodificada inteira (seus
+        chunks viram candidatos); depois disso nenhum chunk novo pode
+        entrar no top-k e cada lista restante só decodifica os blocos que
+        contêm candidatos. Candidatos que nem com o máximo restante
+        alcançam o k-ésimo score são descartados. As listas de uma frase
+        são lidas inteiras (o casamento das posições exige todas).
+
+        Args:
+            query: Consulta
+            k: Número de resultados
+            allowed: Ids dos chunks permitidos (ordenados), ou None
+
+        Returns:
+            tuple: (scores, ids dos chunks), em ordem decrescente de score
+                (empates pelo menor id)
+        """
+        terms, phrases = parse_query(query)
+        if not self.has_positions:
+            terms = list(dict.fromkeys(terms + [token for phrase in phrases for token in phrase]))
+            phrases = []
+
+        units = [unit for unit in [self._term_unit(term) for term in terms]
+                 + [self._phrase_unit(phrase) for phrase in phrases] if unit is not None]
+        units.sort(key=lambda unit: -unit.max_score)
+
+        if not units or k <= 0:
+            return np.empty(0), np.empty(0, dtype=np.int64)
+
+        # Soma dos limites superiores a partir de cada lista
+        remaining = np.concatenate((np.cumsum([unit.max_score for unit in units][::-1])[::-1], [0.0]))
+
+        candidates = np.empty(0, dtype=np.int64)
+        scores = np.empty(0)
+
+        for i, unit in enumerate(units):
+            threshold = np.partition(scores, -k)[-k] if len(scores) >= k else 0.0
+            tolerance = PRUNE_TOLERANCE * max(threshold, 1.0)
+
+            if len(scores) >= k and remaining[i] < threshold - tolerance:
+                # Lista não essencial: só os blocos dos candidatos atuais
+                found, contributions = unit.probe(candidates)
+                scores[found] += contributions
+            else:
+                unit.load(allowed)
+                merged = np.concatenate((candidates, unit.docs))
+                merged_scores = np.concatenate((scores, unit.scores()))
+                candidates, inverse = np.unique(merged, return_inverse=True)
+                scores = np.bincount(inverse.reshape(-1), weights=merged_scores, minlength=len(candidates))
+
+            # Candidatos que nem com o máximo restante alcançam o k-ésimo score
+            if len(scores) > k:
+                threshold = np.partition(scores, -k)[-k]
+                keep = scores + remaining[i + 1] >= threshold - PRUNE_TOLERANCE * max(threshold, 1.0)
+                candidates, scores = candidates[keep], scores[keep]
+
+        order = np.lexsort((candidates, -scores))[:k]
+        return scores[order], candidates[order]
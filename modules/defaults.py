@@ -0,0 +1,41 @@
+"""
+Valores padrão dos módulos NLP
+Lidos tanto pelos módulos quanto por config.py (NLP_CONFIG); este módulo não
+importa nenhuma dependência, para que carregar a configuração continue leve
+"""
+
+# NER seletivo (ml_scope='selective'): regiões analisadas pelo spaCy
+SELECTIVE_NER_DEFAULTS = {
+    'header_chars': 2000,  # Início do documento (partes, órgão julgador, relator)
+    'sections': ['ementa', 'dispositivo'],  # Seções de document_structure.SECTION_NAMES
+    'section_chars': 3000,  # Caracteres analisados a partir de cada título
+    'anchor_types': ['ministro', 'vara', 'tribunal'],  # Tipos regex que puxam uma janela
+    'anchor_window': 300,  # Caracteres antes e depois de cada ocorrência
+}
+
+# Sumarização hierárquica (map-reduce) de textos longos
+HIERARCHICAL_DEFAULTS = {
+    'enabled': True,  # False = só o início do texto (uma entrada) vai ao modelo
+    'max_input_words': 1024,  # Tamanho da entrada sem tokenizador; com ele, o model_max_length do modelo
+    'token_budget': 16384,  # Tokens de entrada do modelo por documento (todas as etapas); acima disso, extrativa
+    'time_budget_s': 120.0,  # Tempo de modelo por documento; acima disso, extrativa
+    'max_levels': 4,  # Etapas de redução (resumo dos resumos parciais)
+    'seconds_per_token': None,  # Custo estimado do modelo antes da primeira medição; None = mede no primeiro lote
+}
+
+# Índice BM25 dos chunks do RAG
+BM25_DEFAULTS = {
+    'enabled': True,
+    'k1': 1.2,  # Saturação da frequência do termo
+    'b': 0.75,  # Normalização pelo tamanho do chunk
+    'positions': True,  # Guarda posições: consultas por frase ("art. 5º"); sem elas, índice menor
+}
+
+# Quase duplicatas (MinHash + LSH)
+NEAR_DUPLICATE_DEFAULTS = {
+    'threshold': 0.85,  # Similaridade de Jaccard estimada mínima
+    'num_perm': 128,  # Permutações da assinatura MinHash
+    'bands': 16,  # Faixas do LSH (num_perm deve ser múltiplo)
+    'shingle_size': 5,  # Palavras por shingle
+    'min_words': 50,  # Documentos menores não são agrupados
+}
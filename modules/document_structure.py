@@ -0,0 +1,169 @@
+"""
+Segmentação estrutural de documentos jurídicos
+Uma única varredura do texto encontra as seções (EMENTA, RELATÓRIO, VOTO,
+DECISÃO, DISPOSITIVO), as páginas (marcadores "--- Página N ---" gerados na
+leitura dos PDFs) e os parágrafos; os offsets ficam no documento e são
+lidos pela sumarização, pelo chunking RAG e pela classificação
+"""
+
+import re
+from bisect import bisect_right
+from typing import Dict, Any, List, Optional
+
+
+# Seções reconhecidas, na ordem de prioridade do resumo
+SECTION_NAMES = ('ementa', 'relatorio', 'voto', 'decisao', 'dispositivo')
+
+# Tamanho máximo do trecho de cada seção no resumo
+SECTION_PREVIEW_CHARS = 500
+
+# Título seguido de ':' e do corpo (linhas até a primeira linha em branco).
+# O corpo fica em um lookahead: só o título é consumido, e o mesmo trecho
+# continua disponível para os parágrafos e para as outras seções
+_HEADING = r'(?i:{})(?=\s*:\s*(?P<{}_body>[^\n]+(?:\n(?!\n)[^\n]+)*))'
+_HEADINGS = {
+    'ementa': 'EMENTA',
+    'relatorio': 'RELAT[ÓO]RIO',
+    'voto': 'VOTO',
+    'decisao': 'DECIS[ÃA]O',
+    'dispositivo': 'DISPOSITIVO',
+}
+
+# Pré-filtro pelos dois primeiros caracteres ('--', quebra de linha, EM, RE,
+# VO, DE, DI; 'ı'/'İ' casam 'i' com IGNORECASE): descarta a maioria das
+# posições sem testar as alternativas
+_PREFILTER = r'(?=[-\nEeRrVvDd][-\sMmEeOoIi\u0130\u0131])'
+
+STRUCTURE_PATTERN = re.compile(_PREFILTER + '(?:' + '|'.join(
+    [r'(?P<page>---\s*Página\s+(?P<page_number>\d+)\s*---)', r'(?P<paragraph_break>\n\s*\n)']
+    + [f'(?P<{name}>{_HEADING.format(_HEADINGS[name], name)})' for name in SECTION_NAMES]
+) + ')')
+
+
+def segment_document(text: str) -> Dict[str, Any]:
+    """
+    Calcula seções, páginas e parágrafos do texto em uma única passada
+
+    Args:
+        text: Conteúdo do documento
+
+    Returns:
+        dict:
+            sections: [{'name', 'start', 'end', 'body_start', 'body_end'}] em
+                ordem de posição (primeira ocorrência de cada título; a seção
+                vai até o título seguinte e o corpo até a primeira linha em branco)
+            pages: [{'page', 'start', 'end'}] a partir dos marcadores de página
+            paragraphs: [[início, fim], ...] dos blocos separados por linhas em branco
+    """
+    sections = []
+    seen = set()
+    page_starts = []
+    paragraphs = []
+    paragraph_start = 0
+
+    for match in STRUCTURE_PATTERN.finditer(text):
+        kind = match.lastgroup
+
+        if kind == 'paragraph_break':
+            if text[paragraph_start:match.start()].strip():
+                paragraphs.append([paragraph_start, match.start()])
+            paragraph_start = match.end()
+        elif kind == 'page':
+            page_starts.append((int(match.group('page_number')), match.start()))
+        elif kind not in seen:
+            seen.add(kind)
+            sections.append({
+                'name': kind,
+                'start': match.start(),
+                'body_start': match.start(f'{kind}_body'),
+                'body_end': match.end(f'{kind}_body')
+            })
+
+    if text[paragraph_start:].strip():
+        paragraphs.append([paragraph_start, len(text)])
+
+    for section, following in zip(sections, sections[1:] + [None]):
+        section['end'] = following['start'] if following else len(text)
+
+    pages = [
+        {'page': number, 'start': start, 'end': page_starts[i + 1][1] if i + 1 < len(page_starts) else len(text)}
+        for i, (number, start) in enumerate(page_starts)
+    ]
+
+    return {'sections': sections, 'pages': pages, 'paragraphs': paragraphs}
+
+
+def document_structure(document: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Estrutura de um documento (calculada e guardada em 'structure' se ausente)
+
+    Args:
+        document: Documento com 'content'
+
+    Returns:
+        dict: Ver segment_document
+    """
+    structure = document.get('structure')
+    if structure is None:
+        structure = segment_document(document.get('content', ''))
+        document['structure'] = structure
+    return structure
+
+
+def section_previews(text: str, structure: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Trecho inicial do corpo de cada seção (usado no resumo)
+
+    Args:
+        text: Texto segmentado
+        structure: Resultado de segment_document(text)
+
+    Returns:
+        dict: {seção: corpo sem espaços nas pontas, limitado a 500 caracteres}
+    """
+    bodies = {
+        section['name']: text[section['body_start']:section['body_end']].strip()
+        for section in structure.get('sections', [])
+    }
+
+    previews = {}
+    for name in SECTION_NAMES:
+        if name in bodies:
+            content = bodies[name]
+            if len(content) > SECTION_PREVIEW_CHARS:
+                content = content[:SECTION_PREVIEW_CHARS] + '...'
+            previews[name] = content
+    return previews
+
+
+def locate_offsets(structure: Dict[str, Any], offsets: List[int]) -> List[Dict[str, Any]]:
+    """
+    Seção e página que contêm cada offset
+
+    Args:
+        structure: Resultado de segment_document
+        offsets: Offsets no texto
+
+    Returns:
+        list: {'section': nome ou None, 'page': número ou None} por offset
+    """
+    sections = structure.get('sections', [])
+    pages = structure.get('pages', [])
+    section_starts = [section['start'] for section in sections]
+    page_starts = [page['start'] for page in pages]
+
+    def containing(spans, starts, offset):
+        idx = bisect_right(starts, offset) - 1
+        if idx >= 0 and offset < spans[idx]['end']:
+            return spans[idx]
+        return None
+
+    located = []
+    for offset in offsets:
+        section = containing(sections, section_starts, offset)
+        page = containing(pages, page_starts, offset)
+        located.append({
+            'section': section['name'] if section else None,
+            'page': page['page'] if page else None
+        })
+    return located
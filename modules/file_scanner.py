@@ -3,49 +3,192 @@ Módulo para escanear diretórios e encontrar arquivos TXT e PDF
 """
 
 import os
+import fnmatch
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
-def scan_directory(root_path, extensions=None):
+def _normalize_extensions(extensions):
+    """Normaliza extensões para lowercase com ponto inicial"""
+    if extensions is None:
+        extensions = ['.txt', '.pdf']
+    return {ext.lower() if ext.startswith('.') else f'.{ext.lower()}'
+            for ext in extensions}
+
+
+def _matches(relative_path, name, patterns):
+    """Verifica se o caminho relativo (com '/') ou o nome casa com algum glob"""
+    return any(fnmatch.fnmatch(relative_path, p) or fnmatch.fnmatch(name, p)
+               for p in patterns)
+
+
+def _sorted_entries(directory):
+    """
+    Lista as entradas de um diretório na ordem do caminho relativo completo
+
+    Diretórios são ordenados como 'nome' + separador, de modo que o percurso
+    em profundidade produz a mesma ordem de uma ordenação global por
+    caminho relativo (a ordem histórica de scan_directory).
+    """
+    try:
+        with os.scandir(directory) as it:
+            entries = list(it)
+    except (PermissionError, FileNotFoundError, NotADirectoryError):
+        return []  # Ignora diretórios sem permissão ou removidos durante o percurso
+
+    def sort_key(entry):
+        try:
+            is_dir = entry.is_dir(follow_symlinks=False)
+        except OSError:
+            is_dir = False
+        return entry.name + os.sep if is_dir else entry.name
+
+    return sorted(entries, key=sort_key)
+
+
+def _file_info(entry, relative_path, relative_dir, options):
+    """
+    Aplica os filtros a um arquivo e monta seu file_info
+
+    Usa os dados em cache de DirEntry (tipo e stat) em vez de novas chamadas
+    a is_file()/stat() por caminho.
+
+    Returns:
+        dict ou None se o arquivo for filtrado
+    """
+    try:
+        if not entry.is_file():
+            return None
+    except OSError:
+        return None
+
+    file_ext = os.path.splitext(entry.name)[1].lower()
+    if file_ext not in options['extensions']:
+        return None
+
+    match_path = relative_path.replace(os.sep, '/')
+    if options['include'] and not _matches(match_path, entry.name, options['include']):
+        return None
+    if options['exclude'] and _matches(match_path, entry.name, options['exclude']):
+        return None
+
+    try:
+        stat = entry.stat()
+    except OSError:
+        return None
+
+    if options['min_size'] is not None and stat.st_size < options['min_size']:
+        return None
+    if options['max_size'] is not None and stat.st_size > options['max_size']:
+        return None
+
+    return {
+        'path': entry.path,
+        'relative_path': relative_path,
+        'filename': entry.name,
+        'type': file_ext[1:],  # Remove o ponto da extensão
+        'size': stat.st_size,
+        'mtime': stat.st_mtime,
+        'directory': relative_dir or '.'
+    }
+
+
+def _walk(directory, relative_dir, options):
+    """Percorre um diretório em profundidade, gerando os arquivos aceitos em ordem"""
+    for entry in _sorted_entries(directory):
+        relative_path = os.path.join(relative_dir, entry.name) if relative_dir else entry.name
+
+        try:
+            is_dir = entry.is_dir(follow_symlinks=False)
+        except OSError:
+            continue
+
+        if is_dir:
+            match_path = relative_path.replace(os.sep, '/')
+            if not (options['exclude'] and _matches(match_path, entry.name, options['exclude'])):
+                yield from _walk(entry.path, relative_path, options)
+            continue
+
+        file_info = _file_info(entry, relative_path, relative_dir, options)
+        if file_info is not None:
+            yield file_info
+
+
+def iter_directory(root_path, extensions=None, include=None, exclude=None,
+                   min_size=None, max_size=None, parallel=False, workers=8):
+    """
+    Percorre um diretório recursivamente, gerando os arquivos à medida que são encontrados
+
+    A ordem é a mesma de scan_directory (caminho relativo), o que permite
+    iniciar a leitura dos arquivos antes do fim do percurso.
+
+    Args:
+        root_path: Caminho raiz para iniciar a busca
+        extensions: Lista de extensões a buscar (padrão: ['.txt', '.pdf'])
+        include: Globs que o arquivo deve casar (caminho relativo com '/' ou nome)
+        exclude: Globs de arquivos ou diretórios a ignorar
+        min_size: Tamanho mínimo em bytes
+        max_size: Tamanho máximo em bytes
+        parallel: Se True, percorre os subdiretórios de primeiro nível em threads
+        workers: Número de threads do percurso paralelo
+
+    Yields:
+        dict: Informações do arquivo (mesmo formato de scan_directory)
+    """
+    options = {
+        'extensions': _normalize_extensions(extensions),
+        'include': list(include or []),
+        'exclude': list(exclude or []),
+        'min_size': min_size,
+        'max_size': max_size
+    }
+    root_path = str(root_path)
+
+    if not parallel:
+        yield from _walk(root_path, '', options)
+        return
+
+    # Percurso paralelo: cada subdiretório de primeiro nível vira uma tarefa;
+    # os resultados são entregues na ordem, assim que cada um termina
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+
+        for entry in _sorted_entries(root_path):
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+
+            if is_dir:
+                if options['exclude'] and _matches(entry.name, entry.name, options['exclude']):
+                    continue
+                pending.append(pool.submit(lambda e=entry: list(_walk(e.path, e.name, options))))
+            else:
+                pending.append(_file_info(entry, entry.name, '', options))
+
+        while pending:
+            item = pending.popleft()
+            if hasattr(item, 'result'):
+                yield from item.result()
+            elif item is not None:
+                yield item
+
+
+def scan_directory(root_path, extensions=None, **filters):
     """
     Escaneia um diretório recursivamente buscando arquivos com extensões específicas
 
     Args:
         root_path: Caminho raiz para iniciar a busca
         extensions: Lista de extensões a buscar (padrão: ['.txt', '.pdf'])
+        **filters: Filtros de iter_directory (include, exclude, min_size,
+            max_size, parallel, workers)
 
     Returns:
         list: Lista de dicionários com informações dos arquivos encontrados
     """
-    if extensions is None:
-        extensions = ['.txt', '.pdf']
-
-    # Normaliza extensões para lowercase
-    extensions = [ext.lower() if ext.startswith('.') else f'.{ext.lower()}'
-                  for ext in extensions]
-
-    files_found = []
-    root_path = Path(root_path)
-
-    # Percorre recursivamente todos os arquivos
-    for file_path in root_path.rglob('*'):
-        if file_path.is_file():
-            file_ext = file_path.suffix.lower()
-
-            if file_ext in extensions:
-                # Calcula o caminho relativo à pasta raiz
-                relative_path = file_path.relative_to(root_path)
-
-                file_info = {
-                    'path': str(file_path),
-                    'relative_path': str(relative_path),
-                    'filename': file_path.name,
-                    'type': file_ext[1:],  # Remove o ponto da extensão
-                    'size': file_path.stat().st_size,
-                    'directory': str(file_path.parent.relative_to(root_path))
-                }
-
-                files_found.append(file_info)
+    files_found = list(iter_directory(root_path, extensions, **filters))
 
     # Ordena por caminho relativo para manter organização
     files_found.sort(key=lambda x: x['relative_path'])
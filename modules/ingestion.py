@@ -0,0 +1,156 @@
+"""
+Módulo para leitura concorrente dos arquivos encontrados pelo scanner
+TXT são lidos em um pool de threads (I/O e decodificação) e PDF em um pool
+de processos (extração de texto do pypdf é limitada por CPU)
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, Any, Iterable, Iterator, Optional, Tuple
+
+from .txt_reader import read_txt_document, count_words, STREAM_WINDOW_SIZE
+from .pdf_reader import read_pdf_document
+from .manifest import file_content_hash
+from .document_structure import segment_document
+
+
+def load_file(
+    file_info: Dict[str, Any],
+    pdf_options: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Lê o conteúdo e os metadados de sistema de um arquivo
+
+    Args:
+        file_info: Dicionário retornado por scan_directory ('content_hash', se
+            presente, é o hash já calculado do arquivo e evita relê-lo)
+        pdf_options: Opções repassadas a read_pdf_document (ex.: parallel_threshold)
+
+    Returns:
+        dict: content, size_bytes, modified_date, content_hash, word_count,
+            structure (seções, páginas e parágrafos, ver segment_document) e,
+            para PDFs, pdf_info (pages, metadata e outline)
+
+    Raises:
+        Exception: Se o tipo não for suportado ou a leitura falhar
+    """
+    file_path = file_info['path']
+    file_type = file_info['type']
+
+    pdf_info = None
+
+    if file_type == 'txt':
+        # Uma única leitura do arquivo: texto e hash vêm do mesmo buffer
+        txt = read_txt_document(file_path)
+        content = txt['content']
+        content_hash = txt['content_hash']
+    elif file_type == 'pdf':
+        # Uma única abertura do PDF: texto, páginas, metadados e outline
+        pdf = read_pdf_document(file_path, **(pdf_options or {}))
+        content = pdf.pop('content')
+        content_hash = file_info.get('content_hash') or file_content_hash(file_path)
+        pdf_info = pdf
+    else:
+        raise ValueError("Tipo não suportado")
+
+    stat = os.stat(file_path)
+
+    result = {
+        'content': content,
+        'size_bytes': stat.st_size,
+        'modified_date': datetime.fromtimestamp(stat.st_mtime).isoformat(),
+        'content_hash': content_hash,
+        # Contagem por janelas: sem a lista de palavras do texto inteiro
+        'word_count': count_words(
+            content[start:start + STREAM_WINDOW_SIZE]
+            for start in range(0, len(content), STREAM_WINDOW_SIZE)
+        ),
+        # Segmentação feita uma vez, ainda no worker de leitura
+        'structure': segment_document(content)
+    }
+    if pdf_info is not None:
+        result['pdf_info'] = pdf_info
+
+    return result
+
+
+def load_files(
+    files: Iterable[Dict[str, Any]],
+    io_workers: Optional[int] = None,
+    pdf_workers: Optional[int] = None,
+    pdf_options: Optional[Dict[str, Any]] = None,
+    max_pending: Optional[int] = None
+) -> Iterator[Tuple[int, Dict[str, Any], Any]]:
+    """
+    Lê os arquivos concorrentemente, devolvendo-os na ordem de entrada
+
+    `files` pode ser um gerador (ex.: iter_directory): as leituras começam
+    enquanto o percurso do diretório ainda está em andamento.
+
+    Args:
+        files: Arquivos a ler (lista ou iterável, na ordem desejada)
+        io_workers: Threads para arquivos TXT (padrão: 8; 1 = sequencial)
+        pdf_workers: Processos para arquivos PDF (padrão: nº de CPUs; 1 = sequencial)
+        pdf_options: Opções repassadas a read_pdf_document (com o pool de
+            processos ativo, page_workers é limitado a nº de CPUs / pdf_workers,
+            para que os processos por página não se multipliquem pelos do pool)
+        max_pending: Máximo de leituras em andamento (limita a memória;
+            padrão: 4x o total de workers)
+
+    Yields:
+        (índice 1-based, file_info, resultado de load_file ou a exceção levantada)
+    """
+    io_workers = io_workers or 8
+    pdf_workers = pdf_workers or os.cpu_count() or 1
+    max_pending = max_pending or 4 * (io_workers + pdf_workers)
+
+    thread_pool = ThreadPoolExecutor(max_workers=io_workers) if io_workers > 1 else None
+    # Nos workers do pool, cada PDF grande usa só a sua parte dos núcleos
+    # (com pdf_workers = nº de CPUs, a extração por páginas fica sequencial)
+    pool_pdf_options = dict(pdf_options or {})
+    page_share = max(1, (os.cpu_count() or 1) // pdf_workers)
+    pool_pdf_options['page_workers'] = min(pool_pdf_options.get('page_workers') or page_share,
+                                           page_share)
+    # O pool de processos só é criado quando aparece o primeiro PDF
+    process_pool = None
+
+    def collect(entry):
+        idx, file_info, future = entry
+        try:
+            result = future.result() if future else load_file(file_info, pdf_options)
+        except Exception as e:
+            result = e
+        return idx, file_info, result
+
+    try:
+        pending = deque()
+
+        # Envia as leituras à medida que os arquivos chegam; cada arquivo vai
+        # para o pool adequado ao tipo
+        for idx, file_info in enumerate(files, 1):
+            options = pdf_options
+            if file_info.get('type') == 'pdf':
+                if process_pool is None and pdf_workers > 1:
+                    process_pool = ProcessPoolExecutor(max_workers=pdf_workers)
+                pool = process_pool
+                if pool:
+                    options = pool_pdf_options
+            else:
+                pool = thread_pool
+            future = pool.submit(load_file, file_info, options) if pool else None
+            pending.append((idx, file_info, future))
+
+            # Consome na ordem original para manter ids e saída determinísticos
+            while pending and (len(pending) >= max_pending
+                               or (pending[0][2] is not None and pending[0][2].done())):
+                yield collect(pending.popleft())
+
+        while pending:
+            yield collect(pending.popleft())
+
+    finally:
+        for pool in (thread_pool, process_pool):
+            if pool:
+                pool.shutdown(wait=True, cancel_futures=True)
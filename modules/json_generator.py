@@ -65,6 +65,7 @@ def calculate_nlp_statistics(documents: List[Dict[str, Any]]) -> Dict[str, Any]:
         "documents_with_nlp": 0,
         "total_entities": 0,
         "documents_with_summary": 0,
+        "near_duplicates": 0,
         "entity_types": {},
         "document_types": {},
         "legal_areas": {}
@@ -73,6 +74,11 @@ def calculate_nlp_statistics(documents: List[Dict[str, Any]]) -> Dict[str, Any]:
     for doc in documents:
         nlp = doc.get('nlp_analysis', {})
 
+        # Quase duplicata: a análise é a do documento canônico
+        if doc.get('near_duplicate_of'):
+            stats['near_duplicates'] += 1
+            continue
+
         if nlp:
             stats['documents_with_nlp'] += 1
 
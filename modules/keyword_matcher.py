@@ -0,0 +1,262 @@
+"""
+Autômato de palavras-chave jurídicas (Aho-Corasick)
+Encontra, em uma única passada, todas as ocorrências dos termos usados na
+classificação do documento, na análise da decisão e no score de sentenças
+"""
+
+import threading
+from bisect import bisect_right
+from typing import Dict, List, Any, Optional, Tuple
+
+
+# Grupo -> rótulo -> termos. A ordem dos rótulos é a ordem de prioridade
+# (ex.: o primeiro tipo de documento encontrado vence)
+DOCUMENT_TYPES = {
+    'acordao': ['acórdão', 'acordão', 'voto', 'relator'],
+    'sentenca': ['sentença', 'julgo procedente', 'julgo improcedente'],
+    'peticao': ['petição', 'requer', 'excelentíssimo'],
+    'parecer': ['parecer', 'opina', 'manifesta-se'],
+    'decisao': ['decisão', 'defiro', 'indefiro'],
+    'despacho': ['despacho', 'vista', 'manifeste-se']
+}
+
+LEGAL_AREAS = {
+    'civil': ['direito civil', 'obrigação', 'contrato', 'responsabilidade civil'],
+    'penal': ['direito penal', 'crime', 'pena', 'código penal', 'condenação'],
+    'trabalhista': ['trabalhista', 'clt', 'empregado', 'empregador', 'rescisão'],
+    'tributario': ['tributário', 'imposto', 'tributo', 'icms', 'irpf'],
+    'constitucional': ['constitucional', 'constituição', 'stf', 'adi', 'adpf'],
+    'administrativo': ['administrativo', 'servidor público', 'licitação']
+}
+
+DECISION_TERMS = {
+    'procedente': ['julgo procedente', 'dou provimento', 'acordam em dar provimento'],
+    'improcedente': ['julgo improcedente', 'nego provimento', 'acordam em negar'],
+    'parcialmente_procedente': ['parcialmente procedente']
+}
+
+CONCLUSIVE_TERMS = {
+    'conclusivo': ['portanto', 'assim', 'logo', 'consequentemente', 'conclui']
+}
+
+
+def legal_keyword_tables(legal_config: Optional[Dict[str, Any]] = None) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Monta as tabelas de palavras-chave do autômato
+
+    Args:
+        legal_config: LEGAL_CONFIG (opcional). 'tipos_documento' e
+            'areas_direito' restringem os tipos e áreas detectados
+
+    Returns:
+        dict: {grupo: {rótulo: [termos]}}
+    """
+    legal_config = legal_config or {}
+    doc_types = legal_config.get('tipos_documento')
+    areas = legal_config.get('areas_direito')
+
+    return {
+        'tipo_documento': {
+            label: terms for label, terms in DOCUMENT_TYPES.items()
+            if doc_types is None or label in doc_types
+        },
+        'area_direito': {
+            label: terms for label, terms in LEGAL_AREAS.items()
+            if areas is None or label in areas
+        },
+        'decisao': dict(DECISION_TERMS),
+        'conclusivo': dict(CONCLUSIVE_TERMS)
+    }
+
+
+class KeywordHits:
+    """Ocorrências dos termos de um autômato em um texto"""
+
+    def __init__(self, tables: Dict[str, Dict[str, List[str]]], positions: Dict[str, List[int]]):
+        """
+        Args:
+            tables: Tabelas do autômato ({grupo: {rótulo: [termos]}})
+            positions: {termo: [posições iniciais]} no texto em minúsculas
+        """
+        self.tables = tables
+        self.positions = positions
+
+    def has(self, group: str, label: str) -> bool:
+        """Indica se algum termo do rótulo ocorre no texto"""
+        return any(term in self.positions for term in self.tables[group].get(label, []))
+
+    def labels(self, group: str) -> List[str]:
+        """Rótulos do grupo com ao menos uma ocorrência (na ordem da tabela)"""
+        return [label for label in self.tables[group] if self.has(group, label)]
+
+    def first(self, group: str) -> Optional[str]:
+        """Primeiro rótulo do grupo (ordem de prioridade) com ocorrência"""
+        for label in self.tables[group]:
+            if self.has(group, label):
+                return label
+        return None
+
+    def spans(self, group: str) -> List[Tuple[int, int]]:
+        """Spans (início, fim) de todas as ocorrências dos termos do grupo, ordenados"""
+        spans = []
+        for terms in self.tables[group].values():
+            for term in terms:
+                spans.extend((start, start + len(term)) for start in self.positions.get(term, []))
+        return sorted(set(spans))
+
+
+class KeywordAutomaton:
+    """
+    Autômato multi-padrão construído uma vez a partir das tabelas de termos
+
+    Usa o Aho-Corasick em C do pacote pyahocorasick quando instalado (uma
+    passada linear pelo texto para todos os termos). Sem ele, cada termo é
+    buscado com str.find, com o mesmo resultado.
+
+    A busca é por substring no texto em minúsculas, como os testes `in`
+    que o autômato substitui.
+    """
+
+    def __init__(self, tables: Dict[str, Dict[str, List[str]]]):
+        """
+        Args:
+            tables: {grupo: {rótulo: [termos]}} (ver legal_keyword_tables)
+        """
+        self.tables = {
+            group: {label: [term.lower() for term in terms] for label, terms in labels.items()}
+            for group, labels in tables.items()
+        }
+        self.terms = list(dict.fromkeys(
+            term for labels in self.tables.values() for terms in labels.values() for term in terms
+        ))
+
+        self._automaton = None
+        try:
+            import ahocorasick
+            automaton = ahocorasick.Automaton()
+            for term in self.terms:
+                automaton.add_word(term, term)
+            if self.terms:
+                automaton.make_automaton()
+                self._automaton = automaton
+        except ImportError:
+            pass
+
+        # Última busca: classificação e análise da decisão consultam o mesmo texto
+        self._last = (None, None)
+
+    @property
+    def engine(self) -> str:
+        return 'aho-corasick' if self._automaton is not None else 'str.find'
+
+    def find(self, text: str, lowered: bool = False) -> KeywordHits:
+        """
+        Encontra todas as ocorrências dos termos no texto
+
+        Args:
+            text: Texto a analisar
+            lowered: True se `text` já estiver em minúsculas
+
+        Returns:
+            KeywordHits (posições relativas ao texto em minúsculas)
+        """
+        last_text, last_hits = self._last
+        if last_text is text:
+            return last_hits
+
+        haystack = text if lowered else text.lower()
+        positions: Dict[str, List[int]] = {}
+
+        if self._automaton is not None:
+            for end, term in self._automaton.iter(haystack):
+                positions.setdefault(term, []).append(end - len(term) + 1)
+        else:
+            for term in self.terms:
+                start = haystack.find(term)
+                while start >= 0:
+                    positions.setdefault(term, []).append(start)
+                    start = haystack.find(term, start + 1)
+
+        hits = KeywordHits(self.tables, positions)
+        self._last = (text, hits)
+        return hits
+
+    def forget(self):
+        """Descarta a última busca (e a referência ao texto analisado)"""
+        self._last = (None, None)
+
+    def sentences_with(
+        self,
+        group: str,
+        sentences: List[str],
+        full_text: str,
+        starts: Optional[List[int]] = None,
+        text_lower: Optional[str] = None
+    ) -> set:
+        """
+        Índices das sentenças que contêm algum termo do grupo
+
+        Faz uma única busca no texto completo e distribui as ocorrências
+        pelas sentenças (substrings de `full_text`, em ordem).
+
+        Args:
+            group: Grupo de termos
+            sentences: Sentenças extraídas de full_text
+            full_text: Texto de onde as sentenças vieram
+            starts: Offset de cada sentença em full_text, se já conhecido
+            text_lower: full_text em minúsculas, se já calculado
+
+        Returns:
+            set: Índices das sentenças com ocorrência
+        """
+        if starts is None:
+            starts = []
+            cursor = 0
+            for sentence in sentences:
+                start = full_text.find(sentence, cursor)
+                if start < 0:
+                    break
+                starts.append(start)
+                cursor = start + len(sentence)
+
+        if text_lower is None:
+            text_lower = full_text.lower()
+        if len(starts) != len(sentences) or len(text_lower) != len(full_text):
+            # Offsets não confiáveis (ex.: minúsculas que mudam o tamanho): busca por sentença
+            return {i for i, sentence in enumerate(sentences)
+                    if self.find(sentence).labels(group)}
+
+        found = set()
+        for start, end in self.find(text_lower, lowered=True).spans(group):
+            idx = bisect_right(starts, start) - 1
+            if idx >= 0 and end <= starts[idx] + len(sentences[idx]):
+                found.add(idx)
+        return found
+
+
+_automatons: Dict[Any, KeywordAutomaton] = {}
+_automatons_lock = threading.Lock()
+
+
+def get_keyword_automaton(legal_config: Optional[Dict[str, Any]] = None) -> KeywordAutomaton:
+    """
+    Retorna o autômato compartilhado do processo para a configuração dada
+
+    Args:
+        legal_config: LEGAL_CONFIG (opcional)
+
+    Returns:
+        KeywordAutomaton
+    """
+    legal_config = legal_config or {}
+    key = (
+        tuple(legal_config['tipos_documento']) if legal_config.get('tipos_documento') is not None else None,
+        tuple(legal_config['areas_direito']) if legal_config.get('areas_direito') is not None else None
+    )
+
+    with _automatons_lock:
+        automaton = _automatons.get(key)
+        if automaton is None:
+            automaton = KeywordAutomaton(legal_keyword_tables(legal_config))
+            _automatons[key] = automaton
+        return automaton
@@ -4,20 +4,132 @@ Baseado em Flair, spaCy e modelos customizados para o domínio jurídico
 """
 
 import re
-from typing import Dict, List, Any, Optional
+import time
+import random
+import itertools
+from typing import Dict, List, Any, Iterable, Optional, Tuple
 import warnings
 warnings.filterwarnings('ignore')
 
+from .model_registry import get_model_registry, spacy_candidates
+from .pattern_scanner import PatternScanner
+from .document_structure import segment_document
+from .defaults import SELECTIVE_NER_DEFAULTS
+
+
+# Categorias de saída -> tipo de padrão regex
+REGEX_CATEGORIES = {
+    'processos': 'processo',
+    'leis': 'lei',
+    'artigos': 'artigo',
+    'jurisprudencias': 'jurisprudencia',
+    'tribunais': 'tribunal',
+    'ministros': 'ministro',
+    'varas': 'vara',
+    'datas': 'data',
+    'valores_monetarios': 'valor_monetario',
+    'documentos': 'cpf_cnpj',
+}
+
+# Categorias de saída -> rótulo das entidades do spaCy
+ML_CATEGORIES = {
+    'pessoas': 'PER',
+    'organizacoes': 'ORG',
+    'locais': 'LOC',
+}
+
+
+# Rótulo do spaCy -> (categoria interna, tipo da entidade)
+SPACY_LABELS = {
+    'PER': ('PER', 'pessoa'),
+    'PERSON': ('PER', 'pessoa'),
+    'ORG': ('ORG', 'organizacao'),
+    'LOC': ('LOC', 'local'),
+    'GPE': ('LOC', 'local'),
+}
+
+# Componentes do pipeline do spaCy que produzem entidades (os demais são desativados)
+NER_PIPES = ('ner', 'entity_ruler')
+
+# Caracteres que uma região pode crescer para não cortar palavras nas bordas
+REGION_WORD_SLACK = 50
+
+
+def split_text_for_nlp(text: str, max_chars: int) -> List[Tuple[int, str]]:
+    """
+    Divide um texto longo em trechos de até `max_chars`, preferindo quebras de parágrafo
+
+    Args:
+        text: Texto completo
+        max_chars: Tamanho máximo de cada trecho
+
+    Returns:
+        list: (offset no texto, trecho); a concatenação dos trechos é o texto
+    """
+    segments = []
+    start = 0
+
+    while len(text) - start > max_chars:
+        limit = start + max_chars
+        # Parágrafo, depois linha, depois espaço; em último caso corta no limite
+        for separator in ('\n\n', '\n', ' '):
+            cut = text.rfind(separator, start, limit)
+            if cut > start:
+                cut += len(separator)
+                break
+        else:
+            cut = limit
+        segments.append((start, text[start:cut]))
+        start = cut
+
+    segments.append((start, text[start:]))
+    return segments
+
+
+def _empty_entities() -> Dict[str, List[Dict[str, Any]]]:
+    """Estrutura vazia de entidades por categoria"""
+    return {key: [] for key in list(REGEX_CATEGORIES) + list(ML_CATEGORIES)}
+
 
 class LegalEntityExtractor:
     """
     Extrator de entidades jurídicas específicas do domínio legal brasileiro
     """
 
-    def __init__(self):
-        """Inicializa o extrator com padrões regex para entidades jurídicas"""
+    def __init__(
+        self,
+        spacy_model: Optional[str] = None,
+        batch_size: int = 16,
+        n_process: int = 1,
+        max_chars: int = 100000,
+        ml_scope: str = 'full',
+        selective: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Inicializa o extrator com padrões regex para entidades jurídicas
+
+        Args:
+            spacy_model: Modelo spaCy preferido (padrão: pt_core_news_lg)
+            batch_size: Textos (ou trechos) por lote do nlp.pipe
+            n_process: Processos usados pelo nlp.pipe
+            max_chars: Textos maiores são divididos em trechos (por parágrafo)
+                antes de passar pelo spaCy
+            ml_scope: 'full' (spaCy no texto inteiro) ou 'selective' (apenas
+                cabeçalho, seções e janelas em torno de entidades regex)
+            selective: Ajustes do modo seletivo (ver SELECTIVE_NER_DEFAULTS)
+        """
+        self.spacy_model = spacy_model
+        self.batch_size = batch_size
+        self.n_process = n_process
+        self.max_chars = max_chars
+        self.ml_scope = ml_scope
+        self.selective = {**SELECTIVE_NER_DEFAULTS, **(selective or {})}
         self.initialized = False
         self.use_ml_models = False
+        self.nlp = None
+        self._scanner = None
+        self._scanner_key = None
+        self._disabled_pipes = None
 
         # Padrões regex para entidades jurídicas brasileiras
         self.patterns = {
@@ -75,84 +187,235 @@ class LegalEntityExtractor:
         }
 
     def initialize_ml_models(self):
-        """Inicializa modelos de ML (spaCy, Flair) se disponíveis"""
+        """Obtém o modelo spaCy do registro compartilhado, se disponível"""
         try:
-            import spacy
-            try:
-                self.nlp = spacy.load('pt_core_news_lg')
-                self.use_ml_models = True
-                print("✓ Modelo spaCy carregado para português")
-            except:
-                try:
-                    self.nlp = spacy.load('pt_core_news_sm')
-                    self.use_ml_models = True
-                    print("✓ Modelo spaCy básico carregado")
-                except:
-                    print("⚠ Modelo spaCy não encontrado. Usando apenas regex.")
-                    self.use_ml_models = False
+            import spacy  # noqa: F401
         except ImportError:
             print("⚠ spaCy não instalado. Usando apenas regex.")
             self.use_ml_models = False
+            self.initialized = True
+            return
+
+        registry = get_model_registry()
+        candidates = spacy_candidates(self.spacy_model)
+        already_loaded = any(registry.is_loaded('spacy', name) for name in candidates)
+
+        self.nlp = registry.get_spacy(candidates)
+        self.use_ml_models = self.nlp is not None
+
+        if not already_loaded:
+            if self.use_ml_models:
+                print(f"✓ Modelo spaCy carregado para português: {self.nlp.meta.get('name', '')}")
+            else:
+                print("⚠ Modelo spaCy não encontrado. Usando apenas regex.")
 
         self.initialized = True
 
-    def extract_entities(self, text: str, use_ml: bool = True) -> Dict[str, List[Dict[str, Any]]]:
+    def extract_entities(
+        self,
+        text: str,
+        use_ml: bool = True,
+        structure: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
         """
         Extrai entidades nomeadas do texto jurídico
 
         Args:
             text: Texto a ser analisado
             use_ml: Se True, usa modelos ML quando disponíveis
+            structure: Estrutura do texto (ver segment_document; seções do modo seletivo)
 
         Returns:
             Dicionário com entidades extraídas por categoria
         """
+        return self.extract_entities_batch([text], use_ml=use_ml, structures=[structure])[0]
+
+    def extract_entities_batch(
+        self,
+        texts: List[str],
+        use_ml: bool = True,
+        structures: Optional[List[Optional[Dict[str, Any]]]] = None
+    ) -> List[Dict[str, List[Dict[str, Any]]]]:
+        """
+        Extrai entidades de vários textos, passando-os juntos pelo spaCy (nlp.pipe)
+
+        Args:
+            texts: Textos a analisar
+            use_ml: Se True, usa modelos ML quando disponíveis
+            structures: Estrutura de cada texto (calculada se ausente; só o
+                modo seletivo a usa)
+
+        Returns:
+            list: Entidades por categoria de cada texto (como extract_entities)
+        """
         if not self.initialized:
             self.initialize_ml_models()
 
-        entities = {
-            'processos': [],
-            'leis': [],
-            'artigos': [],
-            'jurisprudencias': [],
-            'tribunais': [],
-            'ministros': [],
-            'varas': [],
-            'datas': [],
-            'valores_monetarios': [],
-            'documentos': [],
-            'pessoas': [],
-            'organizacoes': [],
-            'locais': []
-        }
+        results = []
 
-        # Extração baseada em regex
-        entities['processos'] = self._extract_by_pattern(text, 'processo')
-        entities['leis'] = self._extract_by_pattern(text, 'lei')
-        entities['artigos'] = self._extract_by_pattern(text, 'artigo')
-        entities['jurisprudencias'] = self._extract_by_pattern(text, 'jurisprudencia')
-        entities['tribunais'] = self._extract_by_pattern(text, 'tribunal')
-        entities['ministros'] = self._extract_by_pattern(text, 'ministro')
-        entities['varas'] = self._extract_by_pattern(text, 'vara')
-        entities['datas'] = self._extract_by_pattern(text, 'data')
-        entities['valores_monetarios'] = self._extract_by_pattern(text, 'valor_monetario')
-        entities['documentos'] = self._extract_by_pattern(text, 'cpf_cnpj')
+        # Extração baseada em regex (uma única varredura para todas as categorias)
+        for text in texts:
+            entities = _empty_entities()
+            for key, pattern_lists in self._scan_patterns(text).items():
+                entities[key] = [entity for found in pattern_lists for entity in found]
+            results.append(entities)
 
         # Extração com modelos ML (spaCy) se disponível
         if use_ml and self.use_ml_models:
-            ml_entities = self._extract_with_spacy(text)
-            entities['pessoas'].extend(ml_entities.get('PER', []))
-            entities['organizacoes'].extend(ml_entities.get('ORG', []))
-            entities['locais'].extend(ml_entities.get('LOC', []))
+            if self.ml_scope == 'selective':
+                ml_results = self._extract_with_spacy_selective(texts, results, structures)
+            else:
+                ml_results = self._extract_with_spacy_batch(texts)
+            for entities, ml_entities in zip(results, ml_results):
+                for key, label in ML_CATEGORIES.items():
+                    entities[key].extend(ml_entities.get(label, []))
 
         # Remove duplicatas
+        for entities in results:
+            for key in entities:
+                entities[key] = self._remove_duplicates(entities[key])
+
+        return results
+
+    def extract_entities_from_windows(
+        self,
+        windows: Iterable[str],
+        use_ml: bool = True,
+        context: int = 2000
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Extrai entidades de um texto recebido em janelas (ex.: iter_txt_windows)
+
+        Cada passada analisa a janela atual mais `context` caracteres da
+        anterior, e só aceita entidades que começam na região nova e terminam
+        com folga antes do fim do buffer. Assim, entidades cortadas entre
+        janelas são encontradas inteiras, com offsets relativos ao texto
+        completo, sem que ele seja montado em memória.
+
+        Args:
+            windows: Iterável de trechos consecutivos do texto
+            use_ml: Se True, usa modelos ML quando disponíveis
+            context: Caracteres de contexto mantidos entre janelas
+                (maior que a maior entidade esperada)
+
+        Returns:
+            Dicionário com entidades extraídas por categoria (como extract_entities)
+        """
+        if not self.initialized:
+            self.initialize_ml_models()
+
+        entities = _empty_entities()
+        # Mantém a ordem de extract_entities: padrão a padrão, depois posição
+        by_pattern = {
+            key: [[] for _ in self.patterns.get(entity_type, [])]
+            for key, entity_type in REGEX_CATEGORIES.items()
+        }
+        buffer = ''
+        buffer_start = 0  # offset global do início do buffer
+        accepted_from = 0  # offset global a partir do qual aceitar entidades
+
+        for window in itertools.chain(windows, [None]):
+            last = window is None
+            if not last:
+                buffer += window
+                # Acumula até haver região nova suficiente além do contexto
+                if len(buffer) < 3 * context:
+                    continue
+
+            cut = buffer_start + len(buffer) - (0 if last else context)
+
+            scanned = self._scan_patterns(buffer, offset=buffer_start)
+            for key, pattern_lists in scanned.items():
+                for pattern_idx, found in enumerate(pattern_lists):
+                    by_pattern[key][pattern_idx].extend(
+                        entity for entity in found if accepted_from <= entity['start'] < cut
+                    )
+
+            if use_ml and self.use_ml_models and cut > accepted_from:
+                if self.ml_scope == 'selective':
+                    buffer_entities = {
+                        key: [entity for found in pattern_lists for entity in found]
+                        for key, pattern_lists in scanned.items()
+                    }
+                    regions = [
+                        (max(start, accepted_from), min(end, cut))
+                        for start, end in self._ml_regions(buffer, buffer_entities, offset=buffer_start)
+                        if start < cut and end > accepted_from
+                    ]
+                else:
+                    regions = [(accepted_from, cut)]
+
+                ml_results = self._extract_with_spacy_batch(
+                    [buffer[start - buffer_start:end - buffer_start] for start, end in regions],
+                    [start for start, _ in regions]
+                )
+                for ml_entities in ml_results:
+                    for key, label in ML_CATEGORIES.items():
+                        entities[key].extend(ml_entities.get(label, []))
+
+            accepted_from = cut
+
+            # Mantém contexto à esquerda do próximo corte para ressincronizar os padrões
+            keep_from = max(0, len(buffer) - 2 * context)
+            buffer = buffer[keep_from:]
+            buffer_start += keep_from
+
+        for key, pattern_lists in by_pattern.items():
+            entities[key] = [entity for found in pattern_lists for entity in found] + entities[key]
+
         for key in entities:
             entities[key] = self._remove_duplicates(entities[key])
 
         return entities
 
+    def _get_scanner(self) -> PatternScanner:
+        """Varredor compilado com os padrões de todas as categorias regex"""
+        key = tuple(
+            (entity_type, tuple(self.patterns.get(entity_type, [])))
+            for entity_type in REGEX_CATEGORIES.values()
+        )
+        # Recompila apenas se self.patterns tiver sido alterado
+        if self._scanner is None or self._scanner_key != key:
+            self._scanner = PatternScanner(
+                [pattern for _, patterns in key for pattern in patterns],
+                re.IGNORECASE
+            )
+            self._scanner_key = key
+        return self._scanner
+
+    def _scan_patterns(
+        self,
+        text: str,
+        offset: int = 0
+    ) -> Dict[str, List[List[Dict[str, Any]]]]:
+        """
+        Extrai as entidades de todas as categorias regex em uma única varredura
+
+        Returns:
+            dict: {categoria: [entidades de cada padrão, na ordem de self.patterns]}
+                com offsets somados a `offset`
+        """
+        spans = iter(self._get_scanner().find_all(text))
+        result = {}
+
+        for key, entity_type in REGEX_CATEGORIES.items():
+            result[key] = [
+                [
+                    {
+                        'text': text[start:end],
+                        'start': start + offset,
+                        'end': end + offset,
+                        'type': entity_type
+                    }
+                    for start, end in next(spans)
+                ]
+                for _ in self.patterns.get(entity_type, [])
+            ]
+
+        return result
+
     def _extract_by_pattern(self, text: str, entity_type: str) -> List[Dict[str, Any]]:
-        """Extrai entidades usando padrões regex"""
+        """Extrai entidades usando padrões regex (uma varredura por padrão)"""
         entities = []
         patterns = self.patterns.get(entity_type, [])
 
@@ -168,39 +431,184 @@ class LegalEntityExtractor:
 
         return entities
 
-    def _extract_with_spacy(self, text: str) -> Dict[str, List[Dict[str, Any]]]:
-        """Extrai entidades usando spaCy"""
-        entities = {'PER': [], 'ORG': [], 'LOC': []}
+    def _extract_with_spacy(self, text: str, offset: int = 0) -> Dict[str, List[Dict[str, Any]]]:
+        """Extrai entidades usando spaCy (offsets somados a `offset`)"""
+        return self._extract_with_spacy_batch([text], [offset])[0]
+
+    def _ner_disabled_pipes(self) -> List[str]:
+        """Componentes do pipeline desnecessários para o NER"""
+        if self._disabled_pipes is None:
+            pipe_names = list(self.nlp.pipe_names)
+            keep = {name for name in pipe_names if name in NER_PIPES}
+            if not keep:
+                # Pipeline sem componente de entidades conhecido: não desativa nada
+                self._disabled_pipes = []
+                return self._disabled_pipes
+
+            # Mantém as camadas compartilhadas (tok2vec/transformer) que o NER escuta
+            for name, component in self.nlp.pipeline:
+                listeners = getattr(component, 'listening_components', None) or []
+                if keep.intersection(listeners):
+                    keep.add(name)
+
+            self._disabled_pipes = [name for name in pipe_names if name not in keep]
+        return self._disabled_pipes
+
+    def _extract_with_spacy_batch(
+        self,
+        texts: List[str],
+        offsets: Optional[List[int]] = None
+    ) -> List[Dict[str, List[Dict[str, Any]]]]:
+        """
+        Extrai entidades de vários textos com uma única chamada a nlp.pipe
 
-        try:
-            doc = self.nlp(text[:1000000])  # Limita para evitar OOM
+        Textos maiores que `max_chars` são divididos em parágrafos e as
+        entidades de cada trecho voltam com offsets do texto original, de
+        modo que documentos longos são cobertos por inteiro.
 
-            for ent in doc.ents:
-                if ent.label_ in ['PER', 'PERSON']:
-                    entities['PER'].append({
-                        'text': ent.text,
-                        'start': ent.start_char,
-                        'end': ent.end_char,
-                        'type': 'pessoa'
-                    })
-                elif ent.label_ in ['ORG']:
-                    entities['ORG'].append({
-                        'text': ent.text,
-                        'start': ent.start_char,
-                        'end': ent.end_char,
-                        'type': 'organizacao'
-                    })
-                elif ent.label_ in ['LOC', 'GPE']:
-                    entities['LOC'].append({
+        Args:
+            texts: Textos a analisar
+            offsets: Offset somado às posições de cada texto (padrão: 0)
+
+        Returns:
+            list: {'PER', 'ORG', 'LOC'} de cada texto
+        """
+        results = [{'PER': [], 'ORG': [], 'LOC': []} for _ in texts]
+        offsets = offsets or [0] * len(texts)
+        max_chars = min(self.max_chars, self.nlp.max_length)
+
+        segments = (
+            (segment, (text_idx, offsets[text_idx] + segment_start))
+            for text_idx, text in enumerate(texts)
+            for segment_start, segment in split_text_for_nlp(text, max_chars)
+            if segment.strip()
+        )
+
+        try:
+            docs = self.nlp.pipe(
+                segments,
+                as_tuples=True,
+                batch_size=self.batch_size,
+                n_process=self.n_process,
+                disable=self._ner_disabled_pipes()
+            )
+
+            for doc, (text_idx, base) in docs:
+                for ent in doc.ents:
+                    if ent.label_ not in SPACY_LABELS:
+                        continue
+                    label, entity_type = SPACY_LABELS[ent.label_]
+                    results[text_idx][label].append({
                         'text': ent.text,
-                        'start': ent.start_char,
-                        'end': ent.end_char,
-                        'type': 'local'
+                        'start': ent.start_char + base,
+                        'end': ent.end_char + base,
+                        'type': entity_type
                     })
         except Exception as e:
             print(f"⚠ Erro ao processar com spaCy: {str(e)}")
 
-        return entities
+        return results
+
+    def _ml_regions(
+        self,
+        text: str,
+        regex_entities: Dict[str, List[Dict[str, Any]]],
+        offset: int = 0,
+        structure: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[int, int]]:
+        """
+        Regiões do texto analisadas pelo spaCy no modo seletivo
+
+        Cabeçalho, trechos a partir dos títulos de seção configurados (as
+        mesmas seções que a sumarização e a classificação leem) e janelas em torno das entidades regex âncora (ministros, varas,
+        tribunais), unidas e alargadas até o espaço mais próximo.
+
+        Args:
+            text: Texto (ou buffer) analisado
+            regex_entities: Entidades regex do texto, por categoria
+                (antes da remoção de duplicatas: cada ocorrência é uma âncora)
+            offset: Offset global do início de `text`
+            structure: Estrutura de `text` (ver segment_document; calculada se ausente)
+
+        Returns:
+            list: Intervalos (início, fim) em offsets globais, ordenados e disjuntos
+        """
+        config = self.selective
+        text_end = offset + len(text)
+        regions = []
+
+        if config['header_chars'] and offset < config['header_chars']:
+            regions.append((offset, config['header_chars']))
+
+        if structure is None:
+            structure = segment_document(text)
+        for section in structure.get('sections', []):
+            if section['name'] in config['sections']:
+                start = offset + section['start']
+                regions.append((start, start + config['section_chars']))
+
+        window = config['anchor_window']
+        for key, entity_type in REGEX_CATEGORIES.items():
+            if entity_type in config['anchor_types']:
+                for entity in regex_entities.get(key, []):
+                    regions.append((entity['start'] - window, entity['end'] + window))
+
+        merged: List[Tuple[int, int]] = []
+        for start, end in sorted(regions):
+            start = max(start, offset)
+            end = min(end, text_end)
+            if start >= end:
+                continue
+
+            # Alarga as bordas até um espaço para não cortar nomes ao meio
+            for _ in range(REGION_WORD_SLACK):
+                if start <= offset or text[start - offset - 1].isspace():
+                    break
+                start -= 1
+            for _ in range(REGION_WORD_SLACK):
+                if end >= text_end or text[end - offset].isspace():
+                    break
+                end += 1
+
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+
+        return merged
+
+    def _extract_with_spacy_selective(
+        self,
+        texts: List[str],
+        regex_results: List[Dict[str, List[Dict[str, Any]]]],
+        structures: Optional[List[Optional[Dict[str, Any]]]] = None
+    ) -> List[Dict[str, List[Dict[str, Any]]]]:
+        """
+        Executa o spaCy apenas nas regiões de _ml_regions de cada texto
+
+        Todas as regiões de todos os textos vão juntas para o nlp.pipe; as
+        entidades voltam com offsets do texto original.
+
+        Returns:
+            list: {'PER', 'ORG', 'LOC'} de cada texto
+        """
+        pieces = []
+        offsets = []
+        owners = []
+
+        structures = structures or [None] * len(texts)
+        for text_idx, (text, entities, structure) in enumerate(zip(texts, regex_results, structures)):
+            for start, end in self._ml_regions(text, entities, structure=structure):
+                pieces.append(text[start:end])
+                offsets.append(start)
+                owners.append(text_idx)
+
+        results = [{'PER': [], 'ORG': [], 'LOC': []} for _ in texts]
+        for owner, found in zip(owners, self._extract_with_spacy_batch(pieces, offsets)):
+            for label, items in found.items():
+                results[owner][label].extend(items)
+
+        return results
 
     def _remove_duplicates(self, entities: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Remove entidades duplicadas"""
@@ -273,20 +681,31 @@ class LegalEntityExtractor:
         return result
 
 
-def extract_legal_entities(text: str) -> Dict[str, Any]:
+def extract_legal_entities(
+    text: str,
+    extractor: Optional[LegalEntityExtractor] = None,
+    entities: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+    structure: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
     """
     Função helper para extração rápida de entidades jurídicas
 
     Args:
         text: Texto jurídico
+        extractor: Extrator a reutilizar (opcional; o modelo spaCy vem do
+            registro compartilhado em qualquer caso)
+        entities: Entidades já extraídas (ex.: por extract_entities_batch)
+        structure: Estrutura do texto (ver segment_document)
 
     Returns:
         Dicionário com entidades e análise estrutural
     """
-    extractor = LegalEntityExtractor()
+    if extractor is None:
+        extractor = LegalEntityExtractor()
 
     # Extrai entidades
-    entities = extractor.extract_entities(text)
+    if entities is None:
+        entities = extractor.extract_entities(text, structure=structure)
 
     # Extrai teses e argumentos
     teses_argumentos = extractor.extract_teses_argumentos(text)
@@ -302,3 +721,95 @@ def extract_legal_entities(text: str) -> Dict[str, Any]:
             'total_entidades': sum(len(v) for v in entities.values())
         }
     }
+
+
+def _synthetic_acordao(rng: random.Random) -> str:
+    """Gera um acórdão sintético com entidades espalhadas em texto corrido"""
+    nomes = ['Carlos Andrade', 'Maria Souza', 'Luís Fernandes', 'Ana Beatriz Lima', 'Paulo Ribeiro']
+    filler = (
+        "Trata-se de recurso interposto contra decisão que julgou improcedente o pedido "
+        "formulado na inicial. A parte recorrente sustenta violação a dispositivos legais "
+        "e divergência jurisprudencial. Os autos vieram conclusos para julgamento. "
+        "Não há preliminares a analisar e passo ao exame do mérito da controvérsia. "
+    )
+    trechos = [
+        lambda: f"Processo {rng.randint(1000000, 9999999)}-{rng.randint(10, 99)}.2021.8.26.{rng.randint(1000, 9999)}. ",
+        lambda: f"Relator: Ministro {rng.choice(nomes)}. ",
+        lambda: f"Desembargador {rng.choice(nomes)} acompanhou o voto. ",
+        lambda: f"Nos termos do art. {rng.randint(1, 999)}, § {rng.randint(1, 5)} da Lei nº {rng.randint(1000, 14000)}/{rng.randint(1990, 2023)}. ",
+        lambda: f"Conforme a Súmula {rng.randint(1, 600)} do STJ e o REsp nº {rng.randint(100000, 999999)}. ",
+        lambda: f"Julgado pelo Tribunal de Justiça do Estado e pela {rng.randint(1, 40)}ª Vara Cível. ",
+        lambda: f"Sessão de {rng.randint(1, 28)} de março de {rng.randint(2000, 2023)} ({rng.randint(1, 28)}/0{rng.randint(1, 9)}/2022). ",
+        lambda: f"Condenação ao pagamento de R$ {rng.randint(1, 999)}.{rng.randint(100, 999)},00. ",
+        lambda: f"CPF {rng.randint(100, 999)}.{rng.randint(100, 999)}.{rng.randint(100, 999)}-{rng.randint(10, 99)}. ",
+    ]
+
+    partes = ["ACÓRDÃO\n\nEMENTA: "]
+    for _ in range(rng.randint(40, 80)):
+        partes.append(filler * rng.randint(1, 3))
+        partes.append(rng.choice(trechos)())
+    partes.append("\n\nDISPOSITIVO: Ante o exposto, nego provimento ao recurso.")
+    return ''.join(partes)
+
+
+def benchmark_entity_scanner(n_docs: int = 200, repeat: int = 3, seed: int = 42) -> Dict[str, Any]:
+    """
+    Compara a varredura única com o método antigo (uma varredura por padrão)
+
+    Args:
+        n_docs: Número de acórdãos sintéticos
+        repeat: Repetições (vale o melhor tempo de cada método)
+        seed: Semente do gerador do corpus
+
+    Returns:
+        dict: docs, mb, tempos em segundos, speedup e se as saídas são idênticas
+    """
+    rng = random.Random(seed)
+    corpus = [_synthetic_acordao(rng) for _ in range(n_docs)]
+    extractor = LegalEntityExtractor()
+
+    def per_pattern():
+        return [
+            {key: extractor._extract_by_pattern(text, entity_type)
+             for key, entity_type in REGEX_CATEGORIES.items()}
+            for text in corpus
+        ]
+
+    def single_pass():
+        return [
+            {key: [entity for found in pattern_lists for entity in found]
+             for key, pattern_lists in extractor._scan_patterns(text).items()}
+            for text in corpus
+        ]
+
+    timings = {}
+    outputs = {}
+    for name, method in (('por_padrao', per_pattern), ('varredura_unica', single_pass)):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            outputs[name] = method()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        timings[name] = best
+
+    return {
+        'docs': n_docs,
+        'mb': round(sum(len(text) for text in corpus) / 1e6, 2),
+        'por_padrao_s': round(timings['por_padrao'], 3),
+        'varredura_unica_s': round(timings['varredura_unica'], 3),
+        'speedup': round(timings['por_padrao'] / timings['varredura_unica'], 2),
+        'identico': outputs['por_padrao'] == outputs['varredura_unica']
+    }
+
+
+if __name__ == '__main__':
+    # Uso: python -m modules.legal_ner [num_acordaos]
+    import sys
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    print(f"⏱ Benchmark do extrator regex em {n} acórdãos sintéticos")
+    stats = benchmark_entity_scanner(n)
+    print(f"   • Uma varredura por padrão: {stats['por_padrao_s']:.3f}s ({stats['mb']} MB)")
+    print(f"   • Varredura única:          {stats['varredura_unica_s']:.3f}s")
+    print(f"   • Speedup: {stats['speedup']}x | saídas idênticas: {'✓' if stats['identico'] else '✗'}")
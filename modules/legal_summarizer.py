@@ -4,67 +4,96 @@ Usa técnicas extrativas e abstrativas quando modelos estão disponíveis
 """
 
 import re
+import time
 from typing import List, Dict, Any, Optional
 import warnings
+
+import numpy as np
 warnings.filterwarnings('ignore')
 
+from .model_registry import get_model_registry, summarization_candidates
+from .sentence_scoring import score_sentences
+from .document_structure import segment_document, section_previews
+from .analysis_context import AnalysisContext
+from .defaults import HIERARCHICAL_DEFAULTS
+
+
+# model_max_length acima disso indica tokenizador sem limite declarado
+UNKNOWN_MODEL_LENGTH = 1000000
+
 
 class LegalSummarizer:
     """
     Sumarizador especializado em textos jurídicos brasileiros
     """
 
-    def __init__(self, model_name: Optional[str] = None):
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        scoring: str = 'keywords',
+        textrank_weight: float = 2.0,
+        batch_size: int = 8,
+        hierarchical: Optional[Dict[str, Any]] = None
+    ):
         """
         Inicializa o sumarizador
 
         Args:
             model_name: Nome do modelo transformers a usar (opcional)
+            scoring: Scoring das sentenças na sumarização extrativa:
+                'keywords' (padrão) ou 'textrank' (soma a centralidade)
+            textrank_weight: Peso da centralidade no modo 'textrank'
+            batch_size: Textos por chamada do modelo na sumarização abstrativa
+            hierarchical: Sumarização hierárquica de textos longos (ver
+                HIERARCHICAL_DEFAULTS)
         """
         self.model_name = model_name
+        self.scoring = scoring
+        self.textrank_weight = textrank_weight
+        self.batch_size = max(1, batch_size)
+        self.hierarchical = dict(HIERARCHICAL_DEFAULTS)
+        self.hierarchical.update(hierarchical or {})
         self.model = None
         self.tokenizer = None
+        self.summarizer = None
         self.initialized = False
         self.use_ml_model = False
+        self.loaded_model = None  # Nome do modelo carregado pelo registro
+
+        # Tempo e tokens de entrada medidos nas chamadas do modelo (estimativa do orçamento de tempo)
+        self._model_seconds = 0.0
+        self._model_tokens = 0
 
     def initialize_model(self):
-        """Inicializa modelo de sumarização se disponível"""
+        """Obtém o pipeline de sumarização do registro compartilhado, se disponível"""
         if self.initialized:
             return
 
         try:
-            from transformers import pipeline, AutoTokenizer, AutoModelForSeq2SeqLM
-
-            # Tenta carregar modelo específico para português jurídico
-            models_to_try = [
-                self.model_name,
-                'unicamp-dl/ptt5-base-portuguese-vocab',  # Modelo T5 em português
-                'facebook/mbart-large-50',  # MBART multilíngue
-            ]
-
-            for model_name in models_to_try:
-                if model_name is None:
-                    continue
-                try:
-                    print(f"Tentando carregar modelo: {model_name}")
-                    self.summarizer = pipeline(
-                        "summarization",
-                        model=model_name,
-                        tokenizer=model_name
-                    )
-                    self.use_ml_model = True
-                    print(f"✓ Modelo {model_name} carregado com sucesso")
-                    break
-                except Exception as e:
-                    print(f"⚠ Não foi possível carregar {model_name}: {str(e)}")
-                    continue
-
-            if not self.use_ml_model:
-                print("⚠ Nenhum modelo de sumarização ML disponível. Usando sumarização extrativa.")
-
+            import transformers  # noqa: F401
         except ImportError:
             print("⚠ Transformers não instalado. Usando apenas sumarização extrativa.")
             self.use_ml_model = False
+            self.initialized = True
+            return
+
+        registry = get_model_registry()
+        candidates = summarization_candidates(self.model_name)
+        already_loaded = any(registry.is_loaded('summarization', name) for name in candidates)
+
+        # Tenta carregar modelo específico para português jurídico
+        self.summarizer = registry.get_summarizer(candidates)
+        self.use_ml_model = self.summarizer is not None
+        # O registro devolve o primeiro candidato que carrega
+        self.loaded_model = next(
+            (name for name in candidates if registry.is_loaded('summarization', name)), None
+        ) if self.use_ml_model else None
+
+        if not already_loaded:
+            if self.use_ml_model:
+                print("✓ Modelo de sumarização carregado com sucesso")
+            else:
+                print("⚠ Nenhum modelo de sumarização ML disponível. Usando sumarização extrativa.")
 
         self.initialized = True
 
@@ -74,7 +103,9 @@ class LegalSummarizer:
         max_length: int = 500,
         min_length: int = 100,
         ratio: float = 0.3,
-        method: str = 'auto'
+        method: str = 'auto',
+        structure: Optional[Dict[str, Any]] = None,
+        context: Optional[AnalysisContext] = None
     ) -> Dict[str, Any]:
         """
         Sumariza texto jurídico
@@ -85,10 +116,51 @@ class LegalSummarizer:
             min_length: Comprimento mínimo do resumo (em palavras)
             ratio: Razão de compressão (0.0 a 1.0)
             method: 'extractive', 'abstractive' ou 'auto'
+            structure: Estrutura já calculada do texto (ver segment_document)
+            context: Contexto de análise de `text` (compartilhado com as outras etapas)
 
         Returns:
             Dicionário com resumo e metadados
         """
+        return self.summarize_batch(
+            [text], max_length, min_length, ratio, method,
+            structures=[structure], contexts=[context]
+        )[0]
+
+    def summarize_batch(
+        self,
+        texts: List[str],
+        max_length: int = 500,
+        min_length: int = 100,
+        ratio: float = 0.3,
+        method: str = 'auto',
+        structures: Optional[List[Optional[Dict[str, Any]]]] = None,
+        contexts: Optional[List[Optional[AnalysisContext]]] = None,
+        batch_size: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Sumariza vários textos jurídicos
+
+        Na sumarização abstrativa, os textos de todos os documentos vão ao
+        modelo em lotes de tamanho parecido (ver _summarize_abstractive_batch);
+        textos longos são resumidos por partes (ver
+        _summarize_hierarchical_batch). Os textos de um lote que falhar, ou
+        que estourarem o orçamento de tokens ou de tempo, recebem o resumo
+        extrativo.
+
+        Args:
+            texts: Textos a sumarizar
+            max_length: Comprimento máximo do resumo (em palavras)
+            min_length: Comprimento mínimo do resumo (em palavras)
+            ratio: Razão de compressão (0.0 a 1.0)
+            method: 'extractive', 'abstractive' ou 'auto'
+            structures: Estrutura de cada texto (ou None)
+            contexts: Contexto de análise de cada texto (ou None)
+            batch_size: Textos por chamada do modelo (padrão: o do sumarizador)
+
+        Returns:
+            list: Dicionário com resumo e metadados de cada texto, na ordem da entrada
+        """
         if not self.initialized:
             self.initialize_model()
 
@@ -96,31 +168,52 @@ class LegalSummarizer:
         if method == 'auto':
             method = 'abstractive' if self.use_ml_model else 'extractive'
 
-        # Pré-processa o texto
-        text_clean = self._preprocess_text(text)
+        structures = structures or [None] * len(texts)
+        contexts = [context if context is not None else AnalysisContext(text)
+                    for text, context in zip(texts, contexts or [None] * len(texts))]
+
+        # Pré-processa os textos
+        cleaned = [self._preprocess_text(text) for text in texts]
 
+        summaries: List[Optional[str]] = [None] * len(texts)
         if method == 'abstractive' and self.use_ml_model:
-            summary = self._summarize_abstractive(text_clean, max_length, min_length)
-            summary_method = 'abstractive_ml'
-        else:
-            summary = self._summarize_extractive(text_clean, ratio, max_length)
-            summary_method = 'extractive'
-
-        # Extrai pontos-chave
-        key_points = self._extract_key_points(text_clean)
-
-        # Identifica seções importantes
-        sections = self._identify_sections(text)
-
-        return {
-            'summary': summary,
-            'method': summary_method,
-            'key_points': key_points,
-            'sections': sections,
-            'original_length': len(text.split()),
-            'summary_length': len(summary.split()),
-            'compression_ratio': len(summary.split()) / max(len(text.split()), 1)
-        }
+            if self.hierarchical['enabled']:
+                summaries = self._summarize_hierarchical_batch(
+                    texts, structures, max_length, min_length, batch_size
+                )
+            else:
+                summaries = self._summarize_abstractive_batch(cleaned, max_length, min_length, batch_size)
+
+        results = []
+        for text, text_clean, summary, structure, context in zip(texts, cleaned, summaries, structures, contexts):
+            if summary is not None:
+                summary_method = 'abstractive_ml'
+            else:
+                summary = self._summarize_extractive(
+                    text_clean, ratio, max_length, AnalysisContext(text_clean)
+                )
+                summary_method = 'extractive'
+
+            # Extrai pontos-chave
+            key_points = self._extract_key_points(text_clean)
+
+            # Identifica seções importantes
+            sections = self._identify_sections(text, structure)
+
+            original_length = context.word_count
+            summary_length = len(summary.split())
+
+            results.append({
+                'summary': summary,
+                'method': summary_method,
+                'key_points': key_points,
+                'sections': sections,
+                'original_length': original_length,
+                'summary_length': summary_length,
+                'compression_ratio': summary_length / max(original_length, 1)
+            })
+
+        return results
 
     def _preprocess_text(self, text: str) -> str:
         """Pré-processa o texto para sumarização"""
@@ -132,62 +225,293 @@ class LegalSummarizer:
 
         return text.strip()
 
-    def _summarize_abstractive(
+    def _abstractive_input(self, text: str) -> str:
+        """Entrada do modelo: limita o texto ao tamanho de uma entrada (ver _input_limit)"""
+        return self._fit_segment(text, self._input_limit())[0]
+
+    def _summarize_abstractive_batch(
         self,
-        text: str,
+        texts: List[str],
         max_length: int,
-        min_length: int
-    ) -> str:
-        """Sumarização abstrativa usando modelo ML"""
-        try:
-            # Limita o tamanho do texto de entrada
-            max_input = 1024
-            words = text.split()
-            if len(words) > max_input:
-                text = ' '.join(words[:max_input])
-
-            result = self.summarizer(
-                text,
-                max_length=max_length,
-                min_length=min_length,
-                do_sample=False
-            )
+        min_length: int,
+        batch_size: Optional[int] = None
+    ) -> List[Optional[str]]:
+        """
+        Sumarização abstrativa usando modelo ML, em lotes
 
-            return result[0]['summary_text']
+        Os textos são ordenados pelo tamanho e agrupados em lotes
+        consecutivos, para que cada lote tenha entradas de tamanho parecido
+        (menos padding). Um lote que falhar não interrompe os demais.
 
-        except Exception as e:
-            print(f"⚠ Erro na sumarização abstrativa: {str(e)}")
-            return self._summarize_extractive(text, 0.3, max_length)
+        Returns:
+            list: Resumo de cada texto, ou None se o lote dele falhou
+        """
+        batch_size = max(1, batch_size or self.batch_size)
+        inputs = [self._abstractive_input(text) for text in texts]
+        lengths = [len(text.split()) for text in inputs]
+        order = sorted(range(len(inputs)), key=lengths.__getitem__)
+
+        summaries: List[Optional[str]] = [None] * len(inputs)
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            try:
+                outputs = self.summarizer(
+                    [inputs[i] for i in batch],
+                    max_length=max_length,
+                    min_length=min_length,
+                    do_sample=False,
+                    truncation=True,
+                    batch_size=len(batch)
+                )
+                for i, output in zip(batch, outputs):
+                    if isinstance(output, list):
+                        output = output[0]
+                    summaries[i] = output['summary_text']
+            except Exception as e:
+                print(f"⚠ Erro na sumarização abstrativa ({len(batch)} textos): {str(e)}; usando extrativa")
+                for i in batch:
+                    summaries[i] = None
+
+        return summaries
+
+    def _count_tokens(self, text: str, special: bool = True) -> int:
+        """
+        Tokens do texto no tokenizador do modelo (palavras, se indisponível)
+
+        Args:
+            text: Texto a medir
+            special: Se True, inclui os tokens especiais que o modelo recebe
+        """
+        tokenizer = getattr(self.summarizer, 'tokenizer', None)
+        if tokenizer is not None:
+            try:
+                return len(tokenizer(text, add_special_tokens=special, truncation=False,
+                                     verbose=False)['input_ids'])
+            except Exception:
+                pass
+        return len(text.split())
+
+    def _input_limit(self) -> int:
+        """
+        Tamanho máximo de cada entrada do modelo, na unidade de _count_tokens
+
+        Com tokenizador, é o model_max_length dele menos os tokens especiais
+        (o que passar disso seria cortado pelo truncation do pipeline); sem
+        tokenizador, ou se ele não declarar limite, max_input_words.
+        """
+        limit = self.hierarchical['max_input_words']
+        tokenizer = getattr(self.summarizer, 'tokenizer', None)
+        max_length = getattr(tokenizer, 'model_max_length', None)
+        # Tokenizadores sem limite declarado usam um valor enorme (int(1e30))
+        if tokenizer is not None and max_length and max_length < UNKNOWN_MODEL_LENGTH:
+            try:
+                special = tokenizer.num_special_tokens_to_add()
+            except Exception:
+                special = 0
+            limit = max_length - special
+        return max(1, limit)
+
+    def _fit_segment(self, segment: str, limit: int) -> List[str]:
+        """
+        Divide um trecho maior que `limit` em partes que cabem (cortes entre palavras)
+
+        O tamanho de cada parte é estimado pela proporção de tokens por
+        palavra e reduzido até caber.
+        """
+        tokens = self._count_tokens(segment, special=False)
+        if tokens <= limit:
+            return [segment]
+
+        words = segment.split()
+        parts = []
+        while words:
+            size = max(1, len(words) * limit // max(tokens, 1))
+            part = ' '.join(words[:size])
+            part_tokens = self._count_tokens(part, special=False)
+            while part_tokens > limit and size > 1:
+                size = max(1, min(size - 1, size * limit // part_tokens))
+                part = ' '.join(words[:size])
+                part_tokens = self._count_tokens(part, special=False)
+            parts.append(part)
+            words = words[size:]
+            tokens = max(tokens - part_tokens, 1)
+        return parts
+
+    def _pack_segments(self, segments: List[str]) -> List[str]:
+        """
+        Junta trechos consecutivos em entradas de até _input_limit() tokens
+
+        O tamanho é medido no tokenizador do modelo (em palavras, sem ele),
+        para que o truncation do pipeline não descarte o fim das entradas.
+        Os cortes ficam entre trechos; só um trecho maior que o limite é
+        dividido no meio (em partes que cabem).
+        """
+        limit = self._input_limit()
+        pieces = []
+        current = ''
+
+        for segment in segments:
+            for part in self._fit_segment(segment, limit):
+                candidate = f"{current} {part}" if current else part
+                if current and self._count_tokens(candidate, special=False) > limit:
+                    pieces.append(current)
+                    candidate = part
+                current = candidate
+
+        if current:
+            pieces.append(current)
+        return pieces
+
+    def _split_for_model(self, text: str, structure: Optional[Dict[str, Any]] = None) -> List[str]:
+        """Divide o texto em entradas do modelo nos limites de seção ou parágrafo"""
+        if structure is None:
+            structure = segment_document(text)
+
+        boundaries = sorted(
+            {0}
+            | {start for start, _ in structure.get('paragraphs', [])}
+            | {section['start'] for section in structure.get('sections', [])}
+        )
+        ends = boundaries[1:] + [len(text)]
+        return self._pack_segments(
+            [self._preprocess_text(text[start:end]) for start, end in zip(boundaries, ends)]
+        )
+
+    def _summarize_hierarchical_batch(
+        self,
+        texts: List[str],
+        structures: List[Optional[Dict[str, Any]]],
+        max_length: int,
+        min_length: int,
+        batch_size: Optional[int] = None
+    ) -> List[Optional[str]]:
+        """
+        Sumarização abstrativa hierárquica (map-reduce), em lotes
+
+        Cada texto é dividido em partes de até _input_limit() tokens nos
+        limites de seção ou parágrafo (textos menores vão inteiros, em uma
+        única chamada). As partes de todos os documentos são resumidas nos
+        mesmos lotes; os resumos parciais de cada documento são juntados e
+        resumidos de novo, até restar um único resumo.
+
+        Cada documento tem um orçamento de tokens de entrada do modelo e de
+        tempo. Cada etapa roda em chamadas de até batch_size entradas (das
+        menores para as maiores); a duração de cada chamada é dividida
+        entre os documentos pela proporção de tokens. Antes de cada chamada,
+        o custo restante do documento na etapa é estimado pela vazão medida
+        (ou por seconds_per_token, antes da primeira medição): o documento
+        que estouraria o orçamento, que o estourou, cuja chamada falhou ou
+        que não tem texto fica sem resumo abstrativo.
+
+        Returns:
+            list: Resumo de cada texto, ou None para usar a extrativa
+        """
+        token_budget = self.hierarchical['token_budget']
+        time_budget = self.hierarchical['time_budget_s']
+        batch_size = batch_size or self.batch_size
+
+        inputs = [self._split_for_model(text, structure) for text, structure in zip(texts, structures)]
+        used_tokens = [0] * len(texts)
+        elapsed = [0.0] * len(texts)
+        summaries: List[Optional[str]] = [None] * len(texts)
+        active = [doc for doc in range(len(texts)) if inputs[doc]]
+
+        for _ in range(max(1, self.hierarchical['max_levels'] + 1)):
+            # Orçamento de tokens: quem não cabe na próxima etapa passa para a extrativa
+            jobs = []
+            for doc in active:
+                counts = [self._count_tokens(piece) for piece in inputs[doc]]
+                if used_tokens[doc] + sum(counts) > token_budget:
+                    continue
+                used_tokens[doc] += sum(counts)
+                jobs.extend((doc, index, piece, tokens) for index, (piece, tokens) in enumerate(zip(inputs[doc], counts)))
+
+            if not jobs:
+                break
+
+            jobs.sort(key=lambda job: job[3])
+            remaining: Dict[int, int] = {}
+            for doc, _, _, tokens in jobs:
+                remaining[doc] = remaining.get(doc, 0) + tokens
+            partials = {doc: [None] * len(inputs[doc]) for doc in remaining}
+            failed = set()
+
+            for start in range(0, len(jobs), batch_size):
+                # Orçamento de tempo: custo restante do documento nesta etapa
+                seconds_per_token = self._seconds_per_token()
+                if seconds_per_token is not None:
+                    for doc in {job[0] for job in jobs[start:start + batch_size]} - failed:
+                        if elapsed[doc] + remaining[doc] * seconds_per_token > time_budget:
+                            failed.add(doc)
+                batch = [job for job in jobs[start:start + batch_size] if job[0] not in failed]
+                if not batch:
+                    continue
+
+                call_start = time.perf_counter()
+                outputs = self._summarize_abstractive_batch(
+                    [piece for _, _, piece, _ in batch], max_length, min_length, len(batch)
+                )
+                seconds = time.perf_counter() - call_start
+                batch_tokens = max(sum(tokens for _, _, _, tokens in batch), 1)
+                self._model_seconds += seconds
+                self._model_tokens += batch_tokens
+
+                for (doc, index, _, tokens), output in zip(batch, outputs):
+                    elapsed[doc] += seconds * tokens / batch_tokens
+                    remaining[doc] -= tokens
+                    if output is None or elapsed[doc] > time_budget:
+                        failed.add(doc)
+                    else:
+                        partials[doc][index] = output
+
+            active = []
+            for doc, outputs_doc in partials.items():
+                if doc in failed:
+                    continue
+                if len(outputs_doc) == 1:
+                    summaries[doc] = outputs_doc[0]
+                else:
+                    # Redução: os resumos parciais são os trechos da próxima etapa
+                    inputs[doc] = self._pack_segments(outputs_doc)
+                    active.append(doc)
+
+        return summaries
+
+    def _seconds_per_token(self) -> Optional[float]:
+        """Custo medido do modelo por token de entrada, ou o configurado antes da primeira medição"""
+        if self._model_tokens:
+            return self._model_seconds / self._model_tokens
+        return self.hierarchical.get('seconds_per_token')
 
     def _summarize_extractive(
         self,
         text: str,
         ratio: float,
-        max_length: int
+        max_length: int,
+        context: Optional[AnalysisContext] = None
     ) -> str:
         """
         Sumarização extrativa baseada em scoring de sentenças
         Adaptado para textos jurídicos
         """
+        if context is None:
+            context = AnalysisContext(text)
+
         # Divide em sentenças
-        sentences = self._split_sentences(text)
+        sentences = context.sentences
 
         if len(sentences) <= 3:
             return text
 
         # Calcula scores para cada sentença
-        scores = self._score_sentences(sentences, text)
+        scores = self._score_sentences(sentences, text, context)
 
-        # Ordena sentenças por score
-        ranked = sorted(
-            enumerate(scores),
-            key=lambda x: x[1],
-            reverse=True
-        )
+        # Ordena sentenças por score (ordenação estável: empates mantêm a ordem do texto)
+        ranked = np.argsort(-scores, kind='stable')
 
         # Seleciona top sentenças mantendo ordem original
         num_sentences = max(3, int(len(sentences) * ratio))
-        selected_indices = sorted([idx for idx, _ in ranked[:num_sentences]])
+        selected_indices = np.sort(ranked[:num_sentences])
 
         # Constrói resumo
         summary_sentences = [sentences[i] for i in selected_indices]
@@ -200,65 +524,29 @@ class LegalSummarizer:
 
         return summary
 
-    def _split_sentences(self, text: str) -> List[str]:
-        """Divide texto em sentenças (adaptado para textos jurídicos)"""
-        # Padrão para sentenças, considerando abreviações jurídicas
-        pattern = r'(?<!\w\.\w.)(?<![A-Z][a-z]\.)(?<=\.|\?|\!)\s'
-        sentences = re.split(pattern, text)
-
-        # Remove sentenças muito curtas
-        sentences = [s.strip() for s in sentences if len(s.strip()) > 20]
-
-        return sentences
-
-    def _score_sentences(self, sentences: List[str], full_text: str) -> List[float]:
+    def _score_sentences(
+        self,
+        sentences: List[str],
+        full_text: str,
+        context: Optional[AnalysisContext] = None
+    ) -> np.ndarray:
         """
         Calcula score de importância para cada sentença
         Baseado em: posição, palavras-chave jurídicas, comprimento
+
+        Os critérios são calculados de forma vetorizada (ver
+        sentence_scoring.score_sentences). Com o contexto de `full_text`, os
+        offsets das sentenças e o texto em minúsculas vêm dele (sem nova busca).
         """
-        scores = []
-
-        # Palavras-chave importantes no domínio jurídico
-        keywords = {
-            'decidiu', 'determinou', 'condenou', 'absolveu', 'julgou',
-            'acordão', 'sentença', 'voto', 'fundamentação', 'dispositivo',
-            'lei', 'artigo', 'jurisprudência', 'súmula', 'precedente',
-            'tese', 'entendimento', 'decisão', 'provimento', 'recurso'
-        }
-
-        for i, sentence in enumerate(sentences):
-            score = 0.0
-            words = sentence.lower().split()
-
-            # Score por posição (primeiras e últimas sentenças são importantes)
-            if i < 3:
-                score += 2.0
-            elif i >= len(sentences) - 3:
-                score += 1.5
-
-            # Score por palavras-chave jurídicas
-            keyword_count = sum(1 for word in words if word in keywords)
-            score += keyword_count * 1.5
-
-            # Score por comprimento (sentenças médias são preferidas)
-            length = len(words)
-            if 15 <= length <= 40:
-                score += 1.0
-            elif length > 40:
-                score += 0.5
-
-            # Score por presença de números (processos, leis, etc.)
-            if re.search(r'\d+', sentence):
-                score += 0.5
-
-            # Score por presença de termos conclusivos
-            conclusive_terms = ['portanto', 'assim', 'logo', 'consequentemente', 'conclui']
-            if any(term in sentence.lower() for term in conclusive_terms):
-                score += 1.0
-
-            scores.append(score)
-
-        return scores
+        if context is not None:
+            return score_sentences(
+                sentences, full_text,
+                spans=context.sentence_spans, text_lower=context.lower,
+                scoring=self.scoring, textrank_weight=self.textrank_weight
+            )
+        return score_sentences(
+            sentences, full_text, scoring=self.scoring, textrank_weight=self.textrank_weight
+        )
 
     def _extract_key_points(self, text: str) -> List[str]:
         """Extrai pontos-chave do texto"""
@@ -283,41 +571,34 @@ class LegalSummarizer:
 
         return key_points[:5]  # Retorna top 5
 
-    def _identify_sections(self, text: str) -> Dict[str, str]:
+    def _identify_sections(self, text: str, structure: Optional[Dict[str, Any]] = None) -> Dict[str, str]:
         """Identifica seções estruturadas do documento jurídico"""
-        sections = {}
-
-        # Padrões de seções comuns
-        section_patterns = {
-            'ementa': r'EMENTA\s*[:]\s*([^\n]+(?:\n(?!\n)[^\n]+)*)',
-            'relatorio': r'RELAT[ÓO]RIO\s*[:]\s*([^\n]+(?:\n(?!\n)[^\n]+)*)',
-            'voto': r'VOTO\s*[:]\s*([^\n]+(?:\n(?!\n)[^\n]+)*)',
-            'decisao': r'DECIS[ÃA]O\s*[:]\s*([^\n]+(?:\n(?!\n)[^\n]+)*)',
-            'dispositivo': r'DISPOSITIVO\s*[:]\s*([^\n]+(?:\n(?!\n)[^\n]+)*)',
-        }
-
-        for section_name, pattern in section_patterns.items():
-            match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
-            if match:
-                content = match.group(1).strip()
-                # Limita o tamanho
-                if len(content) > 500:
-                    content = content[:500] + '...'
-                sections[section_name] = content
-
-        return sections
-
-
-def summarize_legal_text(text: str, max_length: int = 500) -> Dict[str, Any]:
+        if structure is None:
+            structure = segment_document(text)
+        return section_previews(text, structure)
+
+
+def summarize_legal_text(
+    text: str,
+    max_length: int = 500,
+    summarizer: Optional[LegalSummarizer] = None,
+    structure: Optional[Dict[str, Any]] = None,
+    context: Optional[AnalysisContext] = None
+) -> Dict[str, Any]:
     """
     Função helper para sumarização rápida de texto jurídico
 
     Args:
         text: Texto jurídico
         max_length: Comprimento máximo do resumo
+        summarizer: Sumarizador a reutilizar (opcional; o modelo vem do
+            registro compartilhado em qualquer caso)
+        structure: Estrutura já calculada do texto (ver segment_document)
+        context: Contexto de análise de `text` (ver AnalysisContext)
 
     Returns:
         Dicionário com resumo e análise
     """
-    summarizer = LegalSummarizer()
-    return summarizer.summarize(text, max_length=max_length)
+    if summarizer is None:
+        summarizer = LegalSummarizer()
+    return summarizer.summarize(text, max_length=max_length, structure=structure, context=context)
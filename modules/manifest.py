@@ -0,0 +1,328 @@
+"""
+Manifesto de ingestão incremental
+Registra, para cada arquivo da pasta, tamanho, data de modificação, hash do
+conteúdo, id estável do documento e os JSONs gerados na última execução,
+permitindo reprocessar apenas arquivos novos ou alterados
+"""
+
+import os
+import json
+import hashlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Any, Iterable, Iterator, List, Optional
+
+
+MANIFEST_VERSION = 1
+
+# Tamanho do bloco de leitura para o hash
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def file_content_hash(file_path: str) -> str:
+    """
+    Calcula o hash SHA-256 do conteúdo de um arquivo (lido em blocos)
+
+    Args:
+        file_path: Caminho do arquivo
+
+    Returns:
+        str: Hash hexadecimal
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# Chaves da configuração NLP que não alteram o resultado da análise
+SIGNATURE_IGNORED_KEYS = ('parallel', 'cache')
+
+
+def config_signature(enable_nlp: bool, nlp_config: Optional[Dict[str, Any]]) -> str:
+    """Assinatura da configuração NLP (análises só são reaproveitadas se coincidir)"""
+    config = {
+        key: value for key, value in (nlp_config or {}).items()
+        if key not in SIGNATURE_IGNORED_KEYS
+    }
+    payload = json.dumps(
+        {'enable_nlp': enable_nlp, 'config': config},
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class IngestionManifest:
+    """
+    Manifesto persistente de uma pasta de origem
+
+    Estrutura do arquivo:
+        {
+            "version": 1,
+            "source_directory": "...",
+            "updated_at": "...",
+            "nlp_signature": "...",
+            "next_id": 42,
+            "outputs": ["knowledge_base_....json", ...],
+            "files": {caminho_relativo: {"size", "mtime", "hash", "doc_id"}}
+        }
+    """
+
+    def __init__(self, manifest_path: str, data: Optional[Dict[str, Any]] = None):
+        self.manifest_path = manifest_path
+        data = data or {}
+        self.source_directory = data.get('source_directory')
+        self.nlp_signature = data.get('nlp_signature')
+        self.next_id = data.get('next_id', 1)
+        self.outputs: List[str] = data.get('outputs', [])
+        self.files: Dict[str, Dict[str, Any]] = data.get('files', {})
+
+    @classmethod
+    def load(cls, manifest_path: str) -> 'IngestionManifest':
+        """
+        Carrega o manifesto do disco (ou cria um vazio)
+
+        Args:
+            manifest_path: Caminho do arquivo de manifesto
+
+        Returns:
+            IngestionManifest
+        """
+        if os.path.isfile(manifest_path):
+            try:
+                with open(manifest_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == MANIFEST_VERSION:
+                    return cls(manifest_path, data)
+                print("⚠ Manifesto de versão incompatível. Reprocessando tudo.")
+            except Exception as e:
+                print(f"⚠ Manifesto ilegível ({str(e)}). Reprocessando tudo.")
+
+        return cls(manifest_path)
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.files
+
+    def needs_hash(self, file_info: Dict[str, Any]) -> bool:
+        """Indica se plan_file precisará do hash do conteúdo (arquivo conhecido com tamanho ou mtime diferente)"""
+        entry = self.files.get(file_info['relative_path'])
+        return entry is not None and (entry.get('size') != file_info.get('size')
+                                      or entry.get('mtime') != file_info.get('mtime'))
+
+    def plan_file(
+        self,
+        file_info: Dict[str, Any],
+        content_hash: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Compara um arquivo encontrado com o manifesto
+
+        Tamanho e mtime iguais => inalterado. Se diferirem, o hash do conteúdo
+        decide (ex.: arquivo apenas copiado/tocado continua inalterado).
+        Arquivos novos recebem ids após o maior id já atribuído.
+
+        Args:
+            file_info: Item de scan_directory/iter_directory (com 'size' e 'mtime')
+            content_hash: Hash do conteúdo já calculado (ver iter_plan)
+
+        Returns:
+            dict com 'file_info', 'doc_id', 'status' ('new', 'changed',
+            'unchanged') e 'hash' (se conhecido)
+        """
+        entry = self.files.get(file_info['relative_path'])
+        item = {'file_info': file_info, 'hash': None}
+
+        if entry is None:
+            item['status'] = 'new'
+            item['doc_id'] = f"doc_{self.next_id:04d}"
+            self.next_id += 1
+        else:
+            item['doc_id'] = entry['doc_id']
+            if (entry.get('size') == file_info.get('size')
+                    and entry.get('mtime') == file_info.get('mtime')):
+                item['status'] = 'unchanged'
+                item['hash'] = entry.get('hash')
+            else:
+                try:
+                    item['hash'] = content_hash or file_content_hash(file_info['path'])
+                except OSError:
+                    item['hash'] = None
+                item['status'] = (
+                    'unchanged' if item['hash'] and item['hash'] == entry.get('hash')
+                    else 'changed'
+                )
+
+        return item
+
+    def iter_plan(
+        self,
+        files: Iterable[Dict[str, Any]],
+        workers: Optional[int] = None,
+        max_pending: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Planeja os arquivos em fluxo (ver plan_file), na ordem de entrada
+
+        Os hashes dos arquivos com tamanho ou mtime diferentes (ex.: depois
+        de um rsync que refaz as datas) são calculados em um pool de threads,
+        sem bloquear o percurso nem a leitura dos arquivos já planejados.
+
+        Args:
+            files: Arquivos encontrados (lista ou iterável, ex.: iter_directory)
+            workers: Threads para os hashes (padrão: 8)
+            max_pending: Máximo de arquivos aguardando o hash (padrão: 4x workers)
+
+        Yields:
+            dict: Item de plan_file de cada arquivo
+        """
+        workers = workers or 8
+        max_pending = max_pending or 4 * workers
+
+        def hash_or_none(path):
+            try:
+                return file_content_hash(path)
+            except OSError:
+                return None
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+
+            def plan_next():
+                file_info, future = pending.popleft()
+                return self.plan_file(file_info, future.result() if future else None)
+
+            for file_info in files:
+                future = pool.submit(hash_or_none, file_info['path']) if self.needs_hash(file_info) else None
+                pending.append((file_info, future))
+
+                # Ids de arquivos novos são atribuídos na ordem de entrada
+                while pending and (len(pending) >= max_pending
+                                   or pending[0][1] is None or pending[0][1].done()):
+                    yield plan_next()
+
+            while pending:
+                yield plan_next()
+
+    def deleted_files(self, seen_paths) -> List[str]:
+        """Caminhos relativos do manifesto que não foram encontrados no percurso"""
+        return [path for path in self.files if path not in seen_paths]
+
+    def plan(self, files_found: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Compara todos os arquivos encontrados com o manifesto
+
+        Args:
+            files_found: Lista retornada por scan_directory
+
+        Returns:
+            dict com 'items' (ver plan_file, na ordem de files_found) e
+            'deleted' (caminhos relativos que não existem mais)
+        """
+        items = list(self.iter_plan(files_found))
+        deleted = self.deleted_files({f['relative_path'] for f in files_found})
+
+        return {'items': items, 'deleted': deleted}
+
+    def load_previous_documents(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Carrega os documentos da última execução a partir dos JSONs gerados
+
+        Returns:
+            dict: {doc_id: documento}
+        """
+        documents = {}
+        base_dir = os.path.dirname(os.path.abspath(self.manifest_path))
+
+        for output in self.outputs:
+            output_path = output if os.path.isabs(output) else os.path.join(base_dir, output)
+            try:
+                with open(output_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except Exception as e:
+                print(f"⚠ Saída anterior não encontrada ou ilegível: {output} ({str(e)})")
+                continue
+
+            for doc in data.get('documents', []):
+                if doc.get('id'):
+                    documents[doc['id']] = doc
+
+        return documents
+
+    def update(
+        self,
+        items: List[Dict[str, Any]],
+        documents: List[Dict[str, Any]],
+        source_directory: str,
+        nlp_signature: str
+    ):
+        """
+        Atualiza o manifesto com o resultado da execução atual
+
+        Apenas arquivos presentes em `documents` (lidos com sucesso ou
+        reaproveitados) são registrados; removidos e falhas saem do manifesto.
+
+        Args:
+            items: Itens retornados por plan()
+            documents: Documentos da base de conhecimento final
+            source_directory: Pasta de origem
+            nlp_signature: Assinatura de config_signature()
+        """
+        hashes = {doc['id']: doc.get('content_hash') for doc in documents}
+        files = {}
+
+        for item in items:
+            doc_id = item['doc_id']
+            if doc_id not in hashes:
+                continue
+            file_info = item['file_info']
+            files[file_info['relative_path']] = {
+                'size': file_info.get('size'),
+                'mtime': file_info.get('mtime'),
+                'hash': hashes[doc_id] or item.get('hash'),
+                'doc_id': doc_id
+            }
+
+        self.files = files
+        self.source_directory = str(source_directory)
+        self.nlp_signature = nlp_signature
+
+    def save(self, outputs: List[str]) -> bool:
+        """
+        Salva o manifesto, registrando os JSONs gerados nesta execução
+
+        Args:
+            outputs: Caminhos dos arquivos JSON salvos
+
+        Returns:
+            bool: True se salvo com sucesso
+        """
+        base_dir = os.path.dirname(os.path.abspath(self.manifest_path))
+        self.outputs = [
+            os.path.relpath(path, base_dir)
+            if os.path.dirname(os.path.abspath(path)) == base_dir else path
+            for path in outputs
+        ]
+
+        data = {
+            'version': MANIFEST_VERSION,
+            'source_directory': self.source_directory,
+            'updated_at': datetime.now().isoformat(),
+            'nlp_signature': self.nlp_signature,
+            'next_id': self.next_id,
+            'outputs': self.outputs,
+            'files': self.files
+        }
+
+        try:
+            tmp_path = self.manifest_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.manifest_path)
+            return True
+        except Exception as e:
+            print(f"⚠ Erro ao salvar manifesto: {str(e)}")
+            return False
@@ -0,0 +1,300 @@
+"""
+Registro de modelos compartilhado pelo processo
+Carrega spaCy, pipelines de sumarização e sentence-transformers uma única vez
+e os reutiliza entre documentos, extratores, sumarizadores e indexadores
+"""
+
+import os
+import sys
+import time
+import threading
+from typing import Dict, Any, List, Optional, Callable
+import warnings
+warnings.filterwarnings('ignore')
+
+
+# Modelos padrão (mesmos valores de NLP_CONFIG['models'])
+DEFAULT_SPACY_MODELS = ['pt_core_news_lg', 'pt_core_news_sm']
+DEFAULT_SUMMARIZATION_MODELS = [
+    'unicamp-dl/ptt5-base-portuguese-vocab',  # Modelo T5 em português
+    'facebook/mbart-large-50',  # MBART multilíngue
+]
+DEFAULT_EMBEDDING_MODEL = 'sentence-transformers/paraphrase-multilingual-mpnet-base-v2'
+
+
+def _current_rss_mb() -> Optional[float]:
+    """Retorna a memória residente do processo atual em MB (None se indisponível)"""
+    try:
+        import psutil
+        return psutil.Process(os.getpid()).memory_info().rss / (1024 * 1024)
+    except Exception:
+        pass
+
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except Exception:
+        pass
+
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS reporta bytes, Linux reporta KB
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    except Exception:
+        return None
+
+
+class ModelRegistry:
+    """
+    Registro de modelos com carregamento preguiçoso (lazy loading)
+
+    Cada modelo é identificado por (tipo, nome) e carregado no máximo uma vez
+    por processo. Falhas de carregamento também ficam registradas, evitando
+    novas tentativas custosas a cada documento.
+    """
+
+    def __init__(self):
+        self._models: Dict[tuple, Any] = {}
+        self._failures: Dict[tuple, str] = {}
+        self._stats: Dict[tuple, Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+
+    def _load(self, kind: str, name: str, loader: Callable[[], Any]) -> Optional[Any]:
+        """Carrega (ou reutiliza) um modelo, registrando tempo e memória"""
+        key = (kind, name)
+
+        with self._lock:
+            if key in self._models:
+                self._stats[key]['hits'] += 1
+                return self._models[key]
+            if key in self._failures:
+                return None
+
+            rss_before = _current_rss_mb()
+            start = time.perf_counter()
+
+            try:
+                model = loader()
+            except Exception as e:
+                self._failures[key] = str(e)
+                return None
+
+            load_time = time.perf_counter() - start
+            rss_after = _current_rss_mb()
+
+            self._models[key] = model
+            self._stats[key] = {
+                'tipo': kind,
+                'modelo': name,
+                'tempo_carregamento_s': round(load_time, 3),
+                'memoria_mb': (
+                    round(rss_after - rss_before, 1)
+                    if rss_before is not None and rss_after is not None else None
+                ),
+                'hits': 0
+            }
+            return model
+
+    # ------------------------------------------------------------------
+    # Acesso aos modelos
+    # ------------------------------------------------------------------
+
+    def get_spacy(self, model_names: Optional[List[str]] = None) -> Optional[Any]:
+        """
+        Retorna o primeiro modelo spaCy disponível da lista
+
+        Args:
+            model_names: Modelos em ordem de preferência
+
+        Returns:
+            Objeto `Language` do spaCy ou None
+        """
+        try:
+            import spacy
+        except ImportError:
+            return None
+
+        for name in model_names or DEFAULT_SPACY_MODELS:
+            if name is None:
+                continue
+            nlp = self._load('spacy', name, lambda n=name: spacy.load(n))
+            if nlp is not None:
+                return nlp
+
+        return None
+
+    def get_summarizer(self, model_names: Optional[List[str]] = None) -> Optional[Any]:
+        """
+        Retorna o primeiro pipeline de sumarização (transformers) disponível
+
+        Args:
+            model_names: Modelos em ordem de preferência
+
+        Returns:
+            Pipeline de sumarização ou None
+        """
+        try:
+            from transformers import pipeline
+        except ImportError:
+            return None
+
+        for name in model_names or DEFAULT_SUMMARIZATION_MODELS:
+            if name is None:
+                continue
+            summarizer = self._load(
+                'summarization',
+                name,
+                lambda n=name: pipeline("summarization", model=n, tokenizer=n)
+            )
+            if summarizer is not None:
+                return summarizer
+
+        return None
+
+    def get_embedder(self, model_name: Optional[str] = None) -> Optional[Any]:
+        """
+        Retorna o modelo sentence-transformers solicitado
+
+        Args:
+            model_name: Nome do modelo de embeddings
+
+        Returns:
+            Instância de `SentenceTransformer` ou None
+        """
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError:
+            return None
+
+        name = model_name or DEFAULT_EMBEDDING_MODEL
+        return self._load('embedding', name, lambda: SentenceTransformer(name))
+
+    # ------------------------------------------------------------------
+    # Ciclo de vida
+    # ------------------------------------------------------------------
+
+    def warm_up(self, models_config: Optional[Dict[str, Any]] = None,
+                spacy: bool = True, summarization: bool = True,
+                embeddings: bool = False) -> Dict[str, bool]:
+        """
+        Pré-carrega os modelos configurados (ex.: antes de um lote grande)
+
+        Args:
+            models_config: Dicionário no formato de NLP_CONFIG['models']
+            spacy: Se True, carrega o modelo spaCy
+            summarization: Se True, carrega o modelo de sumarização
+            embeddings: Se True, carrega o modelo de embeddings
+
+        Returns:
+            Dicionário {tipo: carregado_com_sucesso}
+        """
+        models_config = models_config or {}
+        loaded = {}
+
+        if spacy:
+            loaded['spacy'] = self.get_spacy(
+                spacy_candidates(models_config.get('spacy_model'))
+            ) is not None
+
+        if summarization:
+            loaded['summarization'] = self.get_summarizer(
+                summarization_candidates(models_config.get('summarization_model'))
+            ) is not None
+
+        if embeddings:
+            loaded['embedding'] = self.get_embedder(
+                models_config.get('embedding_model')
+            ) is not None
+
+        return loaded
+
+    def unload(self, kind: Optional[str] = None, name: Optional[str] = None) -> int:
+        """
+        Descarrega modelos do registro para liberar memória
+
+        Args:
+            kind: Tipo do modelo ('spacy', 'summarization', 'embedding'); None = todos
+            name: Nome do modelo; None = todos do tipo
+
+        Returns:
+            Número de modelos descarregados
+        """
+        with self._lock:
+            keys = [
+                key for key in list(self._models)
+                if (kind is None or key[0] == kind) and (name is None or key[1] == name)
+            ]
+            for key in keys:
+                del self._models[key]
+                del self._stats[key]
+
+            for key in [k for k in self._failures
+                        if (kind is None or k[0] == kind) and (name is None or k[1] == name)]:
+                del self._failures[key]
+
+        if keys:
+            import gc
+            gc.collect()
+
+        return len(keys)
+
+    def is_loaded(self, kind: str, name: str) -> bool:
+        """Indica se o modelo já está carregado neste processo"""
+        return (kind, name) in self._models
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Relatório de modelos carregados: tempo de carga e memória residente
+
+        Returns:
+            Dicionário com modelos carregados e falhas
+        """
+        with self._lock:
+            return {
+                'modelos': [dict(stats) for stats in self._stats.values()],
+                'falhas': [
+                    {'tipo': kind, 'modelo': name, 'erro': error}
+                    for (kind, name), error in self._failures.items()
+                ],
+                'memoria_processo_mb': _current_rss_mb()
+            }
+
+    def print_report(self):
+        """Exibe o relatório de modelos no console"""
+        report = self.report()
+        if not report['modelos']:
+            return
+
+        print("\n📦 Modelos carregados:")
+        for stats in report['modelos']:
+            memory = f"{stats['memoria_mb']:.1f} MB" if stats['memoria_mb'] is not None else "n/d"
+            print(f"   • [{stats['tipo']}] {stats['modelo']}: "
+                  f"{stats['tempo_carregamento_s']:.2f}s, {memory}, reutilizado {stats['hits']}x")
+
+
+def spacy_candidates(preferred: Optional[str] = None) -> List[str]:
+    """Lista de modelos spaCy a tentar, com o preferido primeiro"""
+    candidates = [preferred] if preferred else []
+    return candidates + [m for m in DEFAULT_SPACY_MODELS if m != preferred]
+
+
+def summarization_candidates(preferred: Optional[str] = None) -> List[str]:
+    """Lista de modelos de sumarização a tentar, com o preferido primeiro"""
+    candidates = [preferred] if preferred else []
+    return candidates + [m for m in DEFAULT_SUMMARIZATION_MODELS if m != preferred]
+
+
+_registry: Optional[ModelRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    """Retorna o registro de modelos global do processo"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ModelRegistry()
+    return _registry
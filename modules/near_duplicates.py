@@ -0,0 +1,276 @@
+"""
+Detecção de documentos quase duplicados (MinHash + LSH)
+Agrupa cópias quase idênticas (ex.: a mesma decisão com outro cabeçalho ou
+carimbo de página) para que a análise NLP seja feita uma vez por grupo e
+as demais cópias apontem para o documento canônico
+"""
+
+import re
+import zlib
+from typing import Dict, Any, List, Optional, Tuple
+
+from .defaults import NEAR_DUPLICATE_DEFAULTS
+
+
+# Maior primo abaixo de 2^32: (a * x + b) cabe em uint64 com a < 2^31
+HASH_PRIME = 4294967291
+HASH_MASK = 0xFFFFFFFF
+SHINGLE_BASE = 1000003
+
+# Shingles processados por vez na assinatura (limita a matriz permutações x shingles)
+SIGNATURE_BLOCK = 8192
+
+WORD_PATTERN = re.compile(r'\w+')
+
+# Campos de ligação gravados nos documentos
+LINK_FIELD = 'near_duplicate_of'
+SIMILARITY_FIELD = 'near_duplicate_similarity'
+MEMBERS_FIELD = 'near_duplicates'
+ANALYSIS_LINK_KEY = 'reaproveitada_de'
+
+
+class MinHasher:
+    """Assinaturas MinHash de shingles de palavras (requer NumPy)"""
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 5, seed: int = 1):
+        """
+        Args:
+            num_perm: Tamanho da assinatura
+            shingle_size: Palavras consecutivas por shingle
+            seed: Semente das permutações (assinaturas só são comparáveis com a mesma)
+        """
+        self.num_perm = num_perm
+        self.shingle_size = max(1, shingle_size)
+
+        import numpy as np
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 2 ** 31, size=(num_perm, 1)).astype(np.uint64)
+        self._b = rng.randint(0, 2 ** 31, size=(num_perm, 1)).astype(np.uint64)
+
+    def shingles(self, text: str) -> 'np.ndarray':
+        """
+        Hashes (32 bits) dos shingles distintos do texto
+
+        Cada palavra é hasheada uma vez; o hash do shingle é combinado de
+        forma vetorizada a partir dos hashes das palavras.
+        """
+        import numpy as np
+
+        tokens = WORD_PATTERN.findall(text.lower())
+        if not tokens:
+            return np.empty(0, dtype=np.uint64)
+
+        vocabulary: Dict[str, int] = {}
+        ids = [vocabulary.setdefault(token, len(vocabulary)) for token in tokens]
+        word_hashes = np.array(
+            [zlib.crc32(word.encode('utf-8')) for word in vocabulary], dtype=np.uint64
+        )[ids]
+
+        size = min(self.shingle_size, len(tokens))
+        count = len(tokens) - size + 1
+        hashes = np.zeros(count, dtype=np.uint64)
+        for offset in range(size):
+            hashes = (hashes * np.uint64(SHINGLE_BASE)
+                      + word_hashes[offset:offset + count]) & np.uint64(HASH_MASK)
+
+        return np.unique(hashes)
+
+    def signature(self, text: str) -> Optional['np.ndarray']:
+        """
+        Assinatura MinHash do texto
+
+        Returns:
+            np.ndarray (num_perm,) ou None se o texto não tiver palavras
+        """
+        import numpy as np
+
+        shingles = self.shingles(text)
+        if not len(shingles):
+            return None
+
+        signature = np.full(self.num_perm, np.iinfo(np.uint64).max, dtype=np.uint64)
+        for start in range(0, len(shingles), SIGNATURE_BLOCK):
+            block = shingles[start:start + SIGNATURE_BLOCK][np.newaxis, :]
+            values = (self._a * block + self._b) % np.uint64(HASH_PRIME)
+            np.minimum(signature, values.min(axis=1), out=signature)
+
+        return signature
+
+
+def cluster_near_duplicates(
+    texts: List[str],
+    threshold: float = 0.85,
+    num_perm: int = 128,
+    bands: int = 16,
+    shingle_size: int = 5,
+    min_words: int = 50
+) -> Dict[int, Tuple[int, float]]:
+    """
+    Agrupa textos quase duplicados
+
+    Os textos são percorridos em ordem: cada um entra no grupo do canônico
+    candidato (mesma faixa LSH) mais similar, se a similaridade estimada
+    atingir o limiar, ou se torna canônico. Todo membro é, portanto, próximo do
+    próprio canônico (sem encadeamento A~B~C).
+
+    Args:
+        texts: Textos dos documentos
+        threshold: Similaridade de Jaccard estimada mínima
+        num_perm: Tamanho da assinatura MinHash
+        bands: Faixas do LSH (linhas por faixa = num_perm / bands)
+        shingle_size: Palavras por shingle
+        min_words: Textos com menos palavras ficam fora dos grupos
+
+    Returns:
+        dict: {índice do membro: (índice do canônico, similaridade estimada)}
+    """
+    if num_perm % bands:
+        raise ValueError("num_perm deve ser múltiplo de bands")
+
+    import numpy as np
+
+    rows = num_perm // bands
+    hasher = MinHasher(num_perm=num_perm, shingle_size=shingle_size)
+
+    buckets: Dict[Tuple[int, bytes], List[int]] = {}
+    signatures: Dict[int, 'np.ndarray'] = {}
+    links: Dict[int, Tuple[int, float]] = {}
+
+    for idx, text in enumerate(texts):
+        if len(text.split()) < min_words:
+            continue
+        signature = hasher.signature(text)
+        if signature is None:
+            continue
+
+        keys = [(band, signature[band * rows:(band + 1) * rows].tobytes()) for band in range(bands)]
+
+        candidates = sorted({c for key in keys for c in buckets.get(key, ())})
+        best, best_similarity = None, 0.0
+        for candidate in candidates:
+            similarity = float(np.mean(signatures[candidate] == signature))
+            if similarity > best_similarity:
+                best, best_similarity = candidate, similarity
+
+        if best is not None and best_similarity >= threshold:
+            links[idx] = (best, best_similarity)
+            continue
+
+        # Novo canônico: só canônicos ficam nas faixas
+        signatures[idx] = signature
+        for key in keys:
+            buckets.setdefault(key, []).append(idx)
+
+    return links
+
+
+def find_near_duplicates(
+    documents: List[Dict[str, Any]],
+    config: Optional[Dict[str, Any]] = None
+) -> Dict[str, Tuple[str, float]]:
+    """
+    Encontra documentos quase duplicados pelo conteúdo
+
+    Args:
+        documents: Documentos (com 'id' e 'content'), na ordem de preferência
+            para canônico
+        config: Parâmetros (ver NEAR_DUPLICATE_DEFAULTS)
+
+    Returns:
+        dict: {id do membro: (id do canônico, similaridade estimada)};
+            vazio se o NumPy não estiver instalado
+    """
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        print("⚠ NumPy não instalado. Detecção de quase duplicatas desativada.")
+        return {}
+
+    params = dict(NEAR_DUPLICATE_DEFAULTS)
+    params.update({k: v for k, v in (config or {}).items() if k in NEAR_DUPLICATE_DEFAULTS})
+
+    links = cluster_near_duplicates([doc.get('content', '') for doc in documents], **params)
+
+    return {
+        documents[member]['id']: (documents[canonical]['id'], similarity)
+        for member, (canonical, similarity) in links.items()
+    }
+
+
+def is_near_duplicate_link(document: Dict[str, Any]) -> bool:
+    """Indica se a análise NLP do documento é apenas a ligação ao canônico"""
+    return ANALYSIS_LINK_KEY in document.get('nlp_analysis', {})
+
+
+def clear_near_duplicate_link(document: Dict[str, Any]):
+    """Remove a ligação (e a análise reaproveitada) de um documento"""
+    if is_near_duplicate_link(document):
+        document.pop('nlp_analysis', None)
+    document.pop(LINK_FIELD, None)
+    document.pop(SIMILARITY_FIELD, None)
+
+
+def apply_near_duplicate_links(
+    documents: List[Dict[str, Any]],
+    links: Dict[str, Tuple[str, float]]
+):
+    """
+    Liga os membros aos canônicos e refaz as listas de membros
+
+    Cada membro recebe 'near_duplicate_of', 'near_duplicate_similarity' e,
+    no lugar da análise NLP, {'reaproveitada_de': id do canônico}. Cada
+    canônico recebe 'near_duplicates' com os ids dos membros (incluindo
+    ligações de execuções anteriores ainda válidas).
+
+    Args:
+        documents: Todos os documentos da base de conhecimento
+        links: Resultado de find_near_duplicates
+    """
+    for doc in documents:
+        link = links.get(doc.get('id'))
+        if link is None:
+            continue
+        canonical_id, similarity = link
+        doc[LINK_FIELD] = canonical_id
+        doc[SIMILARITY_FIELD] = round(similarity, 4)
+        doc['nlp_analysis'] = {ANALYSIS_LINK_KEY: canonical_id}
+
+    members: Dict[str, List[str]] = {}
+    for doc in documents:
+        if doc.get(LINK_FIELD):
+            members.setdefault(doc[LINK_FIELD], []).append(doc['id'])
+
+    for doc in documents:
+        if doc.get('id') in members:
+            doc[MEMBERS_FIELD] = members[doc['id']]
+        else:
+            doc.pop(MEMBERS_FIELD, None)
+
+
+def documents_pending_nlp(documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Documentos que precisam de análise NLP nesta execução
+
+    Além dos documentos sem análise, inclui as cópias ligadas a um canônico
+    que será reanalisado ou que não existe mais (a ligação pode ter deixado
+    de valer e o documento é reagrupado).
+
+    Args:
+        documents: Todos os documentos da base de conhecimento
+
+    Returns:
+        list: Documentos pendentes, na ordem original
+    """
+    pending_ids = {doc['id'] for doc in documents if 'nlp_analysis' not in doc}
+    all_ids = {doc['id'] for doc in documents}
+
+    def is_pending(doc):
+        if doc['id'] in pending_ids:
+            return True
+        if not is_near_duplicate_link(doc):
+            return False
+        canonical_id = doc['nlp_analysis'][ANALYSIS_LINK_KEY]
+        return canonical_id in pending_ids or canonical_id not in all_ids
+
+    return [doc for doc in documents if is_pending(doc)]
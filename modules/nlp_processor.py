@@ -4,13 +4,38 @@ Integra todos os componentes: NER, Sumarização e preparação para RAG
 Implementa a metodologia "Estrategista Jurídico-Cognitivo"
 """
 
-from typing import Dict, Any, List, Optional
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, List, Optional, Tuple
 import warnings
 warnings.filterwarnings('ignore')
 
 from .legal_ner import LegalEntityExtractor, extract_legal_entities
 from .legal_summarizer import LegalSummarizer, summarize_legal_text
 from .rag_indexer import RAGIndexer
+from .model_registry import get_model_registry
+from .keyword_matcher import get_keyword_automaton
+from .stage_cache import StageCache, text_hash
+from .document_structure import document_structure
+from .analysis_context import AnalysisContext
+
+
+# Tipo de decisão -> resultado
+DECISION_RESULTS = {
+    'procedente': 'favoravel_autor',
+    'improcedente': 'favoravel_reu',
+    'parcialmente_procedente': 'parcial'
+}
+
+# Versão de cada etapa no cache em disco: incremente ao mudar a lógica da etapa
+CACHE_STAGE_VERSIONS = {
+    'entidades': 2,
+    'sumarizacao': 1,
+    'classificacao': 2,
+    'decisao': 1,
+}
 
 
 class LegalNLPProcessor:
@@ -19,25 +44,81 @@ class LegalNLPProcessor:
     Aplica análise cognitiva e estruturação para sistemas RAG
     """
 
-    def __init__(self, config: Optional[Dict[str, Any]] = None):
+    def __init__(self, config: Optional[Dict[str, Any]] = None, verbose: bool = True):
         """
         Inicializa o processador NLP
 
         Args:
             config: Configurações personalizadas
+            verbose: Se False, não exibe o progresso por documento (usado nos workers)
         """
         self.config = config or {}
-
-        # Componentes NLP
-        self.entity_extractor = LegalEntityExtractor()
-        self.summarizer = LegalSummarizer()
-        self.rag_indexer = RAGIndexer()
+        self.verbose = verbose
+
+        # Componentes NLP (os modelos vêm do registro compartilhado do processo)
+        models = self.config.get('models', {})
+        self.model_registry = get_model_registry()
+        spacy_config = self.config.get('spacy', {})
+        self.entity_extractor = LegalEntityExtractor(
+            spacy_model=models.get('spacy_model'),
+            batch_size=spacy_config.get('batch_size', 16),
+            n_process=spacy_config.get('n_process', 1),
+            max_chars=spacy_config.get('max_chars', 100000),
+            ml_scope=spacy_config.get('scope', 'full'),
+            selective=spacy_config.get('selective')
+        )
+        summary_config = self.config.get('summarization', {})
+        self.summarizer = LegalSummarizer(
+            model_name=models.get('summarization_model'),
+            scoring=summary_config.get('scoring', 'keywords'),
+            textrank_weight=summary_config.get('textrank_weight', 2.0),
+            batch_size=summary_config.get('batch_size', 8),
+            hierarchical=summary_config.get('hierarchical')
+        )
+        if models.get('embedding_model'):
+            self.rag_indexer = RAGIndexer(embedding_model=models['embedding_model'])
+        else:
+            self.rag_indexer = RAGIndexer()
+
+        # Autômato de palavras-chave (classificação e análise da decisão)
+        self.keywords = get_keyword_automaton(self.config.get('legal'))
+
+        # Cache em disco dos resultados por etapa
+        cache_config = self.config.get('cache', {})
+        self.stage_cache = None
+        if cache_config.get('enabled') and cache_config.get('directory'):
+            self.stage_cache = StageCache(
+                cache_config['directory'],
+                cache_config.get('max_size_mb', 512)
+            )
+
+        # Configuração que afeta o resultado de cada etapa (parte da chave do cache)
+        self.stage_configs = {
+            'entidades': {
+                'spacy_model': None,  # Pipeline carregado de fato (ver _entities_cache_key)
+                'max_chars': spacy_config.get('max_chars', 100000),
+                'scope': spacy_config.get('scope', 'full'),
+                'selective': spacy_config.get('selective') if spacy_config.get('scope') == 'selective' else None
+            },
+            'sumarizacao': {
+                'model': None,  # Modelo carregado de fato (ver _summary_cache_key)
+                'max_length': 500,
+                'hierarchical': self.summarizer.hierarchical,
+                'scoring': self.summarizer.scoring,
+                'textrank_weight': self.summarizer.textrank_weight if self.summarizer.scoring == 'textrank' else None
+            },
+            'classificacao': {'legal': self.config.get('legal')},
+            'decisao': {}
+        }
 
         # Configurações
         self.enable_ner = self.config.get('enable_ner', True)
         self.enable_summarization = self.config.get('enable_summarization', True)
         self.enable_embeddings = self.config.get('enable_embeddings', False)
 
+        if not self.verbose:
+            return
+
         print("\n" + "=" * 60)
         print("  🧠 PROCESSADOR NLP JURÍDICO INICIALIZADO")
         print("  Metodologia: Estrategista Jurídico-Cognitivo")
@@ -47,21 +128,45 @@ class LegalNLPProcessor:
         print(f"  ✓ Embeddings para RAG: {'Ativo' if self.enable_embeddings else 'Desativado'}")
         print("=" * 60 + "\n")
 
-    def process_document(self, document: Dict[str, Any], doc_index: int) -> Dict[str, Any]:
+    def process_document(
+        self,
+        document: Dict[str, Any],
+        doc_index: int,
+        entities_data: Optional[Dict[str, Any]] = None,
+        context: Optional[AnalysisContext] = None,
+        summary_data: Optional[Dict[str, Any]] = None,
+        content_hash: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Processa um único documento com análise NLP completa
 
         Args:
             document: Documento com conteúdo extraído
             doc_index: Índice do documento
+            entities_data: Resultado de extract_legal_entities já obtido
+                (em lote ou do cache, ver _process_block)
+            context: Contexto de análise do conteúdo (criado se ausente)
+            summary_data: Resultado de summarize_legal_text já obtido
+                (em lote ou do cache, ver _summarize_block)
+            content_hash: text_hash do conteúdo já calculado (chave do cache)
 
         Returns:
             Documento enriquecido com análise NLP
         """
         content = document.get('content', '')
         doc_id = document.get('id', f'doc_{doc_index}')
+        if content_hash is None and self.stage_cache is not None:
+            content_hash = text_hash(content)
+
+        # Seções, páginas e parágrafos (calculados na leitura; aqui só se ausentes)
+        structure = document_structure(document)
 
-        print(f"  [{doc_index}] Processando NLP: {document.get('filename', 'N/A')}")
+        # Minúsculas e palavras: calculadas uma vez para classificação, decisão e métricas
+        if context is None:
+            context = AnalysisContext(content)
+
+        if self.verbose:
+            print(f"  [{doc_index}] Processando NLP: {document.get('filename', 'N/A')}")
 
         # Inicializa estrutura de análise NLP
         nlp_analysis = {
@@ -73,19 +178,41 @@ class LegalNLPProcessor:
         }
 
         try:
+            # Métricas de complexidade (incluídas no passo 5): calculadas antes das
+            # demais etapas para liberar o array de tamanhos das palavras
+            complexity = self._calculate_complexity(content, context)
+            word_count = context.word_count
+            context.release('word_lengths')
+
             # 1. Extração de Entidades Nomeadas (NER)
             if self.enable_ner and len(content) > 50:
-                print(f"      → Extraindo entidades jurídicas...")
-                entities_data = extract_legal_entities(content)
+                if self.verbose:
+                    print(f"      → Extraindo entidades jurídicas...")
+                if entities_data is None:
+                    self._entities_cache_key()
+                    entities_data = self._cached(
+                        'entidades', content_hash,
+                        lambda: extract_legal_entities(content, extractor=self.entity_extractor, structure=structure)
+                    )
 
                 nlp_analysis['entidades'] = entities_data['entidades']
                 nlp_analysis['analise_estrutural'] = entities_data['analise_estrutural']
                 nlp_analysis['metricas']['total_entidades'] = entities_data['estatisticas']['total_entidades']
 
             # 2. Sumarização
-            if self.enable_summarization and len(content.split()) > 100:
-                print(f"      → Gerando sumarização...")
-                summary_data = summarize_legal_text(content, max_length=500)
+            if self.enable_summarization and word_count > 100:
+                if self.verbose:
+                    print(f"      → Gerando sumarização...")
+                if summary_data is None:
+                    self._summary_cache_key()
+                    summary_data = self._cached(
+                        'sumarizacao', content_hash,
+                        lambda: summarize_legal_text(
+                            content, max_length=500, summarizer=self.summarizer,
+                            structure=structure, context=context
+                        ),
+                        cacheable=self._summary_cacheable
+                    )
 
                 nlp_analysis['sumarizacao'] = {
                     'resumo': summary_data['summary'],
@@ -96,22 +223,31 @@ class LegalNLPProcessor:
                 }
 
             # 3. Classificação de Documento
-            print(f"      → Classificando documento...")
-            classification = self._classify_document(content)
+            if self.verbose:
+                print(f"      → Classificando documento...")
+            classification = self._cached(
+                'classificacao', content_hash, lambda: self._classify_document(content, structure, context)
+            )
             nlp_analysis['classificacao'] = classification
 
             # 4. Análise de Sentimento/Decisão
-            decision_analysis = self._analyze_decision(content)
+            decision_analysis = self._cached(
+                'decisao', content_hash, lambda: self._analyze_decision(content, context)
+            )
             nlp_analysis['analise_decisao'] = decision_analysis
+            # Última etapa que lê o texto em minúsculas
+            context.release('lower')
+            self.keywords.forget()
 
             # 5. Métricas de complexidade
-            complexity = self._calculate_complexity(content)
             nlp_analysis['metricas']['complexidade'] = complexity
 
-            print(f"      ✓ NLP concluído")
+            if self.verbose:
+                print(f"      ✓ NLP concluído")
 
         except Exception as e:
-            print(f"      ⚠ Erro no processamento NLP: {str(e)}")
+            if self.verbose:
+                print(f"      ⚠ Erro no processamento NLP: {str(e)}")
             nlp_analysis['erro'] = str(e)
 
         # Adiciona análise NLP ao documento
@@ -119,12 +255,92 @@ class LegalNLPProcessor:
 
         return document
 
-    def _classify_document(self, content: str) -> Dict[str, Any]:
+    def _cached(self, stage: str, content_hash: Optional[str], compute, cacheable=None):
+        """
+        Resultado de uma etapa, lido do cache em disco ou calculado e gravado
+
+        Args:
+            stage: Nome da etapa (chave de CACHE_STAGE_VERSIONS)
+            content_hash: Hash do texto (None = sem cache)
+            compute: Função que calcula o resultado
+            cacheable: Se informada, só grava os resultados em que cacheable(resultado) é True
+
+        Returns:
+            Resultado da etapa
+        """
+        if self.stage_cache is None or content_hash is None:
+            return compute()
+
+        version = CACHE_STAGE_VERSIONS[stage]
+        config = self.stage_configs[stage]
+
+        value = self.stage_cache.get(stage, version, content_hash, config)
+        if value is None:
+            value = compute()
+            if cacheable is None or cacheable(value):
+                self.stage_cache.put(stage, version, content_hash, config, value)
+
+        return value
+
+    def _entities_cache_key(self):
+        """
+        Carrega o modelo spaCy e põe na chave do cache o pipeline que carregou
+        de fato (None = só regex)
+
+        Assim, entidades só de regex gravadas quando o modelo não carregou não
+        são servidas depois que ele passa a carregar.
+        """
+        extractor = self.entity_extractor
+        if not extractor.initialized:
+            extractor.initialize_ml_models()
+        meta = extractor.nlp.meta if extractor.use_ml_models else None
+        self.stage_configs['entidades']['spacy_model'] = (
+            f"{meta.get('lang')}_{meta.get('name')}-{meta.get('version')}" if meta else None
+        )
+
+    def _summary_cache_key(self):
+        """
+        Carrega o modelo de sumarização e põe na chave do cache o modelo que
+        carregou de fato (None = só extrativa)
+
+        Assim, resumos extrativos gravados quando o modelo não carregou não
+        são servidos depois que ele passa a carregar.
+        """
+        self.summarizer.initialize_model()
+        self.stage_configs['sumarizacao']['model'] = self.summarizer.loaded_model
+
+    def _summary_cacheable(self, summary_data: Dict[str, Any]) -> bool:
+        """
+        Indica se o resumo pode ir para o cache
+
+        Com modelo abstrativo, o resumo extrativo é um fallback (lote que
+        falhou, orçamento de tempo estourado) e não é gravado: uma próxima
+        execução tenta o modelo de novo.
+        """
+        return not self.summarizer.use_ml_model or summary_data.get('method') == 'abstractive_ml'
+
+    def warm_up(self):
+        """Pré-carrega os modelos necessários para os módulos ativos"""
+        self.model_registry.warm_up(
+            self.config.get('models', {}),
+            spacy=self.enable_ner,
+            summarization=self.enable_summarization,
+            embeddings=self.enable_embeddings
+        )
+
+    def _classify_document(
+        self,
+        content: str,
+        structure: Optional[Dict[str, Any]] = None,
+        context: Optional[AnalysisContext] = None
+    ) -> Dict[str, Any]:
         """
         Classifica o tipo e natureza do documento jurídico
 
         Args:
             content: Conteúdo do documento
+            structure: Estrutura do documento (ver segment_document)
+            context: Contexto de análise do conteúdo
 
         Returns:
             Classificação do documento
@@ -133,48 +349,43 @@ class LegalNLPProcessor:
             'tipo_documento': 'desconhecido',
             'natureza': [],
             'area_direito': [],
+            'secoes': [],
             'confianca': 0.0
         }
 
-        content_lower = content.lower()
+        hits = self._keyword_hits(content, context)
 
-        # Tipos de documento
-        doc_types = {
-            'acordao': ['acórdão', 'acordão', 'voto', 'relator'],
-            'sentenca': ['sentença', 'julgo procedente', 'julgo improcedente'],
-            'peticao': ['petição', 'requer', 'excelentíssimo'],
-            'parecer': ['parecer', 'opina', 'manifesta-se'],
-            'decisao': ['decisão', 'defiro', 'indefiro'],
-            'despacho': ['despacho', 'vista', 'manifeste-se']
-        }
-
-        for doc_type, keywords in doc_types.items():
-            if any(kw in content_lower for kw in keywords):
-                classification['tipo_documento'] = doc_type
-                break
+        # Tipos de documento (o primeiro encontrado, em ordem de prioridade)
+        doc_type = hits.first('tipo_documento')
+        if doc_type:
+            classification['tipo_documento'] = doc_type
 
         # Áreas do direito
-        areas = {
-            'civil': ['direito civil', 'obrigação', 'contrato', 'responsabilidade civil'],
-            'penal': ['direito penal', 'crime', 'pena', 'código penal', 'condenação'],
-            'trabalhista': ['trabalhista', 'clt', 'empregado', 'empregador', 'rescisão'],
-            'tributario': ['tributário', 'imposto', 'tributo', 'icms', 'irpf'],
-            'constitucional': ['constitucional', 'constituição', 'stf', 'adi', 'adpf'],
-            'administrativo': ['administrativo', 'servidor público', 'licitação']
-        }
+        classification['area_direito'] = hits.labels('area_direito')
 
-        for area, keywords in areas.items():
-            if any(kw in content_lower for kw in keywords):
-                classification['area_direito'].append(area)
+        # Seções presentes, na ordem do documento
+        if structure:
+            classification['secoes'] = [section['name'] for section in structure['sections']]
 
         return classification
 
-    def _analyze_decision(self, content: str) -> Dict[str, Any]:
+    def _keyword_hits(self, content: str, context: Optional[AnalysisContext] = None):
+        """Ocorrências das palavras-chave (no texto em minúsculas do contexto, se houver)"""
+        if context is not None:
+            return self.keywords.find(context.lower, lowered=True)
+        return self.keywords.find(content)
+
+    def _analyze_decision(
+        self,
+        content: str,
+        context: Optional[AnalysisContext] = None
+    ) -> Dict[str, Any]:
         """
         Analisa a decisão judicial (se aplicável)
 
         Args:
             content: Conteúdo do documento
+            context: Contexto de análise do conteúdo
 
         Returns:
             Análise da decisão
@@ -185,46 +396,44 @@ class LegalNLPProcessor:
             'fundamentacao_principal': []
         }
 
-        content_lower = content.lower()
-
-        # Detecta tipo de decisão
-        if any(term in content_lower for term in ['julgo procedente', 'dou provimento', 'acordam em dar provimento']):
-            decision['tipo'] = 'procedente'
-            decision['resultado'] = 'favoravel_autor'
-
-        elif any(term in content_lower for term in ['julgo improcedente', 'nego provimento', 'acordam em negar']):
-            decision['tipo'] = 'improcedente'
-            decision['resultado'] = 'favoravel_reu'
-
-        elif 'parcialmente procedente' in content_lower:
-            decision['tipo'] = 'parcialmente_procedente'
-            decision['resultado'] = 'parcial'
+        # Detecta tipo de decisão (mesma busca usada na classificação)
+        decision_type = self._keyword_hits(content, context).first('decisao')
+        if decision_type:
+            decision['tipo'] = decision_type
+            decision['resultado'] = DECISION_RESULTS[decision_type]
 
         return decision
 
-    def _calculate_complexity(self, content: str) -> Dict[str, Any]:
+    def _calculate_complexity(
+        self,
+        content: str,
+        context: Optional[AnalysisContext] = None
+    ) -> Dict[str, Any]:
         """
         Calcula métricas de complexidade do texto jurídico
 
         Args:
             content: Conteúdo do documento
+            context: Contexto de análise do conteúdo
 
         Returns:
             Métricas de complexidade
         """
-        words = content.split()
-        sentences = content.split('.')
+        # Tamanhos das palavras (array compacto, sem manter a lista de palavras)
+        word_lengths = (context or AnalysisContext(content)).word_lengths
+        # Trechos separados por '.' (mesmo total de content.split('.'), sem a lista)
+        sentence_count = content.count('.') + 1
 
         complexity = {
-            'total_palavras': len(words),
-            'total_sentencas': len(sentences),
-            'media_palavras_sentenca': len(words) / max(len(sentences), 1),
+            'total_palavras': len(word_lengths),
+            'total_sentencas': sentence_count,
+            'media_palavras_sentenca': len(word_lengths) / max(sentence_count, 1),
             'palavras_complexas': 0,
             'nivel': 'simples'
         }
 
         # Conta palavras complexas (> 10 caracteres)
-        complexity['palavras_complexas'] = sum(1 for w in words if len(w) > 10)
+        complexity['palavras_complexas'] = sum(1 for length in word_lengths if length > 10)
 
         # Define nível de complexidade
         avg_words = complexity['media_palavras_sentenca']
@@ -237,33 +446,304 @@ class LegalNLPProcessor:
 
         return complexity
 
-    def process_batch(self, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def process_batch(
+        self,
+        documents: List[Dict[str, Any]],
+        parallel: Optional[bool] = None,
+        workers: Optional[int] = None,
+        chunk_size: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
         """
         Processa um lote de documentos
 
         Args:
             documents: Lista de documentos
+            parallel: Se True, usa um pool de processos (padrão: config['parallel']['enabled'])
+            workers: Número de processos (padrão: config['parallel']['workers'] ou nº de CPUs)
+            chunk_size: Documentos por tarefa enviada ao pool
 
         Returns:
-            Lista de documentos processados
+            Lista de documentos processados (na mesma ordem da entrada)
         """
+        parallel_config = self.config.get('parallel', {})
+        if parallel is None:
+            parallel = parallel_config.get('enabled', False)
+        workers = workers or parallel_config.get('workers') or os.cpu_count() or 1
+        chunk_size = chunk_size or parallel_config.get('chunk_size', 4)
+
         print(f"\n🔄 Iniciando processamento NLP de {len(documents)} documentos...")
 
-        processed_docs = []
+        if parallel and workers > 1 and len(documents) > 1:
+            processed_docs = self._process_batch_parallel(documents, workers, chunk_size)
+        else:
+            processed_docs = []
+            items = list(enumerate(documents, 1))
+            block_size = max(1, self.entity_extractor.batch_size)
 
-        for idx, doc in enumerate(documents, 1):
-            processed_doc = self.process_document(doc, idx)
-            processed_docs.append(processed_doc)
+            # Blocos de documentos: o spaCy recebe o bloco inteiro de uma vez
+            for start in range(0, len(items), block_size):
+                for _, processed_doc in self._process_block(items[start:start + block_size]):
+                    processed_docs.append(processed_doc)
 
-        print(f"✓ Processamento NLP concluído para {len(processed_docs)} documentos\n")
+        print(f"✓ Processamento NLP concluído para {len(processed_docs)} documentos")
+        self.model_registry.print_report()
+        if self.stage_cache is not None:
+            self.stage_cache.print_report()
+        print()
 
         return processed_docs
 
+    def _process_block(
+        self,
+        items: List[Tuple[int, Dict[str, Any]]]
+    ) -> List[Tuple[int, Dict[str, Any]]]:
+        """
+        Processa um bloco de documentos (idx, doc), com o NER feito em lote
+
+        Args:
+            items: Pares (índice, documento)
+
+        Returns:
+            list: Pares (índice, documento processado) na mesma ordem
+        """
+        # Hash do conteúdo (chave do cache) calculado uma vez por documento
+        hashes = {
+            idx: text_hash(doc.get('content', '')) for idx, doc in items
+        } if self.stage_cache is not None else {}
+
+        entities_by_idx = {}
+        eligible = [(idx, doc) for idx, doc in items if len(doc.get('content', '')) > 50]
+
+        if self.enable_ner and eligible:
+            self._entities_cache_key()
+            # Entidades já em cache não passam pelo lote
+            pending = []
+            for idx, doc in eligible:
+                cached = None
+                if self.stage_cache is not None:
+                    cached = self.stage_cache.get(
+                        'entidades', CACHE_STAGE_VERSIONS['entidades'],
+                        hashes[idx], self.stage_configs['entidades']
+                    )
+                if cached is not None:
+                    entities_by_idx[idx] = cached
+                else:
+                    pending.append((idx, doc))
+
+            if len(pending) > 1 or (pending and self.stage_cache is not None):
+                try:
+                    batch = self.entity_extractor.extract_entities_batch(
+                        [doc.get('content', '') for _, doc in pending],
+                        structures=[document_structure(doc) for _, doc in pending]
+                    )
+                    for (idx, doc), entities in zip(pending, batch):
+                        entities_data = extract_legal_entities(
+                            doc.get('content', ''),
+                            extractor=self.entity_extractor,
+                            entities=entities
+                        )
+                        if self.stage_cache is not None:
+                            self.stage_cache.put(
+                                'entidades', CACHE_STAGE_VERSIONS['entidades'],
+                                hashes[idx], self.stage_configs['entidades'],
+                                entities_data
+                            )
+                        entities_by_idx[idx] = entities_data
+                except Exception as e:
+                    # Sem o lote, cada documento extrai as próprias entidades
+                    if self.verbose:
+                        print(f"  ⚠ Erro no NER em lote ({str(e)}); extraindo por documento")
+
+        # Contextos de análise compartilhados pela sumarização em lote e pelas demais etapas
+        contexts = {idx: AnalysisContext(doc.get('content', '')) for idx, doc in items}
+        summaries_by_idx = self._summarize_block(items, contexts, hashes)
+
+        return [
+            (idx, self.process_document(
+                doc, idx,
+                entities_data=entities_by_idx.get(idx),
+                context=contexts[idx],
+                summary_data=summaries_by_idx.get(idx),
+                content_hash=hashes.get(idx)
+            ))
+            for idx, doc in items
+        ]
+
+    def _summarize_block(
+        self,
+        items: List[Tuple[int, Dict[str, Any]]],
+        contexts: Dict[int, AnalysisContext],
+        hashes: Dict[int, str]
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Sumarização abstrativa em lote dos documentos de um bloco
+
+        Só se aplica quando há modelo de sumarização: a extrativa continua
+        por documento, em process_document. Resumos já em cache não passam
+        pelo modelo.
+
+        Args:
+            items: Pares (índice, documento)
+            contexts: Contexto de análise de cada documento
+            hashes: text_hash do conteúdo de cada documento (vazio sem cache)
+
+        Returns:
+            dict: {índice: resultado de summarize_legal_text}
+        """
+        summaries_by_idx = {}
+        if not self.enable_summarization:
+            return summaries_by_idx
+
+        self._summary_cache_key()
+        if not self.summarizer.use_ml_model:
+            return summaries_by_idx
+
+        pending = []
+        for idx, doc in items:
+            if contexts[idx].word_count <= 100:
+                continue
+            cached = None
+            if self.stage_cache is not None:
+                cached = self.stage_cache.get(
+                    'sumarizacao', CACHE_STAGE_VERSIONS['sumarizacao'],
+                    hashes[idx], self.stage_configs['sumarizacao']
+                )
+            if cached is not None:
+                summaries_by_idx[idx] = cached
+            else:
+                pending.append((idx, doc))
+
+        if len(pending) > 1 or (pending and self.stage_cache is not None):
+            try:
+                batch = self.summarizer.summarize_batch(
+                    [doc.get('content', '') for _, doc in pending],
+                    max_length=500,
+                    structures=[document_structure(doc) for _, doc in pending],
+                    contexts=[contexts[idx] for idx, _ in pending]
+                )
+                for (idx, doc), summary_data in zip(pending, batch):
+                    if self.stage_cache is not None and self._summary_cacheable(summary_data):
+                        self.stage_cache.put(
+                            'sumarizacao', CACHE_STAGE_VERSIONS['sumarizacao'],
+                            hashes[idx], self.stage_configs['sumarizacao'],
+                            summary_data
+                        )
+                    summaries_by_idx[idx] = summary_data
+            except Exception as e:
+                # Sem o lote, cada documento gera o próprio resumo
+                if self.verbose:
+                    print(f"  ⚠ Erro na sumarização em lote ({str(e)}); sumarizando por documento")
+
+        return summaries_by_idx
+
+    def _process_batch_parallel(
+        self,
+        documents: List[Dict[str, Any]],
+        workers: int,
+        chunk_size: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Processa o lote em um pool de processos, preservando a ordem
+
+        Cada worker carrega os modelos uma única vez (no initializer) e o
+        pool é mantido durante todo o lote. No máximo `workers` tarefas ficam
+        em andamento, para que, se um worker morrer, só os documentos das
+        tarefas que estavam rodando fiquem sob suspeita: o pool é recriado e
+        esses documentos rodam um por vez; o que derrubar o worker sozinho
+        recebe apenas o registro do erro. As demais tarefas seguem no pool
+        recriado.
+        """
+        workers = min(workers, len(documents))
+        print(f"   ⚡ Modo paralelo: {workers} processos, {chunk_size} documentos por tarefa")
+
+        items = list(enumerate(documents, 1))
+        queue = deque(items[i:i + chunk_size] for i in range(0, len(items), chunk_size))
+        suspects = deque()  # Documentos de tarefas interrompidas, um por tarefa
+        running = {}  # future -> (tarefa, isolada)
+        results: Dict[int, Dict[str, Any]] = {}
+        done = 0
+        pool = None
+
+        def submit(task, isolated):
+            try:
+                running[pool.submit(_process_chunk, task)] = (task, isolated)
+                return True
+            except BrokenProcessPool:
+                # O pool caiu depois da última espera: a tarefa volta para a fila
+                (suspects if isolated else queue).appendleft(task)
+                return False
+
+        def collect(future):
+            nonlocal done
+            task, isolated = running.pop(future)
+            try:
+                processed, cache_stats = future.result()
+            except BrokenProcessPool:
+                if isolated:
+                    for idx, doc in task:
+                        print(f"   ⚠ Documento {doc.get('filename', idx)} derrubou o worker; ignorando NLP")
+                        results[idx] = _failed_document(doc, BrokenProcessPool('worker encerrado'))
+                    done += len(task)
+                else:
+                    suspects.extend([item] for item in task)
+                return False
+            except Exception as e:
+                # Erro ao serializar ou processar: não adianta repetir
+                for idx, doc in task:
+                    results[idx] = _failed_document(doc, e)
+                done += len(task)
+                return True
+
+            for idx, doc in processed:
+                results[idx] = doc
+            if self.stage_cache is not None:
+                self.stage_cache.merge_stats(cache_stats)
+            done += len(task)
+            print(f"   [{done}/{len(documents)}] documentos processados")
+            return True
+
+        try:
+            while queue or suspects or running:
+                if pool is None:
+                    pool = ProcessPoolExecutor(
+                        max_workers=workers, initializer=_init_worker, initargs=(self.config,)
+                    )
+
+                # Suspeitos rodam sozinhos (identifica o culpado se o worker morrer de novo)
+                if suspects:
+                    if not running:
+                        submit(suspects.popleft(), isolated=True)
+                else:
+                    while queue and len(running) < workers and submit(queue.popleft(), isolated=False):
+                        pass
+                if not running:
+                    # O pool caiu antes de receber as tarefas: recria
+                    pool.shutdown(wait=True)
+                    pool = None
+                    continue
+
+                finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                intact = all([collect(future) for future in finished])
+                if not intact:
+                    # As demais tarefas em andamento também foram interrompidas
+                    for future in list(running):
+                        collect(future)
+                    pool.shutdown(wait=True)
+                    pool = None
+                    if suspects:
+                        print(f"   ⚠ Worker interrompido; reprocessando {len(suspects)} documento(s) um por vez")
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
+
+        return [results[idx] for idx, _ in items]
+
     def create_rag_index(
         self,
         documents: List[Dict[str, Any]],
         chunk_size: int = 512,
-        overlap: int = 50
+        overlap: int = 50,
+        bundle_path: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Cria índice RAG a partir dos documentos processados
@@ -272,17 +752,22 @@ class LegalNLPProcessor:
             documents: Documentos processados
             chunk_size: Tamanho dos chunks
             overlap: Sobreposição
+            bundle_path: Diretório do pacote RAG (padrão: config['rag']['bundle_dir'])
 
         Returns:
             Dataset RAG indexado
         """
         print("\n🔄 Criando índice RAG...")
 
+        rag_config = self.config.get('rag', {})
         rag_dataset = self.rag_indexer.prepare_rag_dataset(
             documents,
             chunk_size=chunk_size,
             overlap=overlap,
-            create_embeddings=self.enable_embeddings
+            create_embeddings=self.enable_embeddings,
+            bundle_path=bundle_path or rag_config.get('bundle_dir'),
+            embedding_dtype=rag_config.get('embedding_dtype', 'float32'),
+            bm25_config=rag_config.get('bm25')
         )
 
         print("✓ Índice RAG criado com sucesso\n")
@@ -290,6 +775,40 @@ class LegalNLPProcessor:
         return rag_dataset
 
 
+# ============================================================
+# WORKERS DO POOL DE PROCESSOS
+# ============================================================
+
+_worker_processor: Optional[LegalNLPProcessor] = None
+
+
+def _init_worker(config: Dict[str, Any]):
+    """Initializer do pool: cria o processador e carrega os modelos uma vez"""
+    global _worker_processor
+    _worker_processor = LegalNLPProcessor(config, verbose=False)
+    _worker_processor.warm_up()
+
+
+def _process_chunk(
+    items: List[Tuple[int, Dict[str, Any]]]
+) -> Tuple[List[Tuple[int, Dict[str, Any]]], Dict[str, Any]]:
+    """
+    Processa um bloco de documentos (idx, doc) dentro de um worker
+
+    Returns:
+        tuple: (documentos processados, contadores do cache desde a última tarefa)
+    """
+    processed = _worker_processor._process_block(items)
+    cache = _worker_processor.stage_cache
+    return processed, cache.take_stats() if cache is not None else {}
+
+
+def _failed_document(document: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+    """Marca um documento cujo processamento NLP falhou no pool"""
+    document['nlp_analysis'] = {'erro': f"Falha no worker: {str(error) or type(error).__name__}"}
+    return document
+
+
 def process_legal_documents(
     documents: List[Dict[str, Any]],
     config: Optional[Dict[str, Any]] = None
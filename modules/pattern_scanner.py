@@ -0,0 +1,251 @@
+"""
+Varredura única de vários padrões regex sobre um texto
+Compila todos os padrões em uma só expressão: um guarda despacha pelo
+primeiro caractere de cada padrão e, nas posições candidatas, lookaheads
+com grupos nomeados capturam a ocorrência de cada padrão
+"""
+
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+def _split_alternatives(pattern: str) -> List[str]:
+    """Divide um padrão nas alternativas de nível superior (separadas por '|')"""
+    alternatives = []
+    depth = 0
+    in_class = False
+    start = 0
+    i = 0
+
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            i += 2
+            continue
+        if in_class:
+            if char == ']':
+                in_class = False
+        elif char == '[':
+            in_class = True
+            # ']' logo após '[' ou '[^' é literal
+            if pattern[i + 1:i + 2] == '^':
+                i += 1
+            if pattern[i + 1:i + 2] == ']':
+                i += 1
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == '|' and depth == 0:
+            alternatives.append(pattern[start:i])
+            start = i + 1
+        i += 1
+
+    alternatives.append(pattern[start:])
+    return alternatives
+
+
+def _closing_index(pattern: str, open_index: int) -> int:
+    """Índice do ')' que fecha o grupo aberto em `open_index`"""
+    depth = 0
+    in_class = False
+    i = open_index
+
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            i += 2
+            continue
+        if in_class:
+            if char == ']':
+                in_class = False
+        elif char == '[':
+            in_class = True
+            if pattern[i + 1:i + 2] == '^':
+                i += 1
+            if pattern[i + 1:i + 2] == ']':
+                i += 1
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+
+    return -1
+
+
+def _is_optional(rest: str) -> bool:
+    """Indica se o quantificador no início de `rest` permite zero repetições"""
+    return rest[:1] in ('?', '*') or rest.startswith('{0') or rest.startswith('{,')
+
+
+def leading_fragments(pattern: str) -> Optional[List[str]]:
+    """
+    Fragmentos regex que casam o primeiro caractere de qualquer ocorrência
+
+    Reconhece o subconjunto usado pelos padrões do projeto: literal, classe
+    ([...]), escape (\\d, \\$ ...) e grupo não capturante com alternativas.
+
+    Args:
+        pattern: Padrão regex
+
+    Returns:
+        list: Fragmentos (um por alternativa) ou None se não for possível
+            determinar o primeiro caractere com segurança
+    """
+    fragments = []
+
+    for alternative in _split_alternatives(pattern):
+        if not alternative:
+            return None
+
+        if alternative.startswith('(?:'):
+            close = _closing_index(alternative, 0)
+            if close < 0 or _is_optional(alternative[close + 1:]):
+                return None
+            inner = leading_fragments(alternative[3:close])
+            if inner is None:
+                return None
+            fragments.extend(inner)
+            continue
+
+        if alternative[0] == '[':
+            end = 1
+            if alternative[end:end + 1] == '^':
+                end += 1
+            if alternative[end:end + 1] == ']':
+                end += 1
+            while end < len(alternative) and alternative[end] != ']':
+                end += 2 if alternative[end] == '\\' else 1
+            if end >= len(alternative):
+                return None
+            fragment = alternative[:end + 1]
+        elif alternative[0] == '\\':
+            escape = alternative[1:2]
+            if escape in ('d', 'w', 's') or (escape and not escape.isalnum()):
+                fragment = alternative[:2]
+            else:
+                return None
+        elif alternative[0] in '()|.^$*+?{':
+            return None
+        else:
+            fragment = re.escape(alternative[0])
+
+        if _is_optional(alternative[len(fragment):]):
+            return None
+        fragments.append(fragment)
+
+    return fragments
+
+
+def _class_members(fragment: str) -> Optional[str]:
+    """Conteúdo de classe ([...]) equivalente a um fragmento, ou None"""
+    if fragment.startswith('[^'):
+        return None
+    if fragment.startswith('['):
+        return fragment[1:-1]
+    return fragment
+
+
+class PatternScanner:
+    """
+    Encontra as ocorrências de vários padrões com uma única varredura do texto
+
+    O resultado de cada padrão é idêntico ao de re.finditer(padrão, texto,
+    flags): ocorrências sem sobreposição entre si, da esquerda para a direita.
+    Padrões de tipos diferentes continuam podendo se sobrepor.
+
+    Padrões com grupos de captura ou que casam a string vazia não podem ser
+    embutidos e são varridos separadamente (mesmo resultado, sem o ganho).
+    """
+
+    def __init__(self, patterns: Sequence[str], flags: int = re.IGNORECASE):
+        """
+        Compila os padrões
+
+        Args:
+            patterns: Padrões regex (o índice identifica o padrão no resultado)
+            flags: Flags aplicadas a todos os padrões
+        """
+        self.patterns = list(patterns)
+        self.flags = flags
+
+        self._embedded: List[int] = []
+        self._separate: List[Tuple[int, re.Pattern]] = []
+        dispatch: Dict[str, List[int]] = {}
+        unanchored: List[int] = []
+
+        for idx, pattern in enumerate(self.patterns):
+            compiled = re.compile(pattern, flags)
+            if compiled.groups or compiled.match(''):
+                self._separate.append((idx, compiled))
+                continue
+
+            self._embedded.append(idx)
+            fragments = leading_fragments(pattern)
+            if fragments is None:
+                unanchored.append(idx)
+                continue
+            for fragment in dict.fromkeys(fragments):
+                # Com IGNORECASE, 'S' e 's' despacham para o mesmo grupo
+                key = fragment.lower() if flags & re.IGNORECASE and len(fragment) == 1 else fragment
+                dispatch.setdefault(key, []).append(idx)
+
+        self._regex = None
+        if self._embedded:
+            def alternation(indices):
+                return '|'.join(f'(?:{self.patterns[i]})' for i in indices)
+
+            # Guarda: só aceita posições onde algum padrão casa, testando
+            # apenas os padrões cujo primeiro caractere é compatível
+            guard = [f'(?={fragment})(?:{alternation(indices)})'
+                     for fragment, indices in dispatch.items()]
+            if unanchored:
+                guard.append(alternation(unanchored))
+
+            # Pré-filtro: uma única classe com todos os primeiros caracteres
+            # descarta a maioria das posições sem testar o despacho
+            prefilter = ''
+            if not unanchored:
+                members = [_class_members(fragment) for fragment in dispatch]
+                if all(member is not None for member in members):
+                    prefilter = f"(?=[{''.join(members)}])"
+
+            # Captura, na posição candidata, a ocorrência de cada padrão
+            captures = ''.join(f'(?=(?P<p{i}>{self.patterns[i]}))?' for i in self._embedded)
+
+            self._regex = re.compile(f"{prefilter}(?=(?:{'|'.join(guard)})){captures}", flags)
+            self._groups = [(i, self._regex.groupindex[f'p{i}']) for i in self._embedded]
+
+    def find_all(self, text: str) -> List[List[Tuple[int, int]]]:
+        """
+        Varre o texto uma única vez
+
+        Args:
+            text: Texto a analisar
+
+        Returns:
+            list: Para cada padrão (na ordem de `patterns`), a lista de
+                spans (início, fim) das ocorrências, em ordem de posição
+        """
+        spans: List[List[Tuple[int, int]]] = [[] for _ in self.patterns]
+
+        if self._regex is not None:
+            # Fim da última ocorrência aceita de cada padrão (emula finditer,
+            # que recomeça a busca no fim da ocorrência anterior)
+            last_end = [0] * len(self.patterns)
+
+            for match in self._regex.finditer(text):
+                position = match.start()
+                for idx, group in self._groups:
+                    start, end = match.span(group)
+                    if start >= 0 and position >= last_end[idx]:
+                        spans[idx].append((start, end))
+                        last_end[idx] = end
+
+        for idx, compiled in self._separate:
+            spans[idx] = [match.span() for match in compiled.finditer(text)]
+
+        return spans
@@ -0,0 +1,243 @@
+"""
+Motores (backends) de extração de PDF
+Abstrai PyMuPDF, pypdf/PyPDF2 e pdfplumber atrás de uma interface comum,
+permitindo escolher o mais rápido instalado e trocar de motor por arquivo
+"""
+
+from typing import Dict, Any, List, Optional
+
+
+class PdfBackend:
+    """
+    Interface comum dos motores de PDF
+
+    Um motor abre o arquivo e devolve um handle opaco, usado pelos demais
+    métodos. Os metadados seguem as chaves de read_pdf_file_with_metadata e o
+    outline segue o formato de _parse_outline ({'title', 'level'} com nível 0).
+    """
+
+    name = 'base'
+
+    def available(self) -> bool:
+        """Indica se a biblioteca do motor está instalada"""
+        raise NotImplementedError
+
+    def open(self, file_path: str) -> Any:
+        raise NotImplementedError
+
+    def close(self, doc: Any):
+        pass
+
+    def page_count(self, doc: Any) -> int:
+        raise NotImplementedError
+
+    def page_text(self, doc: Any, page_index: int) -> str:
+        raise NotImplementedError
+
+    def metadata(self, doc: Any) -> Dict[str, str]:
+        raise NotImplementedError
+
+    def outline(self, doc: Any) -> List[Dict[str, Any]]:
+        return []
+
+
+class PyMuPDFBackend(PdfBackend):
+    """Motor baseado em PyMuPDF (fitz) - o mais rápido para extração de texto"""
+
+    name = 'pymupdf'
+
+    def _module(self):
+        try:
+            import pymupdf
+            return pymupdf
+        except ImportError:
+            import fitz
+            return fitz
+
+    def available(self) -> bool:
+        try:
+            self._module()
+            return True
+        except ImportError:
+            return False
+
+    def open(self, file_path: str) -> Any:
+        return self._module().open(file_path)
+
+    def close(self, doc: Any):
+        doc.close()
+
+    def page_count(self, doc: Any) -> int:
+        return doc.page_count
+
+    def page_text(self, doc: Any, page_index: int) -> str:
+        return doc.load_page(page_index).get_text()
+
+    def metadata(self, doc: Any) -> Dict[str, str]:
+        metadata = doc.metadata or {}
+        return {
+            'title': metadata.get('title') or '',
+            'author': metadata.get('author') or '',
+            'subject': metadata.get('subject') or '',
+            'creator': metadata.get('creator') or '',
+            'producer': metadata.get('producer') or '',
+            'creation_date': str(metadata.get('creationDate') or ''),
+            'modification_date': str(metadata.get('modDate') or '')
+        }
+
+    def outline(self, doc: Any) -> List[Dict[str, Any]]:
+        return [
+            {'title': title or 'Untitled', 'level': level - 1}
+            for level, title, *_ in doc.get_toc(simple=True)
+        ]
+
+
+class PyPDFBackend(PdfBackend):
+    """Motor baseado em pypdf (ou PyPDF2 como alternativa)"""
+
+    name = 'pypdf'
+
+    def _reader_class(self):
+        try:
+            from pypdf import PdfReader
+        except ImportError:
+            from PyPDF2 import PdfReader
+        return PdfReader
+
+    def available(self) -> bool:
+        try:
+            self._reader_class()
+            return True
+        except ImportError:
+            return False
+
+    def open(self, file_path: str) -> Any:
+        return self._reader_class()(file_path)
+
+    def page_count(self, doc: Any) -> int:
+        return len(doc.pages)
+
+    def page_text(self, doc: Any, page_index: int) -> str:
+        return doc.pages[page_index].extract_text()
+
+    def metadata(self, doc: Any) -> Dict[str, str]:
+        metadata = doc.metadata if doc.metadata else {}
+        return {
+            'title': metadata.get('/Title', ''),
+            'author': metadata.get('/Author', ''),
+            'subject': metadata.get('/Subject', ''),
+            'creator': metadata.get('/Creator', ''),
+            'producer': metadata.get('/Producer', ''),
+            'creation_date': str(metadata.get('/CreationDate', '')),
+            'modification_date': str(metadata.get('/ModDate', ''))
+        }
+
+    def outline(self, doc: Any) -> List[Dict[str, Any]]:
+        if hasattr(doc, 'outline') and doc.outline:
+            return _parse_pypdf_outline(doc.outline)
+        return []
+
+
+class PdfPlumberBackend(PdfBackend):
+    """Motor baseado em pdfplumber (mais lento, bom com layouts tabulares)"""
+
+    name = 'pdfplumber'
+
+    def available(self) -> bool:
+        try:
+            import pdfplumber  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def open(self, file_path: str) -> Any:
+        import pdfplumber
+        return pdfplumber.open(file_path)
+
+    def close(self, doc: Any):
+        doc.close()
+
+    def page_count(self, doc: Any) -> int:
+        return len(doc.pages)
+
+    def page_text(self, doc: Any, page_index: int) -> str:
+        page = doc.pages[page_index]
+        try:
+            return page.extract_text() or ''
+        finally:
+            # Libera o cache de objetos da página (pdfplumber acumula memória)
+            page.flush_cache()
+
+    def metadata(self, doc: Any) -> Dict[str, str]:
+        metadata = doc.metadata or {}
+        return {
+            'title': str(metadata.get('Title', '')),
+            'author': str(metadata.get('Author', '')),
+            'subject': str(metadata.get('Subject', '')),
+            'creator': str(metadata.get('Creator', '')),
+            'producer': str(metadata.get('Producer', '')),
+            'creation_date': str(metadata.get('CreationDate', '')),
+            'modification_date': str(metadata.get('ModDate', ''))
+        }
+
+    def outline(self, doc: Any) -> List[Dict[str, Any]]:
+        try:
+            return [
+                {'title': title or 'Untitled', 'level': level - 1}
+                for level, title, *_ in doc.doc.get_outlines()
+            ]
+        except Exception:
+            return []
+
+
+def _parse_pypdf_outline(outline, level=0):
+    """
+    Parser recursivo para outline do pypdf
+
+    Args:
+        outline: Objeto outline do PyPDF
+        level: Nível de profundidade
+
+    Returns:
+        list: Lista de itens do outline
+    """
+    items = []
+
+    for item in outline:
+        if isinstance(item, list):
+            items.extend(_parse_pypdf_outline(item, level + 1))
+        else:
+            try:
+                items.append({
+                    'title': item.get('/Title', 'Untitled'),
+                    'level': level
+                })
+            except Exception:
+                continue
+
+    return items
+
+
+# Motores em ordem de preferência (mais rápido primeiro)
+BACKENDS = {
+    backend.name: backend
+    for backend in (PyMuPDFBackend(), PyPDFBackend(), PdfPlumberBackend())
+}
+
+
+def get_backends(preferred: Optional[str] = None) -> List[PdfBackend]:
+    """
+    Retorna os motores instalados, do preferido/mais rápido ao mais lento
+
+    Args:
+        preferred: Nome do motor a tentar primeiro ('pymupdf', 'pypdf', 'pdfplumber')
+
+    Returns:
+        list: Motores disponíveis em ordem de tentativa
+    """
+    ordered = list(BACKENDS.values())
+    if preferred in BACKENDS:
+        ordered.remove(BACKENDS[preferred])
+        ordered.insert(0, BACKENDS[preferred])
+
+    return [backend for backend in ordered if backend.available()]
@@ -1,22 +1,152 @@
 """
 Módulo para leitura de arquivos PDF
+Usa o motor mais rápido instalado (PyMuPDF, pypdf ou pdfplumber) e recorre
+ao próximo motor, por arquivo, quando a leitura falha
 """
 
-try:
-    from pypdf import PdfReader
-except ImportError:
+import os
+import sys
+import time
+
+from .pdf_backends import BACKENDS, get_backends, _parse_pypdf_outline as _parse_outline
+
+
+# Número de páginas a partir do qual a extração é dividida entre processos
+PARALLEL_PAGE_THRESHOLD = 1000
+
+# Páginas mínimas por tarefa enviada a cada processo
+MIN_PAGES_PER_TASK = 50
+
+
+def _require_backends(preferred=None):
+    """Retorna os motores disponíveis ou levanta erro se nenhum estiver instalado"""
+    backends = get_backends(preferred)
+    if not backends:
+        raise Exception(
+            "Nenhuma biblioteca de PDF instalada. "
+            "Instale com: pip install PyMuPDF pypdf"
+        )
+    return backends
+
+
+def _with_fallback(file_path, action, backend=None):
+    """
+    Executa `action(motor, doc)` com o primeiro motor que conseguir ler o arquivo
+
+    Args:
+        file_path: Caminho do arquivo PDF
+        action: Função que recebe (motor, documento aberto)
+        backend: Motor preferido (opcional)
+
+    Returns:
+        Resultado de `action`
+
+    Raises:
+        Exception: Erro do último motor, se todos falharem
+    """
+    last_error = None
+
+    for engine in _require_backends(backend):
+        try:
+            doc = engine.open(file_path)
+        except Exception as e:
+            last_error = e
+            continue
+
+        try:
+            return action(engine, doc)
+        except Exception as e:
+            last_error = e
+            continue
+        finally:
+            try:
+                engine.close(doc)
+            except Exception:
+                pass
+
+    raise last_error
+
+
+def _extract_page_text(engine, doc, page_index):
+    """
+    Extrai o texto de uma página com o marcador de página
+
+    Returns:
+        str: Texto formatado ou None se a página estiver vazia
+    """
+    page_num = page_index + 1
     try:
-        from PyPDF2 import PdfReader
-    except ImportError:
-        PdfReader = None
+        text = engine.page_text(doc, page_index)
+        if text.strip():
+            # Adiciona separador de página para contexto
+            return f"--- Página {page_num} ---\n{text}"
+    except Exception as e:
+        # Se falhar em uma página, continua com as outras
+        return f"--- Página {page_num} ---\n[Erro ao extrair texto: {str(e)}]"
+    return None
+
+
+def _extract_page_range(file_path, start, end, backend_name):
+    """Extrai as páginas [start, end) de um PDF (executado em um worker)"""
+    engine = BACKENDS[backend_name]
+    doc = engine.open(file_path)
+    try:
+        return [_extract_page_text(engine, doc, i) for i in range(start, end)]
+    finally:
+        engine.close(doc)
+
+
+def _extract_pages_parallel(file_path, total_pages, backend_name, page_workers=None):
+    """
+    Divide as páginas do PDF em faixas e extrai cada faixa em um processo
+
+    Returns:
+        list: Textos das páginas na ordem original
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = page_workers or os.cpu_count() or 1
+    # Mais faixas que processos para equilibrar páginas de custo desigual
+    task_size = max(MIN_PAGES_PER_TASK, -(-total_pages // (workers * 4)))
+    ranges = [(start, min(start + task_size, total_pages))
+              for start in range(0, total_pages, task_size)]
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as pool:
+        futures = [pool.submit(_extract_page_range, file_path, start, end, backend_name)
+                   for start, end in ranges]
+        page_texts = []
+        for future in futures:
+            page_texts.extend(future.result())
+
+    return page_texts
 
 
-def read_pdf_file(file_path):
+def _extract_text(engine, doc, file_path, parallel_threshold, page_workers):
+    """Extrai o texto de todas as páginas de um PDF já aberto"""
+    total_pages = engine.page_count(doc)
+
+    if parallel_threshold and total_pages > parallel_threshold and page_workers != 1:
+        page_texts = _extract_pages_parallel(file_path, total_pages, engine.name, page_workers)
+    else:
+        page_texts = [_extract_page_text(engine, doc, i) for i in range(total_pages)]
+
+    content = "\n\n".join(text for text in page_texts if text is not None)
+    return content.strip()
+
+
+def read_pdf_file(file_path, parallel_threshold=PARALLEL_PAGE_THRESHOLD, page_workers=None,
+                  backend=None):
     """
     Lê o conteúdo de um arquivo PDF
 
     Args:
         file_path: Caminho do arquivo PDF
+        parallel_threshold: Acima deste número de páginas, divide a extração
+            entre processos (None ou 0 = sempre sequencial)
+        page_workers: Número de processos para a extração por páginas
+            (padrão: número de CPUs)
+        backend: Motor preferido ('pymupdf', 'pypdf', 'pdfplumber');
+            padrão: o mais rápido instalado
 
     Returns:
         str: Conteúdo extraído do PDF
@@ -24,132 +154,183 @@ def read_pdf_file(file_path):
     Raises:
         Exception: Se houver erro na leitura do arquivo
     """
-    if PdfReader is None:
-        raise Exception(
-            "Biblioteca PyPDF não instalada. "
-            "Instale com: pip install pypdf"
+    try:
+        return _with_fallback(
+            file_path,
+            lambda engine, doc: _extract_text(engine, doc, file_path,
+                                              parallel_threshold, page_workers),
+            backend
         )
+    except Exception as e:
+        raise Exception(f"Erro ao ler PDF: {str(e)}")
 
-    try:
-        reader = PdfReader(file_path)
 
-        # Extrai texto de todas as páginas
-        text_parts = []
+def read_pdf_document(file_path, parallel_threshold=PARALLEL_PAGE_THRESHOLD, page_workers=None,
+                      backend=None):
+    """
+    Abre o PDF uma única vez e extrai texto, páginas, metadados e outline
 
-        for page_num, page in enumerate(reader.pages, 1):
-            try:
-                text = page.extract_text()
-                if text.strip():
-                    # Adiciona separador de página para contexto
-                    text_parts.append(f"--- Página {page_num} ---\n{text}")
-            except Exception as e:
-                # Se falhar em uma página, continua com as outras
-                text_parts.append(f"--- Página {page_num} ---\n[Erro ao extrair texto: {str(e)}]")
+    Args:
+        file_path: Caminho do arquivo PDF
+        parallel_threshold: Ver read_pdf_file
+        page_workers: Ver read_pdf_file
+        backend: Motor preferido (opcional)
+
+    Returns:
+        dict: content, pages, metadata e outline
+
+    Raises:
+        Exception: Se houver erro na leitura do arquivo
+    """
+    def read_all(engine, doc):
+        content = _extract_text(engine, doc, file_path, parallel_threshold, page_workers)
+
+        try:
+            metadata = engine.metadata(doc)
+        except Exception:
+            metadata = {}
+
+        # Tenta extrair outline/bookmarks se existirem
+        try:
+            outline = engine.outline(doc)
+        except Exception:
+            outline = []
 
-        content = "\n\n".join(text_parts)
-        return content.strip()
+        return {
+            'content': content,
+            'pages': engine.page_count(doc),
+            'metadata': metadata,
+            'outline': outline
+        }
 
+    try:
+        return _with_fallback(file_path, read_all, backend)
     except Exception as e:
         raise Exception(f"Erro ao ler PDF: {str(e)}")
 
 
-def read_pdf_file_with_metadata(file_path):
+def read_pdf_file_with_metadata(file_path, backend=None):
     """
     Lê arquivo PDF e retorna conteúdo com metadados detalhados
 
     Args:
         file_path: Caminho do arquivo PDF
+        backend: Motor preferido (opcional)
 
     Returns:
         dict: Dicionário com conteúdo e metadados
     """
-    if PdfReader is None:
-        raise Exception("Biblioteca PyPDF não instalada")
-
     try:
-        reader = PdfReader(file_path)
-        content = read_pdf_file(file_path)
-
-        # Extrai metadados do PDF
-        metadata = reader.metadata if reader.metadata else {}
+        pdf = read_pdf_document(file_path, backend=backend)
+        content = pdf['content']
 
         return {
             'content': content,
-            'pages': len(reader.pages),
+            'pages': pdf['pages'],
             'characters': len(content),
             'words': len(content.split()),
-            'metadata': {
-                'title': metadata.get('/Title', ''),
-                'author': metadata.get('/Author', ''),
-                'subject': metadata.get('/Subject', ''),
-                'creator': metadata.get('/Creator', ''),
-                'producer': metadata.get('/Producer', ''),
-                'creation_date': str(metadata.get('/CreationDate', '')),
-                'modification_date': str(metadata.get('/ModDate', ''))
-            }
+            'metadata': pdf['metadata']
         }
 
     except Exception as e:
         raise Exception(f"Erro ao processar PDF: {str(e)}")
 
 
-def extract_pdf_structure(file_path):
+def extract_pdf_structure(file_path, backend=None):
     """
     Extrai estrutura do PDF (útil para PDFs com índices/capítulos)
 
+    Não extrai o texto; se o texto também for necessário, use
+    read_pdf_document para abrir o arquivo uma única vez.
+
     Args:
         file_path: Caminho do arquivo PDF
+        backend: Motor preferido (opcional)
 
     Returns:
         dict: Estrutura do documento
     """
-    if PdfReader is None:
-        raise Exception("Biblioteca PyPDF não instalada")
-
-    try:
-        reader = PdfReader(file_path)
-
+    def read_structure(engine, doc):
         structure = {
-            'pages': len(reader.pages),
+            'pages': engine.page_count(doc),
             'outline': []
         }
 
         # Tenta extrair outline/bookmarks se existirem
-        if hasattr(reader, 'outline') and reader.outline:
-            try:
-                structure['outline'] = _parse_outline(reader.outline)
-            except Exception:
-                pass
+        try:
+            structure['outline'] = engine.outline(doc)
+        except Exception:
+            pass
 
         return structure
 
+    try:
+        return _with_fallback(file_path, read_structure, backend)
     except Exception as e:
         raise Exception(f"Erro ao extrair estrutura do PDF: {str(e)}")
 
 
-def _parse_outline(outline, level=0):
+def benchmark_backends(folder_path, max_files=None):
     """
-    Parser recursivo para outline do PDF
+    Mede a velocidade de extração de texto (páginas/s) de cada motor instalado
 
     Args:
-        outline: Objeto outline do PyPDF
-        level: Nível de profundidade
+        folder_path: Pasta com PDFs de amostra (busca recursiva)
+        max_files: Limite de arquivos a usar (opcional)
 
     Returns:
-        list: Lista de itens do outline
+        dict: {motor: {'files', 'pages', 'seconds', 'pages_per_sec', 'errors'}}
     """
-    items = []
-
-    for item in outline:
-        if isinstance(item, list):
-            items.extend(_parse_outline(item, level + 1))
-        else:
+    pdf_files = []
+    for current_dir, _, filenames in os.walk(folder_path):
+        pdf_files.extend(os.path.join(current_dir, name)
+                         for name in sorted(filenames) if name.lower().endswith('.pdf'))
+    pdf_files.sort()
+    if max_files:
+        pdf_files = pdf_files[:max_files]
+
+    results = {}
+    for engine in get_backends():
+        pages = 0
+        errors = 0
+        start = time.perf_counter()
+
+        for file_path in pdf_files:
             try:
-                items.append({
-                    'title': item.get('/Title', 'Untitled'),
-                    'level': level
-                })
+                doc = engine.open(file_path)
+                try:
+                    total = engine.page_count(doc)
+                    for i in range(total):
+                        engine.page_text(doc, i)
+                    pages += total
+                finally:
+                    engine.close(doc)
             except Exception:
-                continue
+                errors += 1
+
+        seconds = time.perf_counter() - start
+        results[engine.name] = {
+            'files': len(pdf_files) - errors,
+            'pages': pages,
+            'seconds': round(seconds, 3),
+            'pages_per_sec': round(pages / seconds, 1) if seconds > 0 else 0.0,
+            'errors': errors
+        }
+
+    return results
+
+
+if __name__ == '__main__':
+    # Uso: python -m modules.pdf_reader <pasta_com_pdfs> [max_arquivos]
+    if len(sys.argv) < 2:
+        print("Uso: python -m modules.pdf_reader <pasta_com_pdfs> [max_arquivos]")
+        sys.exit(1)
+
+    folder = sys.argv[1]
+    limit = int(sys.argv[2]) if len(sys.argv) > 2 else None
 
-    return items
+    print(f"⏱ Benchmark de motores PDF em: {folder}")
+    for name, stats in benchmark_backends(folder, limit).items():
+        print(f"   • {name:<11} {stats['pages_per_sec']:>9.1f} páginas/s "
+              f"({stats['pages']} páginas em {stats['seconds']:.2f}s, "
+              f"{stats['files']} arquivos, {stats['errors']} erros)")
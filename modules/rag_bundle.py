@@ -0,0 +1,282 @@
+"""
+Pacote RAG em disco
+Guarda o índice FAISS, a matriz de embeddings (.npy, float32 ou float16),
+o índice BM25 e uma tabela compacta dos chunks em um diretório que é aberto
+com memory-map, sem carregar os embeddings nem os textos em memória
+"""
+
+import os
+import json
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+from .document_structure import SECTION_NAMES
+from .bm25 import BM25Index
+
+
+BUNDLE_FORMAT = 'rag-bundle'
+BUNDLE_VERSION = 1
+
+MANIFEST_FILE = 'manifest.json'
+EMBEDDINGS_FILE = 'embeddings.npy'
+FAISS_FILE = 'index.faiss'
+CHUNKS_FILE = 'chunks.npy'
+TEXT_FILE = 'chunk_text.bin'
+TEXT_OFFSETS_FILE = 'chunk_text_offsets.npy'
+DOCUMENTS_FILE = 'documents.json'
+BM25_DIR = 'bm25'
+
+EMBEDDING_DTYPES = ('float32', 'float16')
+
+# Uma linha por chunk; textos e metadados dos documentos ficam em arquivos à parte
+CHUNK_DTYPE = np.dtype([
+    ('doc', np.int32),  # Linha na tabela de documentos
+    ('doc_index', np.int32),  # Índice do documento na lista original (chunk_to_doc_map)
+    ('chunk_id', np.int32),
+    ('start_word', np.int32),
+    ('end_word', np.int32),
+    ('located', np.bool_),  # Chunk anotado com seção e página
+    ('section', np.int8),  # Índice em SECTION_NAMES (-1 = nenhuma)
+    ('page', np.int32),  # -1 = nenhuma
+])
+
+
+class ChunkTable:
+    """
+    Chunks de um pacote, lidos sob demanda
+
+    Funciona como uma lista somente leitura: table[i] monta o dicionário do
+    chunk (mesmo formato de prepare_rag_dataset) a partir dos arrays
+    mapeados em memória.
+    """
+
+    def __init__(
+        self,
+        rows: np.ndarray,
+        text_offsets: np.ndarray,
+        text_blob: Any,
+        documents: List[Dict[str, Any]]
+    ):
+        """
+        Args:
+            rows: Array estruturado (CHUNK_DTYPE)
+            text_offsets: Offsets (bytes) do texto de cada chunk em text_blob (n + 1)
+            text_blob: Textos concatenados em UTF-8
+            documents: Metadados de cada documento
+        """
+        self.rows = rows
+        self.text_offsets = text_offsets
+        self.text_blob = text_blob
+        self.documents = documents
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, i: int) -> Dict[str, Any]:
+        if i < 0:
+            i += len(self.rows)
+        if not 0 <= i < len(self.rows):
+            raise IndexError(i)
+
+        row = self.rows[i]
+        chunk = {
+            'text': self.text(i),
+            'chunk_id': int(row['chunk_id']),
+            'start_word': int(row['start_word']),
+            'end_word': int(row['end_word']),
+            'metadata': self.documents[row['doc']]
+        }
+        if row['located']:
+            chunk['section'] = SECTION_NAMES[row['section']] if row['section'] >= 0 else None
+            chunk['page'] = int(row['page']) if row['page'] >= 0 else None
+        chunk['global_chunk_id'] = i
+        return chunk
+
+    def __iter__(self):
+        for i in range(len(self.rows)):
+            yield self[i]
+
+    def text(self, i: int) -> str:
+        """Texto do chunk i"""
+        start, end = int(self.text_offsets[i]), int(self.text_offsets[i + 1])
+        return bytes(self.text_blob[start:end]).decode('utf-8')
+
+
+def save_rag_bundle(
+    path: str,
+    chunks: List[Dict[str, Any]],
+    chunk_to_doc_map: List[int],
+    embeddings: Optional[np.ndarray] = None,
+    faiss_index: Optional[Any] = None,
+    config: Optional[Dict[str, Any]] = None,
+    statistics: Optional[Dict[str, Any]] = None,
+    embedding_dtype: str = 'float32',
+    bm25_index: Optional[BM25Index] = None
+) -> Dict[str, Any]:
+    """
+    Grava o pacote RAG em um diretório
+
+    O manifesto é gravado por último: um diretório sem manifesto é uma
+    gravação incompleta.
+
+    Args:
+        path: Diretório do pacote (criado se não existir)
+        chunks: Chunks de prepare_rag_dataset
+        chunk_to_doc_map: Documento de origem de cada chunk
+        embeddings: Matriz (n_chunks, dimensão) ou None
+        faiss_index: Índice FAISS ou None
+        config: Configuração do dataset
+        statistics: Estatísticas do dataset
+        embedding_dtype: 'float32' ou 'float16' (tipo da matriz gravada)
+        bm25_index: Índice BM25 dos chunks ou None
+
+    Returns:
+        dict: Manifesto gravado
+    """
+    if embedding_dtype not in EMBEDDING_DTYPES:
+        raise ValueError(f"Tipo de embedding não suportado: {embedding_dtype}")
+
+    os.makedirs(path, exist_ok=True)
+    manifest_path = os.path.join(path, MANIFEST_FILE)
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+
+    # Tabela de documentos: os chunks de um documento compartilham os metadados
+    document_rows: Dict[int, int] = {}
+    documents = []
+    rows = np.zeros(len(chunks), dtype=CHUNK_DTYPE)
+    text_offsets = np.zeros(len(chunks) + 1, dtype=np.int64)
+    section_codes = {name: code for code, name in enumerate(SECTION_NAMES)}
+
+    with open(os.path.join(path, TEXT_FILE), 'wb') as f:
+        for i, (chunk, doc_index) in enumerate(zip(chunks, chunk_to_doc_map)):
+            if doc_index not in document_rows:
+                document_rows[doc_index] = len(documents)
+                documents.append(chunk.get('metadata', {}))
+
+            located = 'section' in chunk or 'page' in chunk
+            rows[i] = (
+                document_rows[doc_index],
+                doc_index,
+                chunk.get('chunk_id', 0),
+                chunk.get('start_word', 0),
+                chunk.get('end_word', 0),
+                located,
+                section_codes.get(chunk.get('section'), -1),
+                chunk['page'] if located and chunk.get('page') is not None else -1
+            )
+
+            data = chunk['text'].encode('utf-8')
+            f.write(data)
+            text_offsets[i + 1] = text_offsets[i] + len(data)
+
+    np.save(os.path.join(path, CHUNKS_FILE), rows)
+    np.save(os.path.join(path, TEXT_OFFSETS_FILE), text_offsets)
+    with open(os.path.join(path, DOCUMENTS_FILE), 'w', encoding='utf-8') as f:
+        json.dump(documents, f, ensure_ascii=False, default=str)
+
+    embeddings_info = None
+    if embeddings is not None:
+        matrix = np.ascontiguousarray(embeddings, dtype=embedding_dtype)
+        np.save(os.path.join(path, EMBEDDINGS_FILE), matrix)
+        embeddings_info = {'file': EMBEDDINGS_FILE, 'dtype': embedding_dtype, 'shape': list(matrix.shape)}
+
+    faiss_file = None
+    if faiss_index is not None:
+        try:
+            import faiss
+            faiss.write_index(faiss_index, os.path.join(path, FAISS_FILE))
+            faiss_file = FAISS_FILE
+        except Exception as e:
+            print(f"⚠ Erro ao gravar índice FAISS: {str(e)}")
+
+    bm25_dir = None
+    if bm25_index is not None:
+        bm25_index.save(os.path.join(path, BM25_DIR))
+        bm25_dir = BM25_DIR
+
+    manifest = {
+        'format': BUNDLE_FORMAT,
+        'version': BUNDLE_VERSION,
+        'total_chunks': len(chunks),
+        'total_documents_indexed': len(documents),
+        'embeddings': embeddings_info,
+        'faiss_index': faiss_file,
+        'bm25_index': bm25_dir,
+        'config': config or {},
+        'statistics': {key: (value.item() if isinstance(value, np.generic) else value)
+                       for key, value in (statistics or {}).items()}
+    }
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, default=str)
+
+    return manifest
+
+
+def load_rag_bundle(path: str, mmap: bool = True) -> Dict[str, Any]:
+    """
+    Abre um pacote RAG gravado por save_rag_bundle
+
+    Args:
+        path: Diretório do pacote
+        mmap: Se True, embeddings, tabela e textos dos chunks ficam mapeados
+            em memória (lidos do disco sob demanda)
+
+    Returns:
+        dict: manifest, chunks (ChunkTable), chunk_to_doc_map (array),
+            embeddings (array ou None), faiss_index (ou None) e
+            bm25_index (BM25Index ou None)
+    """
+    manifest_path = os.path.join(path, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        raise FileNotFoundError(f"Pacote RAG incompleto ou inexistente: {path}")
+
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('format') != BUNDLE_FORMAT or manifest.get('version', 0) > BUNDLE_VERSION:
+        raise ValueError(f"Formato de pacote RAG não suportado: {manifest.get('format')} v{manifest.get('version')}")
+
+    mmap_mode = 'r' if mmap else None
+    rows = np.load(os.path.join(path, CHUNKS_FILE), mmap_mode=mmap_mode)
+    text_offsets = np.load(os.path.join(path, TEXT_OFFSETS_FILE), mmap_mode=mmap_mode)
+    with open(os.path.join(path, DOCUMENTS_FILE), 'r', encoding='utf-8') as f:
+        documents = json.load(f)
+
+    text_path = os.path.join(path, TEXT_FILE)
+    if not os.path.getsize(text_path):
+        text_blob = b''
+    elif mmap:
+        text_blob = np.memmap(text_path, dtype=np.uint8, mode='r')
+    else:
+        with open(text_path, 'rb') as f:
+            text_blob = f.read()
+
+    embeddings = None
+    if manifest.get('embeddings'):
+        embeddings = np.load(os.path.join(path, manifest['embeddings']['file']), mmap_mode=mmap_mode)
+
+    faiss_index = None
+    if manifest.get('faiss_index'):
+        try:
+            import faiss
+            index_path = os.path.join(path, manifest['faiss_index'])
+            try:
+                faiss_index = faiss.read_index(index_path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+            except Exception:
+                faiss_index = faiss.read_index(index_path)
+        except ImportError:
+            print("⚠ FAISS não instalado. Índice do pacote RAG não carregado.")
+
+    bm25_index = None
+    if manifest.get('bm25_index'):
+        bm25_index = BM25Index.load(os.path.join(path, manifest['bm25_index']), mmap=mmap)
+
+    return {
+        'manifest': manifest,
+        'chunks': ChunkTable(rows, text_offsets, text_blob, documents),
+        'chunk_to_doc_map': rows['doc_index'],
+        'embeddings': embeddings,
+        'faiss_index': faiss_index,
+        'bm25_index': bm25_index
+    }
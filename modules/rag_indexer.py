@@ -4,11 +4,21 @@ Prepara os dados para Recuperação Aumentada por Geração (Retrieval-Augmented
 """
 
 import json
+import time
+import itertools
 import numpy as np
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 import warnings
 warnings.filterwarnings('ignore')
 
+from .model_registry import get_model_registry, DEFAULT_EMBEDDING_MODEL
+from .document_structure import locate_offsets
+from .analysis_context import AnalysisContext, WORD_PATTERN
+from .rag_bundle import save_rag_bundle, load_rag_bundle, ChunkTable
+from .rag_search import ChunkFilterIndex, exact_search, chunk_documents, fuse_rankings, FUSION_METHODS, RRF_K
+from .bm25 import BM25Index, BM25_DEFAULTS
+
 
 class RAGIndexer:
     """
@@ -29,25 +39,41 @@ class RAGIndexer:
         self.initialized = False
         self.use_embeddings = False
 
+        # Último dataset preparado (ou pacote carregado): usado por save()
+        self.chunks = None
+        self.chunk_to_doc_map = None
+        self.embeddings = None
+        self.dataset_config = None
+        self.statistics = None
+        self._filter_index = None
+        self.bm25_index = None
+
     def initialize_model(self):
-        """Inicializa modelo de embeddings"""
+        """Obtém o modelo de embeddings do registro compartilhado"""
         if self.initialized:
             return
 
         try:
-            from sentence_transformers import SentenceTransformer
-
-            print(f"Carregando modelo de embeddings: {self.embedding_model_name}")
-            self.model = SentenceTransformer(self.embedding_model_name)
-            self.use_embeddings = True
-            print("✓ Modelo de embeddings carregado com sucesso")
-
+            import sentence_transformers  # noqa: F401
         except ImportError:
             print("⚠ sentence-transformers não instalado. Indexação sem embeddings.")
             self.use_embeddings = False
-        except Exception as e:
-            print(f"⚠ Erro ao carregar modelo: {str(e)}")
-            self.use_embeddings = False
+            self.initialized = True
+            return
+
+        registry = get_model_registry()
+        already_loaded = registry.is_loaded('embedding', self.embedding_model_name)
+
+        if not already_loaded:
+            print(f"Carregando modelo de embeddings: {self.embedding_model_name}")
+        self.model = registry.get_embedder(self.embedding_model_name)
+        self.use_embeddings = self.model is not None
+
+        if not already_loaded:
+            if self.use_embeddings:
+                print("✓ Modelo de embeddings carregado com sucesso")
+            else:
+                print("⚠ Erro ao carregar modelo de embeddings. Indexação sem embeddings.")
 
         self.initialized = True
 
@@ -56,7 +82,8 @@ class RAGIndexer:
         text: str,
         chunk_size: int = 512,
         overlap: int = 50,
-        metadata: Optional[Dict] = None
+        metadata: Optional[Dict] = None,
+        context: Optional[AnalysisContext] = None
     ) -> List[Dict[str, Any]]:
         """
         Divide texto em chunks sobrepostos para RAG
@@ -66,11 +93,12 @@ class RAGIndexer:
             chunk_size: Tamanho máximo de cada chunk (em tokens/palavras)
             overlap: Sobreposição entre chunks
             metadata: Metadados a adicionar a cada chunk
+            context: Contexto de análise de `text` (reaproveita as palavras)
 
         Returns:
             Lista de chunks com metadados
         """
-        words = text.split()
+        words = context.words if context is not None else text.split()
         chunks = []
 
         if len(words) <= chunk_size:
@@ -106,6 +134,123 @@ class RAGIndexer:
 
         return chunks
 
+    def annotate_chunks(
+        self,
+        chunks: List[Dict[str, Any]],
+        text: str,
+        structure: Dict[str, Any]
+    ):
+        """
+        Acrescenta a cada chunk a seção ('section') e a página ('page') do seu início
+
+        Só os offsets das palavras que iniciam chunks são guardados; as
+        demais palavras são percorridas sem montar a lista de spans.
+
+        Args:
+            chunks: Chunks de create_chunks sobre `text`
+            text: Texto dividido
+            structure: Estrutura do texto (ver segment_document)
+        """
+        if not (structure.get('sections') or structure.get('pages')):
+            return
+
+        # Offset de cada palavra (de text.split()) que inicia um chunk
+        starts = {}
+        words = WORD_PATTERN.finditer(text)
+        position = 0
+        for start_word in sorted({chunk['start_word'] for chunk in chunks}):
+            match = next(itertools.islice(words, start_word - position, None), None)
+            if match is None:
+                break
+            starts[start_word] = match.start()
+            position = start_word + 1
+
+        offsets = [starts.get(chunk['start_word'], 0) for chunk in chunks]
+        for chunk, location in zip(chunks, locate_offsets(structure, offsets)):
+            chunk['section'] = location['section']
+            chunk['page'] = location['page']
+
+    def create_chunks_from_windows(
+        self,
+        windows: Iterable[str],
+        chunk_size: int = 512,
+        overlap: int = 50,
+        metadata: Optional[Dict] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Divide um texto recebido em janelas (ex.: iter_txt_windows) em chunks
+
+        Produz os mesmos chunks de create_chunks sobre o texto concatenado,
+        mantendo em memória apenas as palavras do chunk em construção.
+        Palavras cortadas no fim de uma janela são completadas pela próxima.
+
+        Args:
+            windows: Iterável de trechos consecutivos do texto
+            chunk_size: Tamanho máximo de cada chunk (em palavras)
+            overlap: Sobreposição entre chunks
+            metadata: Metadados a adicionar a cada chunk
+
+        Yields:
+            Chunks no formato de create_chunks
+        """
+        step = chunk_size - overlap
+        buffer: List[str] = []  # palavras a partir de buffer_start
+        buffer_start = 0
+        next_start = 0
+        chunk_id = 0
+        partial = ''
+
+        def make_chunk(start, end):
+            return {
+                'text': ' '.join(buffer[start - buffer_start:end - buffer_start]),
+                'chunk_id': chunk_id,
+                'start_word': start,
+                'end_word': end,
+                'metadata': metadata or {}
+            }
+
+        for window in windows:
+            if not window:
+                continue
+            window = partial + window
+            words = window.split()
+            # Última palavra pode continuar na próxima janela
+            if words and not window[-1].isspace():
+                partial = words.pop()
+            else:
+                partial = ''
+            buffer.extend(words)
+
+            # Emite os chunks completos; o primeiro só sai quando já se sabe
+            # que o texto tem mais de chunk_size palavras
+            while buffer_start + len(buffer) >= next_start + chunk_size + (1 if chunk_id == 0 else 0):
+                yield make_chunk(next_start, next_start + chunk_size)
+                chunk_id += 1
+                next_start += step
+                drop = min(next_start - buffer_start, len(buffer))
+                del buffer[:drop]
+                buffer_start += drop
+
+        if partial:
+            buffer.append(partial)
+        total_words = buffer_start + len(buffer)
+
+        if chunk_id == 0 and total_words <= chunk_size:
+            # Texto pequeno: um único chunk
+            yield {
+                'text': ' '.join(buffer),
+                'chunk_id': 0,
+                'start_word': 0,
+                'end_word': total_words,
+                'metadata': metadata or {}
+            }
+            return
+
+        while next_start < total_words:
+            yield make_chunk(next_start, min(next_start + chunk_size, total_words))
+            chunk_id += 1
+            next_start += step
+
     def create_embeddings(self, texts: List[str]) -> Optional[np.ndarray]:
         """
         Cria embeddings vetoriais para lista de textos
@@ -166,7 +311,10 @@ class RAGIndexer:
         documents: List[Dict[str, Any]],
         chunk_size: int = 512,
         overlap: int = 50,
-        create_embeddings: bool = True
+        create_embeddings: bool = True,
+        bundle_path: Optional[str] = None,
+        embedding_dtype: str = 'float32',
+        bm25_config: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Prepara dataset completo para RAG
@@ -176,9 +324,12 @@ class RAGIndexer:
             chunk_size: Tamanho dos chunks
             overlap: Sobreposição entre chunks
             create_embeddings: Se True, cria embeddings
+            bundle_path: Se informado, grava o pacote RAG neste diretório (ver save)
+            embedding_dtype: Tipo dos embeddings no pacote ('float32' ou 'float16')
+            bm25_config: Índice BM25 dos chunks (ver BM25_DEFAULTS); None = padrão
 
         Returns:
-            Dataset preparado para RAG
+            Dataset preparado para RAG ('embeddings' é a matriz numpy, não uma lista)
         """
         print("\n🔄 Preparando dataset para RAG...")
 
@@ -187,6 +338,10 @@ class RAGIndexer:
 
         # Processa cada documento
         for doc_idx, doc in enumerate(documents):
+            # Quase duplicatas não geram chunks: a busca devolve o canônico
+            if doc.get('near_duplicate_of'):
+                continue
+
             doc_id = doc.get('id', f'doc_{doc_idx}')
             content = doc.get('content', '')
 
@@ -197,12 +352,18 @@ class RAGIndexer:
                 'type': doc.get('type', ''),
                 'relative_path': doc.get('relative_path', '')
             }
+            if doc.get('near_duplicates'):
+                metadata['near_duplicates'] = doc['near_duplicates']
 
             # Se houver dados de NLP, adiciona aos metadados
             if 'nlp_analysis' in doc:
                 nlp = doc['nlp_analysis']
                 metadata['has_entities'] = len(nlp.get('entidades', {})) > 0
                 metadata['has_summary'] = 'summary' in nlp.get('sumarizacao', {})
+                classification = nlp.get('classificacao', {})
+                if classification:
+                    metadata['tipo_documento'] = classification.get('tipo_documento')
+                    metadata['area_direito'] = classification.get('area_direito', [])
 
             # Cria chunks do documento
             doc_chunks = self.create_chunks(
@@ -211,6 +372,8 @@ class RAGIndexer:
                 overlap=overlap,
                 metadata=metadata
             )
+            if doc.get('structure'):
+                self.annotate_chunks(doc_chunks, content, doc['structure'])
 
             # Adiciona chunks e mapeia para o documento original
             for chunk in doc_chunks:
@@ -224,26 +387,25 @@ class RAGIndexer:
         embeddings = None
         faiss_index = None
 
+        if create_embeddings and not self.initialized:
+            self.initialize_model()
+
         if create_embeddings and self.use_embeddings:
             print("\n🔄 Criando embeddings...")
             chunk_texts = [chunk['text'] for chunk in all_chunks]
             embeddings = self.create_embeddings(chunk_texts)
 
             if embeddings is not None:
-                # Salva embeddings como lista para JSON
-                embeddings_list = embeddings.tolist()
-
                 # Cria índice FAISS
                 faiss_index = self.create_faiss_index(embeddings)
         else:
             print("⚠ Embeddings não criados (modelo não disponível ou desabilitado)")
-            embeddings_list = None
 
         # Monta estrutura final
         rag_dataset = {
             'chunks': all_chunks,
             'chunk_to_doc_map': chunk_to_doc_map,
-            'embeddings': embeddings_list,
+            'embeddings': embeddings,
             'config': {
                 'chunk_size': chunk_size,
                 'overlap': overlap,
@@ -261,35 +423,438 @@ class RAGIndexer:
             'total_chunks': len(all_chunks)
         }
 
+        self.chunks = all_chunks
+        self.chunk_to_doc_map = chunk_to_doc_map
+        self.embeddings = embeddings
+        self.index = faiss_index
+        self.dataset_config = rag_dataset['config']
+        self.statistics = rag_dataset['statistics']
+        self._filter_index = None
+
+        bm25_config = {**BM25_DEFAULTS, **(bm25_config or {})}
+        self.bm25_index = None
+        if bm25_config['enabled'] and all_chunks:
+            self.create_bm25_index(
+                k1=bm25_config['k1'],
+                b=bm25_config['b'],
+                positions=bm25_config['positions']
+            )
+
+        if bundle_path:
+            self.save(bundle_path, embedding_dtype)
+            rag_dataset['bundle_path'] = bundle_path
+
         print("✓ Dataset RAG preparado com sucesso")
 
         return rag_dataset
 
-    def create_inverted_index(self, documents: List[Dict[str, Any]]) -> Dict[str, List[int]]:
+    def save(self, path: str, embedding_dtype: str = 'float32') -> Dict[str, Any]:
         """
-        Cria índice invertido para busca por palavras-chave
+        Grava o dataset preparado como pacote RAG (ver rag_bundle)
+
+        O diretório recebe o índice FAISS, a matriz de embeddings (.npy,
+        aberta depois com memory-map), o índice BM25 e a tabela compacta
+        dos chunks.
 
         Args:
-            documents: Lista de documentos
+            path: Diretório do pacote
+            embedding_dtype: 'float32' ou 'float16'
 
         Returns:
-            Índice invertido {palavra: [doc_ids]}
+            dict: Manifesto do pacote
+        """
+        if self.chunks is None:
+            raise ValueError("Nenhum dataset preparado: chame prepare_rag_dataset antes de save")
+
+        manifest = save_rag_bundle(
+            path,
+            self.chunks,
+            self.chunk_to_doc_map,
+            embeddings=self.embeddings,
+            faiss_index=self.index,
+            config=self.dataset_config,
+            statistics=self.statistics,
+            embedding_dtype=embedding_dtype,
+            bm25_index=self.bm25_index
+        )
+        print(f"✓ Pacote RAG gravado em {path} ({manifest['total_chunks']} chunks)")
+        return manifest
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> 'RAGIndexer':
         """
-        inverted_index = {}
+        Abre um pacote RAG gravado por save
 
-        for doc_idx, doc in enumerate(documents):
-            content = doc.get('content', '').lower()
-            words = set(content.split())
-
-            for word in words:
-                # Remove pontuação
-                word = ''.join(c for c in word if c.isalnum())
-                if len(word) > 3:  # Ignora palavras muito curtas
-                    if word not in inverted_index:
-                        inverted_index[word] = []
-                    inverted_index[word].append(doc_idx)
-
-        return inverted_index
+        Embeddings, textos, tabela dos chunks e listas BM25 são mapeados em
+        memória; o modelo de embeddings só é carregado quando for usado.
+
+        Args:
+            path: Diretório do pacote
+            mmap: Se False, lê os arrays inteiros para a memória
+
+        Returns:
+            RAGIndexer com chunks (ChunkTable), embeddings e índice do pacote
+        """
+        bundle = load_rag_bundle(path, mmap=mmap)
+        config = bundle['manifest'].get('config', {})
+
+        indexer = cls(embedding_model=config.get('embedding_model') or DEFAULT_EMBEDDING_MODEL)
+        indexer.chunks = bundle['chunks']
+        indexer.chunk_to_doc_map = bundle['chunk_to_doc_map']
+        indexer.embeddings = bundle['embeddings']
+        indexer.index = bundle['faiss_index']
+        indexer.bm25_index = bundle['bm25_index']
+        indexer.dataset_config = config
+        indexer.statistics = bundle['manifest'].get('statistics', {})
+        return indexer
+
+    def filter_index(self) -> ChunkFilterIndex:
+        """Índice dos chunks por metadados dos documentos (criado na primeira busca filtrada)"""
+        if self._filter_index is None:
+            if isinstance(self.chunks, ChunkTable):
+                chunk_docs, documents = self.chunks.rows['doc'], self.chunks.documents
+            else:
+                chunk_docs, documents = chunk_documents(self.chunk_to_doc_map, self.chunks)
+            self._filter_index = ChunkFilterIndex(chunk_docs, documents)
+        return self._filter_index
+
+    def embed_queries(self, queries: List[str]) -> Optional[np.ndarray]:
+        """Embeddings das consultas com o modelo do indexador (float32) ou None"""
+        if not self.initialized:
+            self.initialize_model()
+        if not self.use_embeddings:
+            return None
+        try:
+            embeddings = self.model.encode(queries, batch_size=32, show_progress_bar=False)
+            return np.asarray(embeddings, dtype=np.float32)
+        except Exception as e:
+            print(f"⚠ Erro ao criar embeddings das consultas: {str(e)}")
+            return None
+
+    def search(
+        self,
+        query: str,
+        k: int = 5,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Busca os chunks mais próximos de uma consulta
+
+        Args:
+            query: Texto da consulta
+            k: Número de resultados
+            filters: Filtros por metadados do documento (ver search_batch)
+
+        Returns:
+            list: Chunks (com 'metadata' do documento), 'score' e 'distance'
+        """
+        return self.search_batch([query], k=k, filters=filters)[0]
+
+    def search_batch(
+        self,
+        queries: List[str],
+        k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        batch_size: int = 256,
+        query_embeddings: Optional[np.ndarray] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Busca os chunks mais próximos de várias consultas
+
+        Sem filtros, usa o índice FAISS em lotes de consultas (ou a busca
+        exata sobre os embeddings, se não houver índice). Com filtros, os
+        chunks permitidos vêm do índice de metadados (ver ChunkFilterIndex)
+        e só eles são comparados com as consultas.
+
+        Args:
+            queries: Textos das consultas
+            k: Resultados por consulta
+            filters: {campo: valor ou lista de valores} sobre os metadados do
+                documento, ex.: {'type': 'pdf', 'relative_path': 'stj/*',
+                'tipo_documento': 'acordao', 'area_direito': 'tributario'}
+            batch_size: Consultas por chamada do índice
+            query_embeddings: Embeddings já calculados das consultas (opcional)
+
+        Returns:
+            list: Para cada consulta, chunks em ordem de proximidade, cada um
+                com 'score' (1 / (1 + distância)) e 'distance' (L2 ao quadrado)
+        """
+        if not queries:
+            return []
+        if self.chunks is None:
+            raise ValueError("Nenhum dataset: chame prepare_rag_dataset ou RAGIndexer.load antes de buscar")
+        if self.index is None and self.embeddings is None:
+            print("⚠ Busca vetorial indisponível: dataset sem embeddings")
+            return [[] for _ in queries]
+
+        if query_embeddings is None:
+            query_embeddings = self.embed_queries(queries)
+        if query_embeddings is None:
+            print("⚠ Busca vetorial indisponível: modelo de embeddings não carregado")
+            return [[] for _ in queries]
+
+        allowed = self.filter_index().select(filters) if filters else None
+        if allowed is not None and not len(allowed):
+            return [[] for _ in queries]
+
+        results = []
+        for start in range(0, len(queries), batch_size):
+            batch = query_embeddings[start:start + batch_size]
+            distances, indices = self._search_vectors(batch, k, allowed)
+            for row_distances, row_indices in zip(distances, indices):
+                hits = []
+                for distance, idx in zip(row_distances, row_indices):
+                    if idx < 0:
+                        continue
+                    chunk = dict(self.chunks[int(idx)])
+                    chunk['score'] = 1.0 / (1.0 + float(distance))
+                    chunk['distance'] = float(distance)
+                    hits.append(chunk)
+                results.append(hits)
+
+        return results
+
+    def _search_vectors(
+        self,
+        queries: np.ndarray,
+        k: int,
+        allowed: Optional[np.ndarray] = None
+    ):
+        """(distâncias, índices) dos k vizinhos de cada consulta, restritos a `allowed`"""
+        if allowed is None and self.index is not None:
+            return self.index.search(queries, k)
+
+        if self.embeddings is not None:
+            return exact_search(queries, self.embeddings, k, ids=allowed)
+
+        # Só o índice FAISS (sem a matriz): o filtro vai como seletor de ids
+        import faiss
+        params = faiss.SearchParameters(sel=faiss.IDSelectorBatch(allowed))
+        return self.index.search(queries, k, params=params)
+
+    def create_bm25_index(
+        self,
+        k1: float = 1.2,
+        b: float = 0.75,
+        positions: bool = True
+    ) -> BM25Index:
+        """
+        Cria o índice BM25 dos chunks (busca por palavras-chave, ver search_bm25)
+
+        Substitui o antigo índice invertido por documento: cada chunk é um
+        documento BM25 com id = global_chunk_id.
+
+        Args:
+            k1: Saturação da frequência do termo
+            b: Normalização pelo tamanho do chunk
+            positions: Se True, guarda posições (consultas por frase entre aspas)
+
+        Returns:
+            BM25Index
+        """
+        if self.chunks is None:
+            raise ValueError("Nenhum dataset preparado: chame prepare_rag_dataset antes de create_bm25_index")
+
+        print("\n🔄 Criando índice BM25...")
+        if isinstance(self.chunks, ChunkTable):
+            texts = [self.chunks.text(i) for i in range(len(self.chunks))]
+        else:
+            texts = [chunk['text'] for chunk in self.chunks]
+        self.bm25_index = BM25Index.build(texts, k1=k1, b=b, positions=positions)
+        print(f"✓ Índice BM25 criado: {self.bm25_index.meta['n_terms']} termos")
+        return self.bm25_index
+
+    def search_bm25(
+        self,
+        query: str,
+        k: int = 5,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Busca os chunks de maior score BM25 para a consulta
+
+        Args:
+            query: Consulta; trechos entre aspas são frases (ex.: '"art. 5º"')
+            k: Número de resultados
+            filters: Filtros por metadados do documento (ver search_batch)
+
+        Returns:
+            list: Chunks (com 'metadata' do documento) e 'score' BM25, em
+                ordem decrescente de score
+        """
+        return self.search_bm25_batch([query], k=k, filters=filters)[0]
+
+    def search_bm25_batch(
+        self,
+        queries: List[str],
+        k: int = 5,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Busca BM25 de várias consultas
+
+        Os filtros são resolvidos uma vez para o lote; o top-k (MaxScore)
+        roda consulta a consulta, pois cada uma percorre as próprias listas
+        invertidas.
+
+        Args:
+            queries: Consultas (ver search_bm25)
+            k: Resultados por consulta
+            filters: Filtros por metadados do documento (ver search_batch)
+
+        Returns:
+            list: Para cada consulta, a lista de search_bm25
+        """
+        if self.chunks is None:
+            raise ValueError("Nenhum dataset: chame prepare_rag_dataset ou RAGIndexer.load antes de buscar")
+        if self.bm25_index is None:
+            print("⚠ Busca BM25 indisponível: dataset sem índice BM25")
+            return [[] for _ in queries]
+
+        allowed = self.filter_index().select(filters) if filters else None
+        if allowed is not None and not len(allowed):
+            return [[] for _ in queries]
+
+        results = []
+        for query in queries:
+            scores, ids = self.bm25_index.search(query, k=k, allowed=allowed)
+            hits = []
+            for score, idx in zip(scores, ids):
+                chunk = dict(self.chunks[int(idx)])
+                chunk['score'] = float(score)
+                hits.append(chunk)
+            results.append(hits)
+        return results
+
+    def search_hybrid(
+        self,
+        query: str,
+        k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        fusion: str = 'rrf',
+        dense_weight: float = 1.0,
+        bm25_weight: float = 1.0,
+        candidates: int = 50,
+        rrf_k: int = RRF_K
+    ) -> Dict[str, Any]:
+        """
+        Busca híbrida (vetorial + BM25) de uma consulta (ver search_hybrid_batch)
+
+        Returns:
+            dict: 'results' (chunks em ordem do score fundido) e 'latency_ms'
+        """
+        output = self.search_hybrid_batch(
+            [query], k=k, filters=filters, fusion=fusion, dense_weight=dense_weight,
+            bm25_weight=bm25_weight, candidates=candidates, rrf_k=rrf_k
+        )
+        return {'results': output['results'][0], 'latency_ms': output['latency_ms']}
+
+    def search_hybrid_batch(
+        self,
+        queries: List[str],
+        k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        fusion: str = 'rrf',
+        dense_weight: float = 1.0,
+        bm25_weight: float = 1.0,
+        candidates: int = 50,
+        rrf_k: int = RRF_K
+    ) -> Dict[str, Any]:
+        """
+        Busca híbrida: vetorial (sentido) e BM25 (citações exatas como
+        "REsp 1.234.567" ou "Súmula 7") fundidas em um só ranking
+
+        As duas buscas rodam ao mesmo tempo em threads (FAISS e NumPy
+        liberam o GIL); cada uma traz `candidates` chunks por consulta e os
+        rankings são fundidos com fuse_rankings. Sem embeddings ou sem
+        índice BM25, o resultado é o da busca disponível.
+
+        Args:
+            queries: Textos das consultas
+            k: Resultados por consulta
+            filters: Filtros por metadados do documento (ver search_batch)
+            fusion: 'rrf' (reciprocal rank fusion) ou 'weighted' (scores normalizados)
+            dense_weight: Peso da busca vetorial
+            bm25_weight: Peso da busca BM25
+            candidates: Chunks trazidos por cada busca antes da fusão
+            rrf_k: Constante do RRF
+
+        Returns:
+            dict: 'results' (para cada consulta, chunks com 'score' fundido,
+                'dense_score'/'dense_rank' e 'bm25_score'/'bm25_rank', None
+                quando a busca não trouxe o chunk) e 'latency_ms' ('dense',
+                'bm25', 'fusion' e 'total', em milissegundos, do lote; 'bm25'
+                soma o top-k de cada consulta, feito uma a uma por
+                search_bm25_batch)
+        """
+        if fusion not in FUSION_METHODS:
+            raise ValueError(f"Método de fusão desconhecido: {fusion}")
+        if not queries:
+            return {'results': [], 'latency_ms': {'dense': 0.0, 'bm25': 0.0, 'fusion': 0.0, 'total': 0.0}}
+        if self.chunks is None:
+            raise ValueError("Nenhum dataset: chame prepare_rag_dataset ou RAGIndexer.load antes de buscar")
+
+        depth = max(k, candidates)
+
+        # Estado preguiçoso criado antes das threads (evita criar duas vezes)
+        if filters:
+            self.filter_index()
+        if not self.initialized and (self.index is not None or self.embeddings is not None):
+            self.initialize_model()
+
+        def timed(function):
+            start = time.perf_counter()
+            value = function()
+            return value, (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            dense_future = pool.submit(timed, lambda: self.search_batch(queries, k=depth, filters=filters))
+            bm25_future = pool.submit(timed, lambda: self.search_bm25_batch(queries, k=depth, filters=filters))
+            dense_results, dense_ms = dense_future.result()
+            bm25_results, bm25_ms = bm25_future.result()
+
+        fusion_start = time.perf_counter()
+        results = []
+        for dense_hits, bm25_hits in zip(dense_results, bm25_results):
+            fused = fuse_rankings(
+                [
+                    ([hit['global_chunk_id'] for hit in dense_hits], [hit['score'] for hit in dense_hits]),
+                    ([hit['global_chunk_id'] for hit in bm25_hits], [hit['score'] for hit in bm25_hits])
+                ],
+                weights=[dense_weight, bm25_weight],
+                method=fusion,
+                rrf_k=rrf_k
+            )
+
+            legs = {}
+            for leg, hits in (('dense', dense_hits), ('bm25', bm25_hits)):
+                for rank, hit in enumerate(hits, 1):
+                    legs.setdefault(hit['global_chunk_id'], {'chunk': hit})[leg] = (hit['score'], rank)
+
+            hits = []
+            for idx, score in fused[:k]:
+                entry = legs[idx]
+                chunk = dict(entry['chunk'])
+                chunk.pop('distance', None)
+                chunk['score'] = score
+                for leg in ('dense', 'bm25'):
+                    leg_score, leg_rank = entry.get(leg, (None, None))
+                    chunk[f'{leg}_score'] = leg_score
+                    chunk[f'{leg}_rank'] = leg_rank
+                hits.append(chunk)
+            results.append(hits)
+        end = time.perf_counter()
+
+        return {
+            'results': results,
+            'latency_ms': {
+                'dense': dense_ms,
+                'bm25': bm25_ms,
+                'fusion': (end - fusion_start) * 1000,
+                'total': (end - start) * 1000
+            }
+        }
 
 
 def prepare_for_rag(
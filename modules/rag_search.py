@@ -0,0 +1,222 @@
+"""
+Busca vetorial nos chunks do RAG
+Índice de filtros por metadados dos documentos (valor -> chunks, sem
+percorrer todos os chunks a cada consulta), busca exata top-k em blocos
+para subconjuntos filtrados ou quando o FAISS não está disponível e fusão
+dos rankings das buscas vetorial e BM25
+"""
+
+from bisect import bisect_left
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# Vetores por bloco na busca exata (limita a matriz consultas × vetores)
+SEARCH_BLOCK = 65536
+
+# Fusão de rankings: 'rrf' (pela posição) ou 'weighted' (scores normalizados)
+FUSION_METHODS = ('rrf', 'weighted')
+
+# Constante do reciprocal rank fusion: 1 / (RRF_K + posição)
+RRF_K = 60
+
+
+class ChunkFilterIndex:
+    """
+    Índice dos chunks pelos metadados dos seus documentos
+
+    Para cada campo consultado (ex.: 'type', 'relative_path',
+    'tipo_documento', 'area_direito') guarda, uma única vez, valor ->
+    documentos; os chunks de cada documento ficam em faixas contíguas de um
+    array ordenado. Um filtro custa o número de documentos e chunks
+    selecionados, não o total de chunks.
+    """
+
+    def __init__(self, chunk_docs: np.ndarray, documents: List[Dict[str, Any]]):
+        """
+        Args:
+            chunk_docs: Linha em `documents` de cada chunk
+            documents: Metadados de cada documento
+        """
+        self.documents = documents
+        chunk_docs = np.asarray(chunk_docs, dtype=np.int64)
+
+        # Chunks agrupados por documento (ordem estável: ids crescentes em cada grupo)
+        self._order = np.argsort(chunk_docs, kind='stable')
+        counts = np.bincount(chunk_docs, minlength=len(documents)) if len(chunk_docs) else np.zeros(len(documents), dtype=np.int64)
+        self._starts = np.concatenate(([0], np.cumsum(counts)))
+        self._fields: Dict[str, Tuple[Dict[Any, List[int]], List[Any]]] = {}
+
+    def _field(self, field: str) -> Tuple[Dict[Any, List[int]], List[Any]]:
+        """valor -> documentos do campo, e os valores textuais ordenados (para prefixos)"""
+        if field not in self._fields:
+            values: Dict[Any, List[int]] = {}
+            for row, metadata in enumerate(self.documents):
+                value = metadata.get(field)
+                for item in (value if isinstance(value, (list, tuple)) else [value]):
+                    if item is not None:
+                        values.setdefault(item, []).append(row)
+            self._fields[field] = (values, sorted(v for v in values if isinstance(v, str)))
+        return self._fields[field]
+
+    def _matching_documents(self, field: str, wanted: Any) -> set:
+        values, sorted_keys = self._field(field)
+        rows = set()
+        for item in (wanted if isinstance(wanted, (list, tuple, set)) else [wanted]):
+            if isinstance(item, str) and item.endswith('*'):
+                # Prefixo (ex.: 'tribunal/2023/*'): faixa dos valores ordenados
+                prefix = item[:-1]
+                position = bisect_left(sorted_keys, prefix)
+                while position < len(sorted_keys) and sorted_keys[position].startswith(prefix):
+                    rows.update(values[sorted_keys[position]])
+                    position += 1
+            else:
+                rows.update(values.get(item, ()))
+        return rows
+
+    def select(self, filters: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """
+        Chunks que atendem aos filtros
+
+        Args:
+            filters: {campo: valor ou lista de valores}. Campos diferentes se
+                combinam com E, valores de um campo com OU; campos com lista
+                (ex.: 'area_direito') casam se contiverem o valor; um valor
+                terminado em '*' é um prefixo
+
+        Returns:
+            np.ndarray: Ids (global_chunk_id) crescentes, ou None sem filtros
+        """
+        if not filters:
+            return None
+
+        rows = None
+        for field, wanted in filters.items():
+            matched = self._matching_documents(field, wanted)
+            rows = matched if rows is None else rows & matched
+            if not rows:
+                return np.empty(0, dtype=np.int64)
+
+        ranges = [self._order[self._starts[row]:self._starts[row + 1]] for row in sorted(rows)]
+        return np.sort(np.concatenate(ranges)) if ranges else np.empty(0, dtype=np.int64)
+
+
+def exact_search(
+    queries: np.ndarray,
+    vectors: Any,
+    k: int,
+    ids: Optional[np.ndarray] = None,
+    block: int = SEARCH_BLOCK
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Busca exata pelos k vetores mais próximos (distância L2 ao quadrado)
+
+    Percorre os vetores em blocos (funciona com matrizes mapeadas em
+    memória e float16) mantendo os k melhores de cada consulta.
+
+    Args:
+        queries: Consultas (n_consultas, dimensão)
+        vectors: Vetores (n, dimensão)
+        k: Resultados por consulta
+        ids: Se informado, só estes índices de `vectors` são considerados
+        block: Vetores por bloco
+
+    Returns:
+        tuple: (distâncias, índices), ambos (n_consultas, k), em ordem
+            crescente de distância; posições sem resultado têm índice -1
+    """
+    queries = np.asarray(queries, dtype=np.float32)
+    n_queries = len(queries)
+    total = len(ids) if ids is not None else len(vectors)
+
+    best_distances = np.full((n_queries, k), np.inf, dtype=np.float32)
+    best_ids = np.full((n_queries, k), -1, dtype=np.int64)
+    query_norms = (queries ** 2).sum(axis=1)[:, np.newaxis]
+
+    for start in range(0, total, block):
+        if ids is not None:
+            block_ids = np.asarray(ids[start:start + block], dtype=np.int64)
+            matrix = np.asarray(vectors[block_ids], dtype=np.float32)
+        else:
+            block_ids = np.arange(start, min(start + block, total), dtype=np.int64)
+            matrix = np.asarray(vectors[start:start + block], dtype=np.float32)
+
+        distances = query_norms - 2 * queries @ matrix.T + (matrix ** 2).sum(axis=1)[np.newaxis, :]
+        np.maximum(distances, 0, out=distances)
+
+        # Junta os k melhores anteriores com os k melhores do bloco
+        take = min(k, distances.shape[1])
+        top = np.argpartition(distances, take - 1, axis=1)[:, :take]
+        merged_distances = np.concatenate([best_distances, np.take_along_axis(distances, top, axis=1)], axis=1)
+        merged_ids = np.concatenate([best_ids, block_ids[top]], axis=1)
+        keep = np.argsort(merged_distances, axis=1, kind='stable')[:, :k]
+        best_distances = np.take_along_axis(merged_distances, keep, axis=1)
+        best_ids = np.take_along_axis(merged_ids, keep, axis=1)
+
+    return best_distances, best_ids
+
+
+def chunk_documents(
+    chunk_to_doc_map: Sequence[int],
+    chunks: Sequence[Dict[str, Any]]
+) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
+    """
+    Linha do documento de cada chunk e metadados de cada documento
+
+    Args:
+        chunk_to_doc_map: Documento de origem de cada chunk
+        chunks: Chunks (os metadados vêm do primeiro chunk de cada documento)
+
+    Returns:
+        tuple: (linha de cada chunk, metadados por linha)
+    """
+    doc_indices = np.asarray(chunk_to_doc_map, dtype=np.int64)
+    if not len(doc_indices):
+        return doc_indices, []
+    _, first, rows = np.unique(doc_indices, return_index=True, return_inverse=True)
+    return rows.reshape(-1), [chunks[int(i)].get('metadata', {}) for i in first]
+
+
+def fuse_rankings(
+    rankings: Sequence[Tuple[Sequence[int], Sequence[float]]],
+    weights: Optional[Sequence[float]] = None,
+    method: str = 'rrf',
+    rrf_k: int = RRF_K
+) -> List[Tuple[int, float]]:
+    """
+    Funde rankings de buscas diferentes em um só
+
+    Com 'rrf', cada ranking soma peso / (rrf_k + posição) (posição a partir
+    de 1) e só a ordem importa, não a escala dos scores. Com 'weighted',
+    os scores de cada ranking são normalizados para [0, 1] (mínimo e
+    máximo do ranking) e somados com os pesos. Um id ausente de um ranking
+    não recebe nada dele.
+
+    Args:
+        rankings: (ids, scores) de cada busca, em ordem decrescente de score
+        weights: Peso de cada ranking (padrão: 1.0 para todos)
+        method: 'rrf' ou 'weighted'
+        rrf_k: Constante do RRF
+
+    Returns:
+        list: (id, score fundido), em ordem decrescente (empates pelo menor id)
+    """
+    if method not in FUSION_METHODS:
+        raise ValueError(f"Método de fusão desconhecido: {method}")
+    weights = [1.0] * len(rankings) if weights is None else list(weights)
+
+    fused: Dict[int, float] = {}
+    for (ids, scores), weight in zip(rankings, weights):
+        if not len(ids):
+            continue
+        if method == 'rrf':
+            contributions = weight / (rrf_k + np.arange(1, len(ids) + 1))
+        else:
+            scores = np.asarray(scores, dtype=np.float64)
+            spread = scores.max() - scores.min()
+            contributions = weight * ((scores - scores.min()) / spread if spread > 0 else np.ones(len(scores)))
+        for idx, contribution in zip(ids, contributions):
+            fused[int(idx)] = fused.get(int(idx), 0.0) + float(contribution)
+
+    return sorted(fused.items(), key=lambda item: (-item[1], item[0]))
@@ -0,0 +1,279 @@
+"""
+Scoring vetorizado de sentenças para a sumarização extrativa
+Monta uma vez a matriz esparsa sentença × termo e calcula os critérios de
+posição, palavras-chave, comprimento, números e termos conclusivos como
+operações sobre arrays; a centralidade (TextRank) opcional usa produtos
+da mesma matriz
+"""
+
+import re
+from itertools import chain
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .keyword_matcher import get_keyword_automaton
+
+
+# Palavras-chave importantes no domínio jurídico
+LEGAL_KEYWORDS = frozenset({
+    'decidiu', 'determinou', 'condenou', 'absolveu', 'julgou',
+    'acordão', 'sentença', 'voto', 'fundamentação', 'dispositivo',
+    'lei', 'artigo', 'jurisprudência', 'súmula', 'precedente',
+    'tese', 'entendimento', 'decisão', 'provimento', 'recurso'
+})
+
+# Pesos dos critérios (os mesmos do scoring original, sentença a sentença)
+LEADING_SENTENCES = 3
+LEADING_SCORE = 2.0
+TRAILING_SENTENCES = 3
+TRAILING_SCORE = 1.5
+KEYWORD_SCORE = 1.5
+MEDIUM_LENGTH = (15, 40)
+MEDIUM_LENGTH_SCORE = 1.0
+LONG_LENGTH_SCORE = 0.5
+NUMBER_SCORE = 0.5
+CONCLUSIVE_SCORE = 1.0
+
+# Modos de scoring: 'keywords' (padrão) ou 'textrank' (soma a centralidade)
+SCORING_MODES = ('keywords', 'textrank')
+
+DIGIT_PATTERN = re.compile(r'\d')
+
+
+# Espaços em branco de str.split() (str.isspace); nenhum acima de U+3000
+_SPACE_TABLE = np.array([chr(code).isspace() for code in range(0x3001)])
+
+
+class SentenceTermMatrix:
+    """
+    Matriz esparsa sentença × termo (contagens), em formato CSR
+
+    Cada palavra das sentenças (text.lower().split()) é um valor 1 na linha
+    da sua sentença, na ordem do texto: `indptr` sai direto das contagens
+    de palavras, sem ordenar. Repetições de um termo na mesma sentença
+    ficam como valores separados (somados nos produtos). `rows` guarda a
+    linha de cada valor, para os produtos com np.bincount.
+    """
+
+    def __init__(
+        self,
+        terms: List[str],
+        rows: np.ndarray,
+        n_sentences: int,
+        keep: Optional[np.ndarray] = None
+    ):
+        """
+        Args:
+            terms: Palavras, em ordem
+            rows: Sentença de cada palavra mantida (não decrescente)
+            n_sentences: Número de sentenças
+            keep: Máscara das palavras que pertencem a alguma sentença
+                (None = todas)
+        """
+        self.n_sentences = n_sentences
+        self.rows = rows
+        self.lengths = np.bincount(rows, minlength=n_sentences)
+        self.indptr = np.concatenate(([0], np.cumsum(self.lengths)))
+
+        vocabulary = dict.fromkeys(terms)
+        for term_id, term in enumerate(vocabulary):
+            vocabulary[term] = term_id
+        self.vocabulary = vocabulary
+        self.n_terms = len(vocabulary)
+
+        self.indices = np.fromiter(map(vocabulary.__getitem__, terms), dtype=np.int64, count=len(terms))
+        if keep is not None:
+            self.indices = self.indices[keep]
+        self.data = np.ones(len(self.indices))
+
+    def term_flags(self, predicate) -> np.ndarray:
+        """Vetor (n_terms,) com 1.0 nos termos em que predicate(termo) é verdadeiro"""
+        return np.fromiter(map(bool, map(predicate, self.vocabulary)), dtype=np.float64, count=self.n_terms)
+
+    def dot(self, term_values: np.ndarray, data: Optional[np.ndarray] = None) -> np.ndarray:
+        """Produto matriz × vetor de termos: (n_sentences,)"""
+        data = self.data if data is None else data
+        return np.bincount(self.rows, weights=data * term_values[self.indices], minlength=self.n_sentences)
+
+    def dot_transposed(self, sentence_values: np.ndarray, data: Optional[np.ndarray] = None) -> np.ndarray:
+        """Produto transposta × vetor de sentenças: (n_terms,)"""
+        data = self.data if data is None else data
+        return np.bincount(self.indices, weights=data * sentence_values[self.rows], minlength=self.n_terms)
+
+    def binary(self) -> 'SentenceTermMatrix':
+        """Mesma matriz com um único valor por (sentença, termo) presente"""
+        keys = np.unique(self.rows * max(self.n_terms, 1) + self.indices)
+        matrix = SentenceTermMatrix.__new__(SentenceTermMatrix)
+        matrix.n_sentences = self.n_sentences
+        matrix.vocabulary = self.vocabulary
+        matrix.n_terms = self.n_terms
+        matrix.rows = keys // max(self.n_terms, 1)
+        matrix.indices = keys % max(self.n_terms, 1)
+        matrix.data = np.ones(len(keys))
+        matrix.lengths = np.bincount(matrix.rows, minlength=self.n_sentences)
+        matrix.indptr = np.concatenate(([0], np.cumsum(matrix.lengths)))
+        return matrix
+
+
+def sentence_term_matrix(
+    sentences: List[str],
+    spans: Optional[Sequence[Tuple[int, int]]] = None,
+    text_lower: Optional[str] = None
+) -> SentenceTermMatrix:
+    """
+    Monta a matriz sentença × termo
+
+    Com os spans das sentenças e o texto completo já em minúsculas (de mesmo
+    comprimento do original), o texto é dividido em palavras uma única vez e
+    cada palavra é atribuída à sua sentença pelo offset; as palavras fora
+    das sentenças (trechos curtos descartados) ficam de fora da matriz. Sem eles, cada
+    sentença é convertida e dividida separadamente.
+    """
+    n = len(sentences)
+
+    if spans is None or text_lower is None or len(spans) != n:
+        token_lists = [sentence.lower().split() for sentence in sentences]
+        rows = np.repeat(np.arange(n, dtype=np.int64), [len(tokens) for tokens in token_lists])
+        return SentenceTermMatrix(list(chain.from_iterable(token_lists)), rows, n)
+
+    codes = np.frombuffer(text_lower.encode('utf-32-le'), dtype=np.uint32)
+    is_space = (codes <= 0x3000) & _SPACE_TABLE[np.minimum(codes, 0x3000)]
+    word_starts = np.flatnonzero(~is_space & np.concatenate(([True], is_space[:-1])))
+
+    bounds = np.fromiter(chain.from_iterable(spans), dtype=np.int64, count=2 * n).reshape(-1, 2)
+    rows = np.searchsorted(bounds[:, 0], word_starts, side='right') - 1
+    inside = rows >= 0
+    inside[inside] &= word_starts[inside] < bounds[rows[inside], 1]
+
+    return SentenceTermMatrix(text_lower.split(), rows[inside], n, keep=inside)
+
+
+def score_sentences(
+    sentences: List[str],
+    full_text: str,
+    spans: Optional[Sequence[Tuple[int, int]]] = None,
+    text_lower: Optional[str] = None,
+    scoring: str = 'keywords',
+    textrank_weight: float = 2.0
+) -> np.ndarray:
+    """
+    Score de importância de cada sentença
+
+    Critérios: posição (primeiras e últimas sentenças), palavras-chave
+    jurídicas, comprimento (sentenças médias são preferidas), presença de
+    números (processos, leis, etc.) e de termos conclusivos. Com
+    scoring='textrank', soma textrank_weight × centralidade (normalizada
+    para máximo 1).
+
+    Args:
+        sentences: Sentenças de full_text, em ordem
+        full_text: Texto de onde as sentenças vieram
+        spans: Offsets (início, fim) de cada sentença em full_text, se conhecidos
+        text_lower: full_text em minúsculas, se já calculado
+        scoring: 'keywords' ou 'textrank'
+        textrank_weight: Peso da centralidade no modo 'textrank'
+
+    Returns:
+        np.ndarray: Score por sentença
+    """
+    if scoring not in SCORING_MODES:
+        raise ValueError(f"Modo de scoring desconhecido: {scoring}")
+
+    n = len(sentences)
+    if text_lower is not None and len(text_lower) != len(full_text):
+        # Minúsculas que mudam o tamanho: offsets não valem no texto convertido
+        spans, text_lower = None, None
+
+    matrix = sentence_term_matrix(sentences, spans, text_lower)
+
+    # Termos conclusivos: uma única busca no texto completo
+    conclusive_idx = get_keyword_automaton().sentences_with(
+        'conclusivo', sentences, full_text,
+        starts=[start for start, _ in spans] if spans is not None else None,
+        text_lower=text_lower
+    )
+    conclusive = np.zeros(n, dtype=bool)
+    conclusive[list(conclusive_idx)] = True
+
+    positions = np.arange(n)
+    keyword_counts = matrix.dot(matrix.term_flags(LEGAL_KEYWORDS.__contains__))
+    has_number = matrix.dot(matrix.term_flags(DIGIT_PATTERN.search)) > 0
+    lengths = matrix.lengths
+
+    # Mesma sequência de somas do scoring sentença a sentença (resultados idênticos)
+    scores = np.zeros(n)
+    scores += np.where(
+        positions < LEADING_SENTENCES, LEADING_SCORE,
+        np.where(positions >= n - TRAILING_SENTENCES, TRAILING_SCORE, 0.0)
+    )
+    scores += keyword_counts * KEYWORD_SCORE
+    scores += np.where(
+        (lengths >= MEDIUM_LENGTH[0]) & (lengths <= MEDIUM_LENGTH[1]), MEDIUM_LENGTH_SCORE,
+        np.where(lengths > MEDIUM_LENGTH[1], LONG_LENGTH_SCORE, 0.0)
+    )
+    scores += np.where(has_number, NUMBER_SCORE, 0.0)
+    scores += np.where(conclusive, CONCLUSIVE_SCORE, 0.0)
+
+    if scoring == 'textrank':
+        centrality = textrank(matrix)
+        if centrality.max() > 0:
+            scores += textrank_weight * centrality / centrality.max()
+
+    return scores
+
+
+def textrank(
+    matrix: SentenceTermMatrix,
+    damping: float = 0.85,
+    max_iterations: int = 50,
+    tolerance: float = 1e-6
+) -> np.ndarray:
+    """
+    Centralidade das sentenças (PageRank no grafo de similaridade)
+
+    A similaridade é o cosseno entre os vetores TF-IDF binários das
+    sentenças (S = X·Xᵀ sem a diagonal). S nunca é materializada: cada
+    iteração faz S·v = X·(Xᵀ·v) - diag·v, em tempo proporcional ao número
+    de valores da matriz esparsa.
+
+    Args:
+        matrix: Matriz sentença × termo
+        damping: Fator de amortecimento do PageRank
+        max_iterations: Limite de iterações
+        tolerance: Variação (norma L1) abaixo da qual a iteração para
+
+    Returns:
+        np.ndarray: Centralidade por sentença (soma 1)
+    """
+    n = matrix.n_sentences
+    if n == 0:
+        return np.zeros(0)
+    matrix = matrix.binary()
+
+    # IDF: termos presentes em todas as sentenças não contam
+    document_frequency = np.bincount(matrix.indices, minlength=matrix.n_terms)
+    idf = np.log(n / np.maximum(document_frequency, 1))
+    weights = idf[matrix.indices]
+    norms = np.sqrt(np.bincount(matrix.rows, weights=weights ** 2, minlength=n))
+    weights = weights / np.where(norms > 0, norms, 1.0)[matrix.rows]
+    self_similarity = np.bincount(matrix.rows, weights=weights ** 2, minlength=n)
+
+    def similarity_dot(vector):
+        return matrix.dot(matrix.dot_transposed(vector, weights), weights) - self_similarity * vector
+
+    degree = similarity_dot(np.ones(n))
+    dangling = degree <= 1e-12
+    inverse_degree = np.where(dangling, 0.0, 1.0 / np.where(dangling, 1.0, degree))
+
+    rank = np.full(n, 1.0 / n)
+    for _ in range(max_iterations):
+        # Sentenças sem vizinhos distribuem o peso igualmente
+        spread = rank[dangling].sum() / n
+        updated = (1 - damping) / n + damping * (similarity_dot(rank * inverse_degree) + spread)
+        if np.abs(updated - rank).sum() < tolerance:
+            rank = updated
+            break
+        rank = updated
+
+    return rank / rank.sum()
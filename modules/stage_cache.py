@@ -0,0 +1,188 @@
+"""
+Cache em disco dos resultados das etapas NLP
+Cada entrada é um JSON identificado pelo hash do texto, pela versão da
+etapa e pela configuração que afeta o resultado; o tamanho total é limitado
+com descarte LRU (os menos usados recentemente saem primeiro)
+"""
+
+import os
+import json
+import hashlib
+import threading
+from typing import Dict, Any, Optional
+
+
+# Após exceder o limite, descarta entradas até esta fração do limite
+EVICTION_TARGET = 0.9
+
+
+def text_hash(text: str) -> str:
+    """Hash SHA-256 do texto (chave de conteúdo das etapas)"""
+    return hashlib.sha256(text.encode('utf-8', errors='replace')).hexdigest()
+
+
+class StageCache:
+    """
+    Cache persistente de resultados por etapa
+
+    As entradas ficam em <diretório>/<2 primeiros caracteres>/<chave>.json.
+    A data de modificação do arquivo marca o último uso: é atualizada em cada
+    acerto e usada para descartar os menos usados quando o tamanho total
+    passa de `max_size_mb`. Vários processos podem usar o mesmo diretório
+    (as gravações são atômicas).
+    """
+
+    def __init__(self, directory: str, max_size_mb: float = 512):
+        """
+        Args:
+            directory: Diretório do cache (criado se não existir)
+            max_size_mb: Tamanho máximo em disco
+        """
+        self.directory = directory
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.stats: Dict[str, Dict[str, int]] = {}
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None
+
+    @staticmethod
+    def make_key(stage: str, version: int, content_hash: str, config: Any) -> str:
+        """Chave da entrada: etapa + versão + hash do conteúdo + configuração"""
+        payload = json.dumps(
+            {'stage': stage, 'version': version, 'content': content_hash, 'config': config},
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + '.json')
+
+    def _count(self, stage: str, field: str, amount: int = 1):
+        with self._lock:
+            counters = self.stats.setdefault(stage, {'hits': 0, 'misses': 0, 'writes': 0})
+            counters[field] += amount
+
+    def get(self, stage: str, version: int, content_hash: str, config: Any) -> Optional[Any]:
+        """
+        Lê o resultado de uma etapa
+
+        Returns:
+            Valor armazenado ou None (falha de cache)
+        """
+        path = self._path(self.make_key(stage, version, content_hash, config))
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            self._count(stage, 'misses')
+            return None
+
+        try:
+            # Marca o uso recente (ordem do LRU)
+            os.utime(path, None)
+        except OSError:
+            pass
+
+        self._count(stage, 'hits')
+        return value
+
+    def put(self, stage: str, version: int, content_hash: str, config: Any, value: Any):
+        """Grava o resultado de uma etapa (erros de gravação são apenas avisados)"""
+        path = self._path(self.make_key(stage, version, content_hash, config))
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            data = json.dumps(value, ensure_ascii=False, default=str).encode('utf-8')
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"⚠ Erro ao gravar cache NLP: {str(e)}")
+            return
+
+        self._count(stage, 'writes')
+
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_size()
+            else:
+                self._total_bytes += len(data)
+            over_limit = self._total_bytes > self.max_bytes
+
+        if over_limit:
+            self.evict()
+
+    def _entries(self):
+        """(mtime, tamanho, caminho) de todas as entradas"""
+        entries = []
+        try:
+            buckets = list(os.scandir(self.directory))
+        except OSError:
+            return entries
+
+        for bucket in buckets:
+            if not bucket.is_dir():
+                continue
+            try:
+                for entry in os.scandir(bucket.path):
+                    if entry.name.endswith('.json'):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+            except OSError:
+                continue
+
+        return entries
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        """Descarta as entradas usadas há mais tempo até caber no limite"""
+        with self._lock:
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            target = self.max_bytes * EVICTION_TARGET
+
+            for _, size, path in entries:
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                self.evictions += 1
+
+            self._total_bytes = total
+
+    def take_stats(self) -> Dict[str, Any]:
+        """Retorna e zera os contadores (usado para somar os workers no processo principal)"""
+        with self._lock:
+            stats = {'stages': self.stats, 'evictions': self.evictions}
+            self.stats = {}
+            self.evictions = 0
+        return stats
+
+    def merge_stats(self, stats: Dict[str, Any]):
+        """Soma contadores vindos de outro processo (ver take_stats)"""
+        for stage, counters in stats.get('stages', {}).items():
+            for field, amount in counters.items():
+                self._count(stage, field, amount)
+        with self._lock:
+            self.evictions += stats.get('evictions', 0)
+
+    def print_report(self):
+        """Exibe acertos e falhas por etapa (nada se o cache não foi usado)"""
+        if not self.stats:
+            return
+
+        hits = sum(c['hits'] for c in self.stats.values())
+        misses = sum(c['misses'] for c in self.stats.values())
+        rate = 100.0 * hits / max(hits + misses, 1)
+
+        print(f"\n💾 Cache NLP ({self.directory}): {hits} acertos, {misses} falhas ({rate:.0f}%)")
+        for stage, counters in self.stats.items():
+            print(f"   • {stage:<14} {counters['hits']:>6} acertos  {counters['misses']:>6} falhas")
+        if self.evictions:
+            print(f"   • {self.evictions} entradas descartadas (limite de {self.max_bytes / (1024 * 1024):g} MB)")
@@ -2,12 +2,108 @@
 Módulo para leitura de arquivos TXT
 """
 
+import os
+import mmap
+import json
+import codecs
+import hashlib
+import threading
+
 import chardet
 
 
+# Encodings comuns tentados após o encoding detectado
+ENCODINGS_TO_TRY = [
+    'utf-8',
+    'utf-8-sig',  # UTF-8 com BOM
+    'latin-1',
+    'cp1252',  # Windows encoding
+    'iso-8859-1',
+]
+
+# Bytes analisados pelo chardet (início do arquivo)
+DETECTION_SAMPLE_SIZE = 64 * 1024
+
+# Tamanho padrão das janelas do leitor em fluxo (bytes)
+STREAM_WINDOW_SIZE = 4 * 1024 * 1024
+
+
+class EncodingCache:
+    """
+    Cache persistente do encoding detectado por arquivo
+
+    A entrada só é válida enquanto tamanho e mtime do arquivo não mudarem.
+    """
+
+    def __init__(self, cache_path=None):
+        self.cache_path = cache_path
+        self.entries = {}
+        self.dirty = False
+        self._lock = threading.Lock()
+
+        if cache_path and os.path.isfile(cache_path):
+            try:
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except Exception:
+                self.entries = {}
+
+    def get(self, file_path, stat):
+        entry = self.entries.get(os.path.abspath(file_path))
+        if entry and entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime:
+            return entry['encoding']
+        return None
+
+    def set(self, file_path, stat, encoding):
+        with self._lock:
+            self.entries[os.path.abspath(file_path)] = {
+                'size': stat.st_size,
+                'mtime': stat.st_mtime,
+                'encoding': encoding
+            }
+            self.dirty = True
+
+    def save(self):
+        """Grava o cache em disco (se houver caminho e alterações)"""
+        if not self.cache_path or not self.dirty:
+            return
+        try:
+            with self._lock:
+                with open(self.cache_path, 'w', encoding='utf-8') as f:
+                    json.dump(self.entries, f)
+                self.dirty = False
+        except Exception as e:
+            print(f"⚠ Erro ao salvar cache de encodings: {str(e)}")
+
+
+_encoding_cache = EncodingCache()
+
+
+def set_encoding_cache(cache_path):
+    """
+    Define o arquivo do cache persistente de encodings
+
+    Args:
+        cache_path: Caminho do arquivo JSON do cache
+    """
+    global _encoding_cache
+    _encoding_cache = EncodingCache(cache_path)
+
+
+def save_encoding_cache():
+    """Grava o cache de encodings em disco"""
+    _encoding_cache.save()
+
+
+def _detect_from_sample(sample):
+    """Detecta o encoding de uma amostra de bytes"""
+    result = chardet.detect(sample)
+    return result['encoding'] or 'utf-8'
+
+
 def detect_encoding(file_path):
     """
-    Detecta a codificação de um arquivo
+    Detecta a codificação de um arquivo a partir de uma amostra do início
 
     Args:
         file_path: Caminho do arquivo
@@ -17,63 +113,188 @@ def detect_encoding(file_path):
     """
     try:
         with open(file_path, 'rb') as f:
-            raw_data = f.read()
-            result = chardet.detect(raw_data)
-            return result['encoding'] or 'utf-8'
+            sample = f.read(DETECTION_SAMPLE_SIZE)
+        return _detect_from_sample(sample)
     except Exception:
         return 'utf-8'
 
 
-def read_txt_file(file_path):
+def _decode(raw_data, file_path, stat):
     """
-    Lê o conteúdo de um arquivo TXT com detecção automática de encoding
+    Decodifica o conteúdo já lido, tentando os encodings sobre o mesmo buffer
+
+    Returns:
+        tuple: (texto, encoding utilizado)
+    """
+    # Caminho rápido: UTF-8 com BOM ou UTF-8 válido (inclui ASCII puro)
+    if raw_data.startswith(b'\xef\xbb\xbf'):
+        try:
+            return raw_data.decode('utf-8-sig'), 'utf-8-sig'
+        except UnicodeDecodeError:
+            pass
+    try:
+        return raw_data.decode('utf-8'), 'utf-8'
+    except UnicodeDecodeError:
+        pass
+
+    encodings_to_try = list(ENCODINGS_TO_TRY)
+
+    # Encoding já detectado em execuções anteriores, senão detecta na amostra
+    detected_encoding = _encoding_cache.get(file_path, stat)
+    if detected_encoding is None:
+        detected_encoding = _detect_from_sample(raw_data[:DETECTION_SAMPLE_SIZE])
+    if detected_encoding:
+        if detected_encoding in encodings_to_try:
+            encodings_to_try.remove(detected_encoding)
+        encodings_to_try.insert(0, detected_encoding)
+
+    for encoding in encodings_to_try:
+        try:
+            content = raw_data.decode(encoding, errors='strict')
+        except (UnicodeDecodeError, LookupError):
+            continue
+        _encoding_cache.set(file_path, stat, encoding)
+        return content, encoding
+
+    # Se todas as tentativas falharem, decodifica com errors='replace'
+    return raw_data.decode('utf-8', errors='replace'), 'utf-8'
+
+
+def read_txt_document(file_path):
+    """
+    Lê o arquivo TXT uma única vez e retorna texto, encoding e hash do conteúdo
 
     Args:
         file_path: Caminho do arquivo TXT
 
     Returns:
-        str: Conteúdo do arquivo
+        dict: content, encoding e content_hash (SHA-256 dos bytes)
 
     Raises:
         Exception: Se houver erro na leitura do arquivo
     """
-    # Tenta múltiplos encodings comuns
-    encodings_to_try = [
-        'utf-8',
-        'utf-8-sig',  # UTF-8 com BOM
-        'latin-1',
-        'cp1252',  # Windows encoding
-        'iso-8859-1',
-    ]
-
-    # Primeiro tenta detectar o encoding
-    detected_encoding = detect_encoding(file_path)
-    if detected_encoding and detected_encoding not in encodings_to_try:
-        encodings_to_try.insert(0, detected_encoding)
+    try:
+        with open(file_path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            raw_data = f.read()
+    except Exception as e:
+        raise Exception(f"Não foi possível ler o arquivo TXT: {str(e)}") from e
 
-    # Tenta ler com cada encoding
-    last_error = None
-    for encoding in encodings_to_try:
-        try:
-            with open(file_path, 'r', encoding=encoding, errors='strict') as f:
-                content = f.read()
-                # Remove BOM se presente
-                if content.startswith('\ufeff'):
-                    content = content[1:]
-                return content.strip()
-        except (UnicodeDecodeError, LookupError) as e:
-            last_error = e
-            continue
+    content, encoding = _decode(raw_data, file_path, stat)
+
+    # Remove BOM se presente
+    if content.startswith('\ufeff'):
+        content = content[1:]
+
+    return {
+        'content': content.strip(),
+        'encoding': encoding,
+        'content_hash': hashlib.sha256(raw_data).hexdigest()
+    }
 
-    # Se todas as tentativas falharem, tenta com errors='replace'
+
+def _stream_encoding(sample, file_path, stat):
+    """Escolhe o encoding do leitor em fluxo a partir da amostra inicial"""
+    if sample.startswith(b'\xef\xbb\xbf'):
+        return 'utf-8-sig'
+
+    # UTF-8 válido na amostra (o último caractere pode estar cortado)
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-            content = f.read()
-            if content.startswith('\ufeff'):
-                content = content[1:]
-            return content.strip()
-    except Exception as e:
-        raise Exception(f"Não foi possível ler o arquivo TXT: {str(e)}") from last_error
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+
+    encoding = _encoding_cache.get(file_path, stat) or _detect_from_sample(sample)
+    try:
+        codecs.lookup(encoding)
+    except LookupError:
+        encoding = 'latin-1'
+    _encoding_cache.set(file_path, stat, encoding)
+    return encoding
+
+
+def iter_txt_windows(file_path, window_size=STREAM_WINDOW_SIZE, encoding=None):
+    """
+    Lê um TXT grande em janelas de texto, sem carregar o arquivo inteiro
+
+    O arquivo é mapeado em memória (mmap) e decodificado com um decodificador
+    incremental, que preserva caracteres multibyte cortados entre janelas.
+    Bytes inválidos são substituídos (não há como tentar outro encoding
+    depois que parte do texto já foi entregue).
+
+    Args:
+        file_path: Caminho do arquivo TXT
+        window_size: Tamanho de cada janela em bytes
+        encoding: Encoding a usar (padrão: detectado na amostra inicial)
+
+    Yields:
+        str: Janelas consecutivas do texto (a concatenação é o texto completo)
+    """
+    with open(file_path, 'rb') as f:
+        stat = os.fstat(f.fileno())
+        if stat.st_size == 0:
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if encoding is None:
+                encoding = _stream_encoding(mm[:DETECTION_SAMPLE_SIZE], file_path, stat)
+
+            decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+
+            for position in range(0, stat.st_size, window_size):
+                text = decoder.decode(mm[position:position + window_size], final=False)
+                if text:
+                    yield text
+
+            tail = decoder.decode(b'', final=True)
+            if tail:
+                yield tail
+
+
+def count_words(windows):
+    """
+    Conta as palavras (como len(text.split())) de um texto recebido em janelas
+
+    Evita a lista de palavras de text.split(), que em arquivos grandes ocupa
+    várias vezes o tamanho do texto. Uma palavra cortada entre duas janelas
+    é contada uma vez.
+
+    Args:
+        windows: Iterável de trechos consecutivos do texto (ex.: iter_txt_windows)
+
+    Returns:
+        int: Número de palavras
+    """
+    total = 0
+    previous_open = False  # a janela anterior terminou no meio de uma palavra
+    for window in windows:
+        if not window:
+            continue
+        total += len(window.split())
+        if previous_open and not window[0].isspace():
+            total -= 1
+        previous_open = not window[-1].isspace()
+    return total
+
+
+def read_txt_file(file_path):
+    """
+    Lê o conteúdo de um arquivo TXT com detecção automática de encoding
+
+    O arquivo é lido do disco uma única vez; os encodings candidatos são
+    tentados sobre o mesmo buffer de bytes.
+
+    Args:
+        file_path: Caminho do arquivo TXT
+
+    Returns:
+        str: Conteúdo do arquivo
+
+    Raises:
+        Exception: Se houver erro na leitura do arquivo
+    """
+    return read_txt_document(file_path)['content']
 
 
 def read_txt_file_with_metadata(file_path):
@@ -86,12 +307,12 @@ def read_txt_file_with_metadata(file_path):
     Returns:
         dict: Dicionário com conteúdo e metadados
     """
-    content = read_txt_file(file_path)
-    encoding = detect_encoding(file_path)
+    txt = read_txt_document(file_path)
+    content = txt['content']
 
     return {
         'content': content,
-        'encoding': encoding,
+        'encoding': txt['encoding'],
         'lines': len(content.split('\n')),
         'characters': len(content),
         'words': len(content.split())